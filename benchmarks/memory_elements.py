@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Measure the memory used per element after parsing a synthetic JSON response.
+
+Usage: python benchmarks/memory_elements.py [number of nodes]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+
+import overpy
+
+
+def create_data(count: int) -> str:
+    elements = []
+    for i in range(count):
+        element = {
+            "type": "node",
+            "id": i + 1,
+            "lat": 50.0 + i * 1e-7,
+            "lon": 7.0 + i * 1e-7,
+        }
+        # Most nodes of a way don't have any tags
+        if i % 10 == 0:
+            element["tags"] = {"highway": "crossing"}
+        elements.append(element)
+    return json.dumps({"version": 0.6, "elements": elements})
+
+
+def measure(api: overpy.Overpass, data: str, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    result = api.parse_json(data)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(result.nodes) == count
+    return size / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = create_data(count)
+    print(f"Nodes: {count}")
+    print(f"  default: {measure(overpy.Overpass(), data, count):.1f} bytes/element")
+    print(f"  lean:    {measure(overpy.Overpass(lean=True), data, count):.1f} bytes/element")
+    print(f"  columnar nodes: {measure(overpy.Overpass(columnar_nodes=True), data, count):.1f} bytes/element")
+
+
+if __name__ == "__main__":
+    main()
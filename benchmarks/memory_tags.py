@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Measure the memory used by the tags of a synthetic building extract with and without interning and shared tags.
+
+Usage: python benchmarks/memory_tags.py [number of buildings]
+"""
+from io import StringIO
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+import overpy
+
+
+def create_data(count: int) -> str:
+    elements = []
+    for i in range(count):
+        tags = {"building": "yes" if i % 4 else "house"}
+        # Most buildings of an extract have an address, a few have more tags
+        if i % 5:
+            tags.update({
+                "addr:city": f"City {i % 3}",
+                "addr:postcode": f"{53000 + i % 20}",
+                "addr:street": f"Street {i % 300}",
+                "addr:housenumber": f"{i % 150 + 1}",
+            })
+        if i % 50 == 0:
+            tags["name"] = f"Building {i}"
+        elements.append({
+            "type": "way",
+            "id": i + 1,
+            "nodes": [i * 5 + 1, i * 5 + 2, i * 5 + 3, i * 5 + 4, i * 5 + 1],
+            "tags": tags,
+        })
+    return json.dumps({"version": 0.6, "elements": elements})
+
+
+def measure(parse, count: int):
+    gc.collect()
+    start = time.perf_counter()
+    result = parse()
+    parse_time = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = parse()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(result.ways) == count
+    return size / count, parse_time
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = create_data(count)
+    fp = StringIO()
+    overpy.Overpass().parse_json(data).dump_xml(fp)
+    xml_data = fp.getvalue()
+
+    print(f"Buildings: {count}")
+    for name, kwargs in (
+            ("plain", {}),
+            ("interned", {"intern_tags": True}),
+            ("shared", {"share_tags": True})):
+        api = overpy.Overpass(**kwargs)
+        for fmt, parse in (("json", lambda: api.parse_json(data)), ("xml", lambda: api.parse_xml(xml_data))):
+            size, parse_time = measure(parse, count)
+            print(f"  {name:8} {fmt:4} {size:7.1f} bytes/element  parse {parse_time:5.2f} s")
+
+
+if __name__ == "__main__":
+    main()
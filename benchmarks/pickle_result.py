@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Compare size and round trip time of pickled results with the generic pickle protocol used before.
+
+Usage: python benchmarks/pickle_result.py [number of nodes]
+"""
+import copyreg
+import io
+import json
+import pickle
+import sys
+import time
+
+import overpy
+
+
+class GenericPickler(pickle.Pickler):
+    """
+    Pickle results, elements and members like objects without custom pickle support.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, overpy.Result):
+            return copyreg.__newobj__, (obj.__class__,), obj.__dict__
+        if isinstance(obj, (overpy.Element, overpy.RelationMember)):
+            slots = {
+                name: getattr(obj, name)
+                for base in obj.__class__.__mro__ for name in base.__dict__.get("__slots__", ())
+                if hasattr(obj, name)
+            }
+            return copyreg.__newobj__, (obj.__class__,), (None, slots)
+        return NotImplemented
+
+
+def generic_dumps(obj) -> bytes:
+    fp = io.BytesIO()
+    GenericPickler(fp, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return fp.getvalue()
+
+
+def create_data(count: int) -> str:
+    elements = []
+    for i in range(count):
+        element = {
+            "type": "node",
+            "id": i + 1,
+            "lat": round(50.0 + i * 1e-6, 7),
+            "lon": round(7.0 + i * 1e-6, 7),
+            "version": 1 + i % 5,
+            "timestamp": "2020-01-02T03:04:05Z",
+        }
+        if i % 10 == 0:
+            element["tags"] = {"highway": "crossing"}
+        elements.append(element)
+    for i in range(count // 10):
+        elements.append({
+            "type": "way",
+            "id": i + 1,
+            "nodes": list(range(i * 10 + 1, i * 10 + 11)),
+            "tags": {"highway": "residential", "name": f"Street {i % 100}"},
+        })
+    return json.dumps({"version": 0.6, "elements": elements})
+
+
+def measure(name: str, result: overpy.Result, dumps):
+    start = time.perf_counter()
+    data = dumps(result)
+    dump_time = time.perf_counter() - start
+    start = time.perf_counter()
+    pickle.loads(data)
+    load_time = time.perf_counter() - start
+    way_size = len(dumps(result.ways[0]))
+    print(
+        f"  {name:8} {len(data) / 1e6:7.1f} MB  dump {dump_time:5.2f} s  load {load_time:5.2f} s"
+        f"  single way {way_size / 1e3:9.1f} kB"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data = create_data(count)
+    for columnar_nodes in (False, True):
+        result = overpy.Overpass(columnar_nodes=columnar_nodes).parse_json(data)
+        print(f"Nodes: {count}, ways: {count // 10}, columnar nodes: {columnar_nodes}")
+        measure("generic", result, generic_dumps)
+        measure("overpy", result, lambda obj: pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+if __name__ == "__main__":
+    main()
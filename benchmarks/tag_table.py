@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Compare value counts and tag filters on the dictionary-encoded tag table with scanning the tags of the elements.
+
+Usage: python benchmarks/tag_table.py [number of ways]
+"""
+from collections import Counter
+import re
+import sys
+import time
+
+import overpy
+
+HIGHWAYS = ("residential", "service", "footway", "track", "primary", "secondary", "tertiary", "unclassified")
+
+
+def create_result(count: int) -> overpy.Result:
+    result = overpy.Result()
+    for i in range(count):
+        tags = {"highway": HIGHWAYS[i * 7 % len(HIGHWAYS)], "name": f"Street {i % 1000}"}
+        if i % 3 == 0:
+            tags["surface"] = "asphalt"
+        if i % 11 == 0:
+            tags["maxspeed"] = str(30 + i % 4 * 20)
+        result.append(overpy.Way(way_id=i + 1, node_ids=[], tags=tags, result=result))
+    return result
+
+
+def timed(name: str, func):
+    start = time.perf_counter()
+    value = func()
+    print(f"  {name:40} {time.perf_counter() - start:7.3f} s")
+    return value
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    result = create_result(count)
+    pattern = re.compile("^Street 1")
+    print(f"Ways: {count}")
+
+    tags = timed("build tag table", result.tag_table)
+    print("Value counts of highway")
+    expected = timed("scan tags", lambda: Counter(way.tags["highway"] for way in result.ways if "highway" in way.tags))
+    for use_numpy in (False, True):
+        counts = timed(f"tag table (numpy: {use_numpy})", lambda: tags.value_counts("highway", use_numpy=use_numpy))
+        assert dict(counts) == expected
+    print("Find name matching a regular expression")
+    expected = timed("scan tags", lambda: [way.id for way in result.ways if pattern.search(way.tags.get("name", ""))])
+    for use_numpy in (False, True):
+        found = timed(f"tag table (numpy: {use_numpy})", lambda: tags.find("name", pattern, use_numpy=use_numpy))
+        assert [tags.element_ids[i] for i in found] == expected
+
+
+if __name__ == "__main__":
+    main()
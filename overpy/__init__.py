@@ -1,16 +1,30 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, MutableMapping, Sequence, ValuesView
 from datetime import datetime
 from decimal import Decimal
-from functools import partial
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from itertools import islice
 from urllib.request import urlopen
 from urllib.error import HTTPError
 from xml.sax import handler, make_parser
 import xml.etree.ElementTree
 import json
+import os
 import re
 import time
-from typing import Any, Callable, ClassVar, Dict, List, NoReturn, Optional, Tuple, Type, TypeVar, Union
+from typing import (
+    Any, Callable, ClassVar, Dict, Iterable, Iterator, List, NamedTuple, NoReturn, Optional, Pattern, TextIO, Tuple,
+    Type, TypeVar, Union
+)
 
 from overpy import exception
+from overpy.geometry import Polygon, multipolygon
+from overpy.graph import Graph, build_graph
+from overpy.serializer import dump_json, dump_ndjson, dump_xml, iter_ndjson, load_ndjson
+from overpy.spatial import GridIndex
+from overpy.table import TagTable, build_tag_table
 # Ignore flake8 F401 warning for unused vars
 from overpy.__about__ import (  # noqa: F401
     __author__, __copyright__, __email__, __license__, __summary__, __title__,
@@ -22,14 +36,59 @@ ElementTypeVar = TypeVar("ElementTypeVar", bound="Element")
 XML_PARSER_DOM = 1
 XML_PARSER_SAX = 2
 
+#: Keep the element already in the result
+MERGE_KEEP_FIRST = 1
+#: Replace the element in the result if the new one has a higher version
+MERGE_NEWEST_VERSION = 2
+#: Always replace the element in the result
+MERGE_REPLACE = 3
+
+#: Keep the tags of the parsed elements
+KEEP_TAGS = 1
+#: Keep the attributes of the parsed elements like version, timestamp and user
+KEEP_ATTRIBUTES = 2
+#: Keep the center coordinates of the parsed ways and relations
+KEEP_CENTER = 4
+#: Keep all fields of the parsed elements
+KEEP_ALL = KEEP_TAGS | KEEP_ATTRIBUTES | KEEP_CENTER
+
+_PATTERN_TYPE = type(re.compile(""))
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(ts: str) -> datetime:
+    """
+    Parse an OSM timestamp. The result is memoized because elements of the same changeset share the timestamp.
+
+    :param ts: Timestamp in the format YYYY-MM-DDTHH:MM:SSZ
+    :return: The parsed timestamp
+    """
+    if len(ts) == 20 and ts[4] == "-" and ts[7] == "-" and ts[10] == "T" and ts[19] == "Z":
+        try:
+            return datetime(
+                int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                int(ts[11:13]), int(ts[14:16]), int(ts[17:19])
+            )
+        except ValueError:
+            pass
+    return datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_bool(value: Union[str, bool]) -> bool:
+    # JSON responses contain booleans, XML responses the strings true and false
+    if isinstance(value, bool):
+        return value
+    return value.lower() == "true"
+
+
 # Try to convert some common attributes
 # http://wiki.openstreetmap.org/wiki/Elements#Common_attributes
 GLOBAL_ATTRIBUTE_MODIFIERS: Dict[str, Callable] = {
     "changeset": int,
-    "timestamp": lambda ts: datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ"),
+    "timestamp": _parse_timestamp,
     "uid": int,
     "version": int,
-    "visible": lambda v: v.lower() == "true"
+    "visible": _parse_bool
 }
 
 GLOBAL_ATTRIBUTE_SERIALIZERS: Dict[str, Callable] = {
@@ -43,6 +102,226 @@ def _attributes_to_json(attributes: dict):
     return {k: attr_serializer(k)(v) for k, v in attributes.items()}
 
 
+class _LazyAttributes(dict):
+    """
+    Attributes of an element. The values are converted by the attribute modifiers on first access.
+
+    :param attributes: The raw attributes
+    :param modifiers: Map of attribute names to the functions used to convert the raw values
+    """
+
+    __slots__ = ("_modifiers", "_pending")
+
+    def __init__(self, attributes: dict, modifiers: Dict[str, Callable]):
+        dict.__init__(self, attributes)
+        self._modifiers = modifiers
+        #: Names of the attributes not converted yet
+        self._pending: Optional[set] = attributes.keys() & modifiers.keys() or None
+
+    def _convert(self, name):
+        pending = self._pending
+        if pending is not None and name in pending:
+            pending.discard(name)
+            if not pending:
+                self._pending = None
+            dict.__setitem__(self, name, self._modifiers[name](dict.__getitem__(self, name)))
+
+    def _convert_all(self):
+        if self._pending is not None:
+            for name in tuple(self._pending):
+                self._convert(name)
+
+    def __getitem__(self, name):
+        self._convert(name)
+        return dict.__getitem__(self, name)
+
+    def __setitem__(self, name, value):
+        if self._pending is not None:
+            self._pending.discard(name)
+        dict.__setitem__(self, name, value)
+
+    def __delitem__(self, name):
+        if self._pending is not None:
+            self._pending.discard(name)
+        dict.__delitem__(self, name)
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(), {**d} and similar use __getitem__ instead of copying the raw values
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self._convert_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._convert_all()
+        return dict.__ne__(self, other)
+
+    def __repr__(self) -> str:
+        self._convert_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        self._convert_all()
+        return dict, (dict(dict.items(self)),)
+
+    def clear(self):
+        self._pending = None
+        dict.clear(self)
+
+    def copy(self) -> dict:
+        self._convert_all()
+        return dict(dict.items(self))
+
+    def get(self, name, default=None):
+        if name not in self:
+            return default
+        return self[name]
+
+    def items(self):
+        self._convert_all()
+        return dict.items(self)
+
+    def pop(self, name, *args):
+        self._convert(name)
+        return dict.pop(self, name, *args)
+
+    def popitem(self):
+        self._convert_all()
+        return dict.popitem(self)
+
+    def setdefault(self, name, default=None):
+        self._convert(name)
+        return dict.setdefault(self, name, default)
+
+    def update(self, *args, **kwargs):
+        new = dict(*args, **kwargs)
+        if self._pending is not None:
+            self._pending.difference_update(new.keys())
+        dict.update(self, new)
+
+    def values(self):
+        self._convert_all()
+        return dict.values(self)
+
+
+class _FrozenDict(dict):
+    """
+    Read-only dict used to share the same empty containers between many elements in lean mode and identical tags if
+    tags are shared.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("The mapping is read-only, assign a new dict to modify it")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly  # type: ignore[assignment]
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(frozenset(dict.items(self)))
+
+    def __reduce__(self):
+        if not self:
+            return "_EMPTY_DICT"
+        return _FrozenDict, (dict(self),)
+
+
+_EMPTY_DICT = _FrozenDict()
+
+
+class _TagPool:
+    """
+    Intern the keys and values of the tags of the elements created while parsing a response, the same strings are
+    used for all elements. Identical tags are replaced by one shared read-only dict if tags are shared.
+
+    :param share: Share identical tags between the elements
+    """
+
+    __slots__ = ("_strings", "_shared")
+
+    def __init__(self, share: bool = False):
+        self._strings: Dict[Optional[str], Optional[str]] = {}
+        self._shared: Optional[Dict[_FrozenDict, _FrozenDict]] = {} if share else None
+
+    def get(self, tags: dict) -> dict:
+        """
+        Get the tags with interned keys and values.
+
+        :param tags: The tags of an element
+        :return: A new dict or the shared dict with the same tags
+        """
+        strings = self._strings
+        try:
+            interned = {strings.setdefault(k, k): strings.setdefault(v, v) for k, v in tags.items()}
+        except TypeError:
+            # Values which are not hashable can't be interned
+            return tags
+        if self._shared is None:
+            return interned
+        frozen = _FrozenDict(interned)
+        return self._shared.setdefault(frozen, frozen)
+
+
+def _attributes_state(attributes: Optional[dict]) -> Tuple[Optional[dict], Union[None, bool, set]]:
+    """
+    Get the raw attributes and the names of the attributes not converted yet to pickle them without conversion.
+    True is used instead of the names if no attribute is converted yet.
+    """
+    if isinstance(attributes, _LazyAttributes):
+        pending = attributes._pending
+        if pending is None:
+            return dict(dict.items(attributes)), None
+        if pending == attributes.keys() & attributes._modifiers.keys():
+            return dict(dict.items(attributes)), True
+        return dict(dict.items(attributes)), set(pending)
+    return attributes, None
+
+
+def _restore_attributes(
+        state: Tuple[Optional[dict], Union[None, bool, set]],
+        modifiers: Dict[str, Callable]) -> Optional[dict]:
+    attributes, pending = state
+    if pending:
+        attributes = _LazyAttributes(attributes, modifiers)
+        if pending is not True:
+            attributes._pending = pending
+    return attributes
+
+
+def _coordinates_state(values: Iterable[Optional[Union[Decimal, float]]]) -> tuple:
+    """
+    Convert Decimal coordinates to strings, pickling strings is faster and the result is smaller.
+    """
+    return tuple([str(value) if isinstance(value, Decimal) else value for value in values])
+
+
+def _restore_coordinates(values: tuple) -> List[Optional[Union[Decimal, float]]]:
+    return [Decimal(value) if isinstance(value, str) else value for value in values]
+
+
+@lru_cache(maxsize=None)
+def _state_slots(cls: type) -> Tuple[str, ...]:
+    """
+    Get the names of the slots of a class and its base classes except the reference to the result.
+    """
+    return tuple(
+        name for base in reversed(cls.__mro__) for name in base.__dict__.get("__slots__", ()) if name != "_result"
+    )
+
+
+def _element_state(element: Any) -> tuple:
+    return tuple(getattr(element, name, None) for name in _state_slots(element.__class__))
+
+
+def _restore_element(cls: type, values: tuple) -> Any:
+    element = cls.__new__(cls)
+    element._result = None
+    for name, value in zip(_state_slots(cls), values):
+        setattr(element, name, value)
+    return element
+
+
 def is_valid_type(
         element: Union["Area", "Node", "Relation", "Way"],
         cls: Type[Union["Area", "Element", "Node", "Relation", "Way"]]) -> bool:
@@ -65,6 +344,14 @@ class Overpass:
     :param xml_parser: The xml parser to use
     :param max_retry_count: Max number of retries (Default: default_max_retry_count)
     :param retry_timeout: Time to wait between tries (Default: default_retry_timeout)
+    :param attribute_modifiers: Additional or replaced functions to convert attribute values
+    :param lean: Reduce the memory usage of the elements by sharing read-only empty tags and attributes
+    :param columnar_nodes: Store the nodes of the results in columns and create Node objects on access
+    :param parse_workers: Parse large responses with this number of processes, the attribute modifiers have to be
+                          picklable if greater than 1
+    :param intern_tags: Use the same string objects for equal tag keys and values of the parsed elements. Saves
+                        memory if many elements have the same tags, but makes parsing slower.
+    :param share_tags: Share identical tags of the parsed elements as read-only dicts, implies intern_tags
     """
 
     #: Global max number of retries (Default: 0)
@@ -85,7 +372,13 @@ class Overpass:
             url: Optional[str] = None,
             xml_parser: int = XML_PARSER_SAX,
             max_retry_count: int = None,
-            retry_timeout: float = None):
+            retry_timeout: float = None,
+            attribute_modifiers: Optional[Dict[str, Callable]] = None,
+            lean: bool = False,
+            columnar_nodes: bool = False,
+            parse_workers: int = 1,
+            intern_tags: bool = False,
+            share_tags: bool = False):
 
         #: URL to use for this instance
         self.url = self.default_url
@@ -115,6 +408,26 @@ class Overpass:
         #: The XML parser to use for this instance
         self.xml_parser = xml_parser
 
+        #: Functions used to convert the attribute values of the elements, the conversion is done on first access
+        self.attribute_modifiers: Dict[str, Callable] = dict(GLOBAL_ATTRIBUTE_MODIFIERS)
+        if attribute_modifiers is not None:
+            self.attribute_modifiers.update(attribute_modifiers)
+
+        #: Share read-only empty tags and attributes between the elements of the results
+        self.lean = lean
+
+        #: Store the nodes of the results in a :class:`overpy.NodeStore`
+        self.columnar_nodes = columnar_nodes
+
+        #: Number of processes used to parse large responses, see :mod:`overpy.parallel`
+        self.parse_workers = parse_workers
+
+        #: Intern the tag keys and values of the parsed elements
+        self.intern_tags = intern_tags
+
+        #: Share identical tags of the parsed elements as read-only dicts
+        self.share_tags = share_tags
+
     @staticmethod
     def _handle_remark_msg(msg: str) -> NoReturn:
         """
@@ -132,11 +445,12 @@ class Overpass:
             raise exception.OverpassRuntimeRemark(msg=msg)
         raise exception.OverpassUnknownError(msg=msg)
 
-    def query(self, query: Union[bytes, str]) -> "Result":
+    def query(self, query: Union[bytes, str], element_filter: Optional["ElementFilter"] = None) -> "Result":
         """
         Query the Overpass API
 
         :param query: The query string in Overpass QL
+        :param element_filter: Only create the elements and fields selected by this filter
         :return: The parsed result
         """
         if not isinstance(query, bytes):
@@ -161,9 +475,9 @@ class Overpass:
             if f.code == 200:
                 content_type = f.getheader("Content-Type")
                 if content_type == "application/json":
-                    return self.parse_json(response)
+                    return self.parse_json(response, element_filter=element_filter)
                 elif content_type == "application/osm3s+xml":
-                    return self.parse_xml(response)
+                    return self.parse_xml(response, element_filter=element_filter)
                 else:
                     current_exception = exception.OverpassUnknownContentType(content_type)
             elif f.code == 400:
@@ -190,37 +504,57 @@ class Overpass:
     def parse_json(
             self,
             data: Union[bytes, str],
-            encoding: str = "utf-8"
+            encoding: str = "utf-8",
+            workers: Optional[int] = None,
+            element_filter: Optional["ElementFilter"] = None
     ) -> "Result":
         """
         Parse raw response from Overpass service.
 
         :param data: Raw JSON Data
         :param encoding: Encoding to decode byte string
+        :param workers: Number of processes to parse large responses with, see :mod:`overpy.parallel` (Default: use
+                        setting from api)
+        :param element_filter: Only create the elements and fields selected by this filter
         :return: Result object
         """
+        if workers is None:
+            workers = self.parse_workers
+
         if isinstance(data, bytes):
             data = data.decode(encoding)
+        if workers > 1:
+            from overpy import parallel
+            result = parallel.parse_json(self, data, workers, element_filter=element_filter)
+            if result is not None:
+                return result
         data_parsed: dict = json.loads(data, parse_float=Decimal)
         if "remark" in data_parsed:
             self._handle_remark_msg(msg=data_parsed.get("remark"))
-        return Result.from_json(data_parsed, api=self)
+        return Result.from_json(data_parsed, api=self, element_filter=element_filter)
 
     def parse_xml(
             self,
             data: Union[bytes, str],
             encoding: str = "utf-8",
-            parser: Optional[int] = None
+            parser: Optional[int] = None,
+            workers: Optional[int] = None,
+            element_filter: Optional["ElementFilter"] = None
     ) -> "Result":
         """
 
         :param data: Raw XML Data
         :param encoding: Encoding to decode byte string
         :param parser: The XML parser to use
+        :param workers: Number of processes to parse large responses with, see :mod:`overpy.parallel` (Default: use
+                        setting from api)
+        :param element_filter: Only create the elements and fields selected by this filter
         :return: Result object
         """
         if parser is None:
             parser = self.xml_parser
+        if workers is None:
+            workers = self.parse_workers
 
         if isinstance(data, bytes):
             data = data.decode(encoding)
@@ -229,7 +563,291 @@ class Overpass:
         if m:
             self._handle_remark_msg(m.group("msg"))
 
-        return Result.from_xml(data, api=self, parser=parser)
+        if workers > 1:
+            from overpy import parallel
+            result = parallel.parse_xml(self, data, workers, parser, element_filter=element_filter)
+            if result is not None:
+                return result
+        return Result.from_xml(data, api=self, parser=parser, element_filter=element_filter)
+
+
+class ElementView(Sequence):
+    """
+    Read-only live view on the elements of one type in a result.
+
+    The view reflects changes of the result and does not copy the elements. Indexing by position is supported for
+    compatibility with lists, use :meth:`get` to look up an element by its ID. The positions are looked up in a list
+    of the IDs kept by the result, it is only extended by the IDs of elements added since the last lookup.
+
+    :param elements: Map of IDs to the elements
+    :param positions: IDs of the elements in insertion order, shared by the views of the same collection
+    """
+
+    __slots__ = ("_elements", "_positions")
+
+    def __init__(self, elements: MutableMapping, positions: Optional[List[int]] = None):
+        self._elements = elements
+        self._positions = [] if positions is None else positions
+
+    def __contains__(self, item) -> bool:
+        if isinstance(item, Element):
+            item = item.id
+        return item in self._elements
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ElementView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __getitem__(self, index):
+        elements = self._elements
+        if isinstance(elements, NodeStore):
+            rows = range(len(elements))[index]
+            if isinstance(index, slice):
+                return [elements._create_node(row) for row in rows]
+            return elements._create_node(rows)
+        ids = _get_positions(elements, self._positions)[index]
+        if isinstance(index, slice):
+            return [elements[elem_id] for elem_id in ids]
+        return elements[ids]
+
+    def __iter__(self):
+        return iter(self._elements.values())
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def __repr__(self) -> str:
+        return f"<overpy.ElementView {list(self)!r}>"
+
+    def get(self, elem_id: int, default: Any = None) -> Any:
+        """
+        Get an element by its ID.
+
+        :param elem_id: The ID of the element
+        :param default: Returned if the element is not available
+        :return: The element or the default value
+        """
+        return self._elements.get(elem_id, default)
+
+
+class ElementIdView(Sequence):
+    """
+    Read-only live view on the IDs of the elements of one type in a result.
+
+    :param elements: Map of IDs to the elements
+    :param positions: IDs of the elements in insertion order, shared by the views of the same collection
+    """
+
+    __slots__ = ("_elements", "_positions")
+
+    def __init__(self, elements: MutableMapping, positions: Optional[List[int]] = None):
+        self._elements = elements
+        self._positions = [] if positions is None else positions
+
+    def __contains__(self, elem_id) -> bool:
+        return elem_id in self._elements
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ElementIdView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __getitem__(self, index):
+        if isinstance(self._elements, NodeStore):
+            if isinstance(index, slice):
+                return self._elements.ids[index].tolist()
+            return self._elements.ids[index]
+        return _get_positions(self._elements, self._positions)[index]
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def __repr__(self) -> str:
+        return f"<overpy.ElementIdView {list(self)!r}>"
+
+
+def _get_positions(elements: Mapping, positions: List[int]) -> List[int]:
+    """
+    Bring the list of the IDs in insertion order up to date. Elements are only added to the end of the collections
+    or replaced in place, so only the IDs of the added elements have to be appended.
+    """
+    if len(positions) > len(elements):
+        positions.clear()
+    if len(positions) < len(elements):
+        positions.extend(islice(elements, len(positions), None))
+    return positions
+
+
+def _is_newer_version(element: "Element", current: "Element") -> bool:
+    """
+    Test if an element has a higher version than the current one. Elements without version are never newer.
+    """
+    version = element.attributes.get("version")
+    if version is None:
+        return False
+    current_version = current.attributes.get("version")
+    return current_version is None or int(version) > int(current_version)
+
+
+def _is_modified(element: "Element", other: "Element") -> bool:
+    """
+    Test if two versions of an element differ, by the version attribute if both have one and by the tags and the
+    geometry otherwise.
+    """
+    version = element.attributes.get("version")
+    other_version = other.attributes.get("version")
+    if version is not None and other_version is not None:
+        return int(version) != int(other_version)
+    if element.tags != other.tags:
+        return True
+    if isinstance(element, Node):
+        return element.lat != other.lat or element.lon != other.lon
+    if isinstance(element, Way):
+        return element._node_ids != other._node_ids
+    if isinstance(element, Relation):
+        return [(m._type_value, m.ref, m.role) for m in element.members or ()] != \
+            [(m._type_value, m.ref, m.role) for m in other.members or ()]
+    return False
+
+
+def _value_matcher(value: Union[None, str, Iterable[str], Pattern]) -> Callable[[Optional[str]], bool]:
+    """
+    Create a function to test tag values, see :meth:`Result.find` for the supported values.
+    """
+    if value is None:
+        def matches(v: Optional[str]) -> bool:
+            return True
+    elif isinstance(value, str):
+        def matches(v: Optional[str]) -> bool:
+            return v == value
+    elif isinstance(value, _PATTERN_TYPE):
+        def matches(v: Optional[str]) -> bool:
+            return v is not None and value.search(v) is not None
+    else:
+        value_set = frozenset(value)
+
+        def matches(v: Optional[str]) -> bool:
+            return v in value_set
+    return matches
+
+
+class ElementFilter:
+    """
+    Select the elements created by the parsers and the fields kept for them.
+
+    The filter is evaluated with the raw data before an element is created, so elements not matching it are never
+    allocated. Ways keep the IDs of their nodes and relations keep their members, elements referenced by them may be
+    missing in the result. Tags and attributes not kept are replaced by a shared read-only empty dict and the center
+    by None.
+
+    :param key: Only keep elements having this tag
+    :param value: Test the value of the tag like :meth:`Result.find`, None to only test if the tag exists
+    :param types: Only keep elements of these types, classes or type names like 'node' (Default: all types)
+    :param predicate: Function called with the type name, the ID and the tags of an element, the element is only kept
+                      if the return value is true. It has to be picklable to parse with more than one process.
+    :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
+    :raises ValueError: If a value is given without key or a type is unknown
+    """
+
+    def __init__(
+            self,
+            key: Optional[str] = None,
+            value: Union[None, str, Iterable[str], Pattern] = None,
+            types: Optional[Iterable[Union[str, Type["Element"]]]] = None,
+            predicate: Optional[Callable[[str, int, dict], Any]] = None,
+            keep: int = KEEP_ALL):
+        if key is None and value is not None:
+            raise ValueError("Unable to test a tag value without key")
+
+        type_names: Optional[frozenset] = None
+        if types is not None:
+            type_names = frozenset(t if isinstance(t, str) else t._type_value for t in types)
+            unknown = type_names - {"area", "node", "relation", "way"}
+            if unknown:
+                raise ValueError(f"Unknown element types: {sorted(unknown)!r}")
+
+        #: Only keep elements having this tag
+        self.key = key
+        #: The value to test the tag with
+        self.value = value
+        #: Names of the element types to keep, None to keep all types
+        self.types = type_names
+        #: Function called with the type name, the ID and the tags of an element
+        self.predicate = predicate
+        #: The fields to keep
+        self.keep = keep
+        self._matches = None if key is None else _value_matcher(value)
+
+    def __reduce__(self):
+        return self.__class__, (self.key, self.value, self.types, self.predicate, self.keep)
+
+    def __repr__(self) -> str:
+        return f"<overpy.ElementFilter key={self.key!r} value={self.value!r} types={self.types!r} keep={self.keep}>"
+
+    @property
+    def uses_tags(self) -> bool:
+        """
+        The tags of the elements are required to evaluate the filter.
+        """
+        return self.key is not None or self.predicate is not None
+
+    def accepts_type(self, type_name: str) -> bool:
+        """
+        Test if elements of a type may be kept.
+
+        :param type_name: The type name like 'node'
+        :return: False if no element of this type is kept
+        """
+        return self.types is None or type_name in self.types
+
+    def accepts(self, type_name: str, elem_id: Optional[int], tags: dict) -> bool:
+        """
+        Test if an element is kept.
+
+        :param type_name: The type name like 'node'
+        :param elem_id: The ID of the element
+        :param tags: The tags of the element
+        :return: True if the element is kept
+        """
+        if self.types is not None and type_name not in self.types:
+            return False
+        if self.key is not None and (self.key not in tags or not self._matches(tags[self.key])):
+            return False
+        return self.predicate is None or bool(self.predicate(type_name, elem_id, tags))
+
+    def accepts_xml(self, type_name: str, child: xml.etree.ElementTree.Element) -> bool:
+        """
+        Test if an element is kept using the XML data.
+
+        :param type_name: The type name like 'node'
+        :param child: The XML node of the element
+        :return: True if the element is kept
+        """
+        elem_id_str: Optional[str] = child.attrib.get("id")
+        tags: dict = _EMPTY_DICT
+        if self.uses_tags:
+            tags = {
+                sub_child.attrib.get("k"): sub_child.attrib.get("v")
+                for sub_child in child if sub_child.tag.lower() == "tag"
+            }
+        return self.accepts(type_name, None if elem_id_str is None else int(elem_id_str), tags)
+
+
+class ResultDiff(NamedTuple):
+    """
+    Changes between two results, see :meth:`Result.diff`
+    """
+
+    #: Elements only in the new result
+    added: "Result"
+    #: Elements only in the old result
+    removed: "Result"
+    #: Elements in both results which have been changed, taken from the new result
+    modified: "Result"
 
 
 class Result:
@@ -238,21 +856,37 @@ class Result:
 
     :param elements: List of elements to initialize the result with
     :param api: The API object to load additional resources and elements
+    :param lean: Share read-only empty tags and attributes between the elements (Default: use setting from api)
+    :param columnar_nodes: Store the nodes in a :class:`overpy.NodeStore` (Default: use setting from api)
     """
 
+    #: Size of the cells of the spatial indexes in degrees
+    default_spatial_cell_size: ClassVar[float] = 0.01
+
     def __init__(
             self,
             elements: Optional[List[Union["Area", "Node", "Relation", "Way"]]] = None,
-            api: Optional[Overpass] = None):
+            api: Optional[Overpass] = None,
+            lean: Optional[bool] = None,
+            columnar_nodes: Optional[bool] = None):
 
         if elements is None:
             elements = []
+        if columnar_nodes is None:
+            columnar_nodes = api is not None and api.columnar_nodes
         self._areas: Dict[int, Union["Area", "Node", "Relation", "Way"]] = {
             element.id: element for element in elements if is_valid_type(element, Area)
         }
-        self._nodes = {
-            element.id: element for element in elements if is_valid_type(element, Node)
-        }
+        self._nodes: MutableMapping
+        if columnar_nodes:
+            self._nodes = NodeStore(result=self)
+            for element in elements:
+                if is_valid_type(element, Node):
+                    self._nodes.setdefault(element.id, element)
+        else:
+            self._nodes = {
+                element.id: element for element in elements if is_valid_type(element, Node)
+            }
         self._ways = {
             element.id: element for element in elements if is_valid_type(element, Way)
         }
@@ -265,31 +899,236 @@ class Result:
             Relation: self._relations,
             Area: self._areas
         }
+        #: IDs of the elements in insertion order, used by the views to look up elements by position
+        self._positions: Dict[Any, List[int]] = {elem_cls: [] for elem_cls in self._class_collection_map}
         #: The API to use if we need to resolve additional information
         self.api: Optional[Overpass] = api
 
-    def expand(self, other: "Result"):
+        #: Functions called with every element added to the result to keep the built indexes up to date
+        self._index_updaters: List[Callable[["Element"], None]] = []
+        self._node_way_index: Optional[Dict[int, List[int]]] = None
+        self._member_index: Optional[Dict[Tuple[str, int], List[int]]] = None
+        self._tag_index: Optional[Dict[Type["Element"], Dict[str, Dict[str, List[int]]]]] = None
+        self._node_spatial_index: Optional[GridIndex] = None
+        self._way_spatial_index: Optional[GridIndex] = None
+
+        #: Pool used for the tags of the elements created while parsing
+        self._tag_pool: Optional[_TagPool] = None
+
+        if lean is None:
+            lean = api is not None and api.lean
+        #: Elements created for this result share read-only empty tags and attributes
+        self.lean: bool = lean
+
+    @property
+    def attribute_modifiers(self) -> Dict[str, Callable]:
+        """
+        The functions used to convert the attribute values of the elements in this result.
+        """
+        if self.api is None:
+            return GLOBAL_ATTRIBUTE_MODIFIERS
+        return self.api.attribute_modifiers
+
+    @contextmanager
+    def _parsing(self):
+        """
+        Intern or share the tags of the elements created in the context as configured in the API.
+        """
+        api = self.api
+        if api is not None and (api.intern_tags or api.share_tags):
+            self._tag_pool = _TagPool(share=api.share_tags)
+        try:
+            yield self
+        finally:
+            self._tag_pool = None
+
+    def __reduce__(self):
+        """
+        Pickle the result as columns grouped by element type. The elements are restored with the reference to the
+        restored result, attributes are pickled without converting them and the indexes are rebuilt on next use.
+        """
+        nodes = self._nodes
+        if isinstance(nodes, NodeStore):
+            node_state: tuple = (
+                nodes.ids, nodes.lats, nodes.lons, dict(nodes.tag_rows()),
+                {row: _attributes_state(attributes) for row, attributes in nodes.attribute_rows()}
+            )
+        else:
+            node_state = self._element_columns(nodes.values()) + (
+                _coordinates_state(node.lat for node in nodes.values()),
+                _coordinates_state(node.lon for node in nodes.values()),
+            )
+
+        ways = self._ways.values()
+        counts = array("q", [-1 if way._node_ids is None else len(way._node_ids) for way in ways])
+        refs = array("q")
+        for way in ways:
+            refs.extend(way._node_ids or ())
+        way_state = self._element_columns(ways) + (
+            counts,
+            refs,
+            _coordinates_state(way.center_lat for way in ways),
+            _coordinates_state(way.center_lon for way in ways),
+        )
+
+        relations = self._relations.values()
+        relation_state = self._element_columns(relations) + (
+            _coordinates_state(relation.center_lat for relation in relations),
+            _coordinates_state(relation.center_lon for relation in relations),
+            tuple(
+                None if relation.members is None else tuple(
+                    (member.__class__, member.ref, member.role, _attributes_state(member.attributes), member.geometry)
+                    for member in relation.members
+                )
+                for relation in relations
+            ),
+        )
+        state = (node_state, way_state, relation_state, self._element_columns(self._areas.values()))
+        return _restore_result, (self.__class__, self.api, self.lean, isinstance(nodes, NodeStore), state)
+
+    @staticmethod
+    def _element_columns(elements: Iterable["Element"]) -> tuple:
+        elements = list(elements)
+        return (
+            array("q", [element.id for element in elements]),
+            [element.tags for element in elements],
+            [_attributes_state(element.attributes) for element in elements],
+        )
+
+    def _empty_copy(self) -> "Result":
+        """
+        Create an empty result with the settings of this result.
+        """
+        return Result(api=self.api, lean=self.lean, columnar_nodes=isinstance(self._nodes, NodeStore))
+
+    def __or__(self, other: "Result") -> "Result":
+        """
+        Create a new result with the elements of both results, elements of this result are preferred.
+        """
+        if not isinstance(other, Result):
+            return NotImplemented
+        result = self._empty_copy()
+        for element_type, collection in result._class_collection_map.items():
+            collection.update(self._class_collection_map[element_type])
+        result.expand(other)
+        return result
+
+    def __and__(self, other: "Result") -> "Result":
+        """
+        Create a new result with the elements of this result also in the other result.
+        """
+        if not isinstance(other, Result):
+            return NotImplemented
+        result = self._empty_copy()
+        for element_type, collection in result._class_collection_map.items():
+            other_collection = other._class_collection_map[element_type]
+            collection.update({
+                element_id: element
+                for element_id, element in self._class_collection_map[element_type].items()
+                if element_id in other_collection
+            })
+        return result
+
+    def __sub__(self, other: "Result") -> "Result":
+        """
+        Create a new result with the elements of this result not in the other result.
+        """
+        if not isinstance(other, Result):
+            return NotImplemented
+        result = self._empty_copy()
+        for element_type, collection in result._class_collection_map.items():
+            other_collection = other._class_collection_map[element_type]
+            collection.update({
+                element_id: element
+                for element_id, element in self._class_collection_map[element_type].items()
+                if element_id not in other_collection
+            })
+        return result
+
+    def diff(self, other: "Result") -> ResultDiff:
+        """
+        Compare this result with a newer result.
+
+        Elements are matched by type and ID. An element is modified if the version attributes differ or, if one of
+        the elements has no version, if the tags or the geometry differ. The element objects are not copied.
+
+        :param other: The newer result
+        :return: Added, removed and modified elements
+        :raises ValueError: If provided parameter is not instance of :class:`overpy.Result`
+        """
+        if not isinstance(other, Result):
+            raise ValueError("Provided argument has to be instance of overpy:Result()")
+        modified = self._empty_copy()
+        for element_type, collection in modified._class_collection_map.items():
+            own_collection = self._class_collection_map[element_type]
+            changed = {}
+            for element_id, element in other._class_collection_map[element_type].items():
+                current = own_collection.get(element_id)
+                if current is not None and _is_modified(current, element):
+                    changed[element_id] = element
+            collection.update(changed)
+        return ResultDiff(added=other - self, removed=self - other, modified=modified)
+
+    def expand(self, other: "Result", merge: int = MERGE_KEEP_FIRST):
         """
         Add all elements from another result to the list of elements of this result object.
 
-        It is used by the auto resolve feature.
+        It is used by the auto resolve feature. The elements are merged with dict operations on the underlying
+        collections, indexes built for this result are updated with the added elements or dropped and rebuilt on
+        next use if elements are replaced.
 
         :param other: Expand the result with the elements from this result.
-        :raises ValueError: If provided parameter is not instance of :class:`overpy.Result`
+        :param merge: How to handle elements already in the result, one of :data:`MERGE_KEEP_FIRST`,
+                      :data:`MERGE_NEWEST_VERSION` and :data:`MERGE_REPLACE`
+        :raises ValueError: If provided parameter is not instance of :class:`overpy.Result` or the merge policy is
+                            unknown
         """
         if not isinstance(other, Result):
             raise ValueError("Provided argument has to be instance of overpy:Result()")
+        if merge not in (MERGE_KEEP_FIRST, MERGE_NEWEST_VERSION, MERGE_REPLACE):
+            raise ValueError(f"Unknown merge policy {merge!r}")
 
-        other_collection_map: Dict[Type["Element"], List[Union["Area", "Node", "Relation", "Way"]]] = {
-            Area: other.areas,
-            Node: other.nodes,
-            Relation: other.relations,
-            Way: other.ways
-        }
         for element_type, own_collection in self._class_collection_map.items():
-            for element in other_collection_map[element_type]:
-                if is_valid_type(element, element_type) and element.id not in own_collection:
-                    own_collection[element.id] = element
+            other_collection = other._class_collection_map[element_type]
+            if not other_collection:
+                continue
+            replaced = False
+            if merge == MERGE_KEEP_FIRST:
+                new = {
+                    element_id: element
+                    for element_id, element in other_collection.items()
+                    if element_id not in own_collection
+                }
+            elif merge == MERGE_REPLACE:
+                new = other_collection
+                replaced = not own_collection.keys().isdisjoint(other_collection.keys())
+            else:
+                new = {}
+                for element_id, element in other_collection.items():
+                    current = own_collection.get(element_id)
+                    if current is None:
+                        new[element_id] = element
+                    elif _is_newer_version(element, current):
+                        new[element_id] = element
+                        replaced = True
+
+            if replaced:
+                self._invalidate_indexes()
+            own_collection.update(new)
+            for update_index in self._index_updaters:
+                for element in new.values():
+                    update_index(element)
+
+    def _invalidate_indexes(self):
+        """
+        Drop all built indexes, they are rebuilt on next use.
+        """
+        self._index_updaters = []
+        self._node_way_index = None
+        self._member_index = None
+        self._tag_index = None
+        self._node_spatial_index = None
+        self._way_spatial_index = None
 
     def append(self, element: Union["Area", "Node", "Relation", "Way"]):
         """
@@ -298,7 +1137,298 @@ class Result:
         :param element: The element to append
         """
         if is_valid_type(element, Element):
-            self._class_collection_map[element.__class__].setdefault(element.id, element)
+            collection = self._class_collection_map[element.__class__]
+            if element.id not in collection:
+                collection[element.id] = element
+                for update_index in self._index_updaters:
+                    update_index(element)
+
+    def _get_node_way_index(self) -> Dict[int, List[int]]:
+        if self._node_way_index is None:
+            self._node_way_index = {}
+            for way in self._ways.values():
+                self._update_node_way_index(way)
+            self._index_updaters.append(self._update_node_way_index)
+        return self._node_way_index
+
+    def _update_node_way_index(self, element: "Element"):
+        if isinstance(element, Way) and element._node_ids is not None:
+            index = self._node_way_index
+            # Closed ways reference the first node twice
+            for node_id in dict.fromkeys(element._node_ids):
+                way_ids = index.get(node_id)
+                if way_ids is None:
+                    index[node_id] = [element.id]
+                else:
+                    way_ids.append(element.id)
+
+    def _get_member_index(self) -> Dict[Tuple[str, int], List[int]]:
+        if self._member_index is None:
+            self._member_index = {}
+            for relation in self._relations.values():
+                self._update_member_index(relation)
+            self._index_updaters.append(self._update_member_index)
+        return self._member_index
+
+    def _update_member_index(self, element: "Element"):
+        if isinstance(element, Relation) and element.members:
+            index = self._member_index
+            for key in dict.fromkeys((member._type_value, member.ref) for member in element.members):
+                rel_ids = index.get(key)
+                if rel_ids is None:
+                    index[key] = [element.id]
+                else:
+                    rel_ids.append(element.id)
+
+    def _get_tag_index(self) -> Dict[Type["Element"], Dict[str, Dict[str, List[int]]]]:
+        if self._tag_index is None:
+            self._tag_index = {elem_cls: {} for elem_cls in self._class_collection_map}
+            for elem_cls, elements in self._class_collection_map.items():
+                if isinstance(elements, NodeStore):
+                    ids = elements.ids
+                    tags_iter = ((ids[row], tags) for row, tags in elements.tag_rows())
+                else:
+                    tags_iter = ((element.id, element.tags) for element in elements.values())
+                index = self._tag_index[elem_cls]
+                for elem_id, tags in tags_iter:
+                    self._add_to_tag_index(index, elem_id, tags)
+            self._index_updaters.append(self._update_tag_index)
+        return self._tag_index
+
+    @staticmethod
+    def _add_to_tag_index(index: Dict[str, Dict[str, List[int]]], elem_id: int, tags: Optional[dict]):
+        if not tags:
+            return
+        for key, value in tags.items():
+            values = index.get(key)
+            if values is None:
+                values = index[key] = {}
+            elem_ids = values.get(value)
+            if elem_ids is None:
+                values[value] = [elem_id]
+            else:
+                elem_ids.append(elem_id)
+
+    def _update_tag_index(self, element: "Element"):
+        index = self._tag_index.get(element.__class__)
+        if index is not None:
+            self._add_to_tag_index(index, element.id, element.tags)
+
+    def find(
+            self,
+            key: str,
+            value: Union[None, str, Iterable[str], Pattern] = None,
+            types: Optional[Iterable[Union[str, Type["Element"]]]] = None) -> List["Element"]:
+        """
+        Find elements by tag.
+
+        The inverted index used for the lookup is built on first use and kept up to date if elements are added. Tags
+        changed after the element was indexed are not taken into account.
+
+        :param key: The tag key
+        :param value: None to test if the tag exists, a string to test for equality, a set or other iterable of
+                      strings to test if the value is one of them or a compiled regular expression to search in the
+                      value
+        :param types: Only return elements of these types, classes or type names like 'node' (Default: all types)
+        :return: List of elements, grouped by type in the order nodes, ways, relations, areas
+        """
+        index = self._get_tag_index()
+        if types is None:
+            elem_classes = list(self._class_collection_map)
+        else:
+            type_names = {elem_cls._type_value: elem_cls for elem_cls in self._class_collection_map}
+            elem_classes = [type_names.get(t, t) if isinstance(t, str) else t for t in types]
+            unknown = [t for t in elem_classes if t not in index]
+            if unknown:
+                raise ValueError(f"Unknown element types: {unknown!r}")
+
+        matches = _value_matcher(value)
+        found: List["Element"] = []
+        for elem_cls in elem_classes:
+            values = index[elem_cls].get(key)
+            if not values:
+                continue
+            elements = self._class_collection_map[elem_cls]
+            if isinstance(value, str):
+                elem_ids: Iterable[int] = values.get(value, ())
+            else:
+                elem_ids = [elem_id for v, ids in values.items() if matches(v) for elem_id in ids]
+            found.extend(elements[elem_id] for elem_id in elem_ids)
+        return found
+
+    def _get_node_spatial_index(self) -> GridIndex:
+        if self._node_spatial_index is None:
+            self._node_spatial_index = GridIndex(cell_size=self.default_spatial_cell_size)
+            self._node_spatial_index.insert_points(*self.node_columns())
+            if self._update_spatial_indexes not in self._index_updaters:
+                self._index_updaters.append(self._update_spatial_indexes)
+        return self._node_spatial_index
+
+    def _get_way_spatial_index(self) -> GridIndex:
+        if self._way_spatial_index is None:
+            self._way_spatial_index = GridIndex(cell_size=self.default_spatial_cell_size)
+            way_ids, offsets, lats, lons = self.way_coordinates(allow_missing=True)
+            for i, way_id in enumerate(way_ids):
+                self._insert_way_bbox(
+                    self._ways[way_id],
+                    lats[offsets[i]:offsets[i + 1]],
+                    lons[offsets[i]:offsets[i + 1]]
+                )
+            if self._update_spatial_indexes not in self._index_updaters:
+                self._index_updaters.append(self._update_spatial_indexes)
+        return self._way_spatial_index
+
+    def _insert_way_bbox(self, way: "Way", lats: Iterable[float], lons: Iterable[float]):
+        lats = [lat for lat in lats if lat == lat]
+        lons = [lon for lon in lons if lon == lon]
+        if lats and lons:
+            self._way_spatial_index.insert(way.id, min(lats), min(lons), max(lats), max(lons))
+        elif way.center_lat is not None and way.center_lon is not None:
+            self._way_spatial_index.insert(way.id, float(way.center_lat), float(way.center_lon))
+
+    def _update_spatial_indexes(self, element: "Element"):
+        if isinstance(element, Node):
+            if self._node_spatial_index is not None and element.lat is not None and element.lon is not None:
+                self._node_spatial_index.insert(element.id, float(element.lat), float(element.lon))
+            # The node might change the bounding box of a way
+            self._way_spatial_index = None
+        elif isinstance(element, Way) and self._way_spatial_index is not None:
+            coordinates = [
+                (float(node.lat), float(node.lon))
+                for node in map(self._nodes.get, element._node_ids or ())
+                if node is not None and node.lat is not None and node.lon is not None
+            ]
+            self._insert_way_bbox(
+                element,
+                [lat for lat, _ in coordinates],
+                [lon for _, lon in coordinates]
+            )
+
+    def nodes_in_bbox(self, south: float, west: float, north: float, east: float) -> List["Node"]:
+        """
+        Get all nodes within a bounding box.
+
+        The spatial index used for the lookup is built on first use.
+
+        :param south: South of the box
+        :param west: West of the box, the box crosses the antimeridian if it is greater than east
+        :param north: North of the box
+        :param east: East of the box
+        :return: List of nodes
+        """
+        nodes = self._nodes
+        return [nodes[node_id] for node_id in self._get_node_spatial_index().query(south, west, north, east)]
+
+    def ways_in_bbox(self, south: float, west: float, north: float, east: float) -> List["Way"]:
+        """
+        Get all ways with a bounding box intersecting a bounding box.
+
+        The bounding box of a way is calculated from the nodes available in the result. The center is used if
+        none of the nodes is available.
+
+        :param south: South of the box
+        :param west: West of the box, the box crosses the antimeridian if it is greater than east
+        :param north: North of the box
+        :param east: East of the box
+        :return: List of ways
+        """
+        ways = self._ways
+        return [ways[way_id] for way_id in self._get_way_spatial_index().query(south, west, north, east)]
+
+    def nearest_nodes(
+            self,
+            lat: float,
+            lon: float,
+            k: int = 1,
+            max_distance: Optional[float] = None) -> List["Node"]:
+        """
+        Get the nodes next to a point.
+
+        :param lat: Latitude of the point
+        :param lon: Longitude of the point
+        :param k: Max number of nodes to return
+        :param max_distance: Only return nodes within this distance in meters
+        :return: List of nodes sorted by the distance to the point
+        """
+        nodes = self._nodes
+        return [
+            nodes[node_id]
+            for _, node_id in self._get_node_spatial_index().nearest(lat, lon, k=k, max_distance=max_distance)
+        ]
+
+    def assemble_multipolygons(
+            self,
+            types: Iterable[str] = ("multipolygon", "boundary"),
+            resolve_missing: bool = False) -> Dict[int, List[Polygon]]:
+        """
+        Assemble the polygons of all multipolygon and boundary relations.
+
+        Relations with missing member ways or nodes are skipped. See :func:`overpy.geometry.multipolygon` for details.
+
+        :param types: Assemble relations with one of these values of the 'type' tag
+        :param resolve_missing: Try to resolve missing ways and nodes
+        :return: Dict with the relation ID as key and the list of polygons as value
+        """
+        types = set(types)
+        polygons = {}
+        for relation in self._relations.values():
+            if (relation.tags or {}).get("type") not in types:
+                continue
+            try:
+                polygons[relation.id] = multipolygon(relation, resolve_missing=resolve_missing)
+            except exception.DataIncomplete:
+                continue
+        return polygons
+
+    def to_graph(self, key: Optional[str] = "highway", oneway: bool = True) -> Graph:
+        """
+        Build a routing graph in CSR format from the ways. See :func:`overpy.graph.build_graph` for details.
+
+        :param key: Only use ways with this tag, None to use all ways
+        :param oneway: Respect the oneway tag and roundabouts
+        :return: The graph
+        """
+        return build_graph(self, key=key, oneway=oneway)
+
+    def tag_table(self, types: Optional[Iterable[Union[str, Type["Element"]]]] = None) -> TagTable:
+        """
+        Build a dictionary-encoded table of the tags for filters, group-bys and value counts over many elements. See
+        :class:`overpy.table.TagTable` for details.
+
+        :param types: Only add elements of these types, classes or type names like 'node' (Default: all types)
+        :return: The table
+        """
+        return build_tag_table(self, types=types)
+
+    def ways_for_node(self, node: Union[int, "Node"]) -> List["Way"]:
+        """
+        Get all ways of the result referencing a node.
+
+        The index used for the lookup is built on first use and kept up to date if elements are added.
+
+        :param node: The node or the ID of the node
+        :return: List of ways
+        """
+        if isinstance(node, Node):
+            node = node.id
+        ways = self._ways
+        return [ways[way_id] for way_id in self._get_node_way_index().get(node, ())]
+
+    def parent_relations(self, element: Union["Element", "RelationMember"]) -> List["Relation"]:
+        """
+        Get all relations of the result having an element as member.
+
+        The index used for the lookup is built on first use and kept up to date if elements are added.
+
+        :param element: The element or a relation member referencing the element
+        :return: List of relations
+        """
+        if isinstance(element, RelationMember):
+            key = (element._type_value, element.ref)
+        else:
+            key = (element._type_value, element.id)
+        relations = self._relations
+        return [relations[rel_id] for rel_id in self._get_member_index().get(key, ())]
 
     def get_elements(
             self,
@@ -311,16 +1441,12 @@ class Result:
         :param elem_id: ID of the object
         :return: List of available elements
         """
-        result: List[ElementTypeVar] = []
         if elem_id is not None:
-            try:
-                result = [self._class_collection_map[filter_cls][elem_id]]
-            except KeyError:
-                result = []
-        else:
-            for e in self._class_collection_map[filter_cls].values():
-                result.append(e)
-        return result
+            element = self._class_collection_map[filter_cls].get(elem_id)
+            if element is None:
+                return []
+            return [element]
+        return list(self._class_collection_map[filter_cls].values())
 
     def get_ids(
             self,
@@ -333,6 +1459,109 @@ class Result:
         """
         return list(self._class_collection_map[filter_cls].keys())
 
+    def node_columns(self, use_numpy: bool = False) -> Tuple[Any, Any, Any]:
+        """
+        Get the IDs and coordinates of all nodes as columns.
+
+        If the nodes are stored in a :class:`overpy.NodeStore` the arrays of the store are returned without copying
+        the data. Missing coordinates are NaN.
+
+        :param use_numpy: Return NumPy arrays sharing the memory with the arrays. The arrays become invalid if nodes
+                          are added to the result.
+        :return: Tuple of IDs(int64), latitudes(float64) and longitudes(float64)
+        """
+        if isinstance(self._nodes, NodeStore):
+            ids, lats, lons = self._nodes.ids, self._nodes.lats, self._nodes.lons
+        else:
+            nan = float("nan")
+            nodes = self._nodes.values()
+            ids = array("q", self._nodes.keys())
+            lats = array("d", [nan if node.lat is None else float(node.lat) for node in nodes])
+            lons = array("d", [nan if node.lon is None else float(node.lon) for node in nodes])
+
+        if use_numpy:
+            import numpy
+            return (
+                numpy.frombuffer(ids, dtype=numpy.int64),
+                numpy.frombuffer(lats, dtype=numpy.float64),
+                numpy.frombuffer(lons, dtype=numpy.float64),
+            )
+        return ids, lats, lons
+
+    def way_coordinates(
+            self,
+            allow_missing: bool = False,
+            use_numpy: bool = False) -> Tuple[Any, Any, Any, Any]:
+        """
+        Get the geometries of all ways in compressed sparse row (CSR) format.
+
+        The coordinates of the way ``way_ids[i]`` are ``lats[offsets[i]:offsets[i + 1]]`` and
+        ``lons[offsets[i]:offsets[i + 1]]``.
+
+        :param allow_missing: Use NaN as coordinates of nodes not available in the result instead of raising an
+                              exception
+        :param use_numpy: Resolve the node references in one vectorized pass and return NumPy arrays
+        :return: Tuple of way IDs(int64), offsets(int64), latitudes(float64) and longitudes(float64)
+        :raises overpy.exception.DataIncomplete: At least one referenced node is not available in the result and
+                                                 allow_missing is False.
+        """
+        way_ids = array("q")
+        offsets = array("q", [0])
+        refs = array("q")
+        for way in self._ways.values():
+            if way._node_ids is not None:
+                refs.extend(way._node_ids)
+            way_ids.append(way.id)
+            offsets.append(len(refs))
+
+        node_ids, node_lats, node_lons = self.node_columns(use_numpy=use_numpy)
+
+        if use_numpy:
+            import numpy
+            np_refs = numpy.frombuffer(refs, dtype=numpy.int64)
+            lats = numpy.full(len(np_refs), numpy.nan)
+            lons = numpy.full(len(np_refs), numpy.nan)
+            found = numpy.zeros(len(np_refs), dtype=bool)
+            if len(node_ids):
+                order = numpy.argsort(node_ids, kind="stable")
+                sorted_ids = node_ids[order]
+                pos = numpy.searchsorted(sorted_ids, np_refs).clip(max=len(sorted_ids) - 1)
+                found = sorted_ids[pos] == np_refs
+                rows = order[pos[found]]
+                lats[found] = node_lats[rows]
+                lons[found] = node_lons[rows]
+            if not allow_missing and not found.all():
+                raise exception.DataIncomplete("Unable to resolve all nodes")
+            return (
+                numpy.frombuffer(way_ids, dtype=numpy.int64),
+                numpy.frombuffer(offsets, dtype=numpy.int64),
+                lats,
+                lons
+            )
+
+        if isinstance(self._nodes, NodeStore):
+            get_row = self._nodes.get_row
+        else:
+            index = {node_id: row for row, node_id in enumerate(node_ids)}
+
+            def get_row(node_id: int) -> int:
+                return index.get(node_id, -1)
+
+        nan = float("nan")
+        lats = array("d")
+        lons = array("d")
+        for ref in refs:
+            row = get_row(ref)
+            if row < 0:
+                if not allow_missing:
+                    raise exception.DataIncomplete("Unable to resolve all nodes")
+                lats.append(nan)
+                lons.append(nan)
+            else:
+                lats.append(node_lats[row])
+                lons.append(node_lons[row])
+        return way_ids, offsets, lats, lons
+
     def get_node_ids(self) -> List[int]:
         return self.get_ids(filter_cls=Node)
 
@@ -346,21 +1575,34 @@ class Result:
         return self.get_ids(filter_cls=Area)
 
     @classmethod
-    def from_json(cls, data: dict, api: Optional[Overpass] = None) -> "Result":
+    def from_json(
+            cls,
+            data: dict,
+            api: Optional[Overpass] = None,
+            element_filter: Optional[ElementFilter] = None) -> "Result":
         """
         Create a new instance and load data from json object.
 
         :param data: JSON data returned by the Overpass API
         :param api:
+        :param element_filter: Only create the elements and fields selected by this filter
         :return: New instance of Result object
         """
         result = cls(api=api)
+        keep = KEEP_ALL if element_filter is None else element_filter.keep
         elem_cls: Type[Union["Area", "Node", "Relation", "Way"]]
-        for elem_cls in [Node, Way, Relation, Area]:
-            for element in data.get("elements", []):
-                e_type = element.get("type")
-                if hasattr(e_type, "lower") and e_type.lower() == elem_cls._type_value:
-                    result.append(elem_cls.from_json(element, result=result))
+        with result._parsing():
+            for elem_cls in [Node, Way, Relation, Area]:
+                type_value = elem_cls._type_value
+                if element_filter is not None and not element_filter.accepts_type(type_value):
+                    continue
+                for element in data.get("elements", []):
+                    e_type = element.get("type")
+                    if hasattr(e_type, "lower") and e_type.lower() == type_value:
+                        if element_filter is not None and not element_filter.accepts(
+                                type_value, element.get("id"), element.get("tags") or _EMPTY_DICT):
+                            continue
+                        result.append(elem_cls.from_json(element, result=result, keep=keep))
 
         return result
 
@@ -376,12 +1618,142 @@ class Result:
             "elements": list(elements_to_json())
         }
 
+    def dump_json(self, fp: TextIO, batch_size: int = 1000):
+        """
+        Write the result as JSON to a file-like object.
+
+        The output contains the same data as :meth:`Result.to_json`, but the elements are written in batches without
+        building the complete dict in memory. Reading the output with :meth:`Overpass.parse_json` and writing it
+        again produces the same output.
+
+        :param fp: File-like object opened in text mode
+        :param batch_size: Number of elements to write at once
+        """
+        dump_json(self, fp, batch_size=batch_size)
+
+    def save(self, path: Union[str, "os.PathLike[str]"], mapped: bool = False):
+        """
+        Write the result to a binary snapshot file, see :mod:`overpy.snapshot`.
+
+        Compact snapshots store coordinates with 7 decimal places, the precision of the OSM database.
+
+        :param path: Path of the file
+        :param mapped: Write fixed-width columns to open the file with :meth:`Result.open_mapped` instead of a
+                       compact snapshot to load with :meth:`Result.load`
+        """
+        from overpy import snapshot
+        snapshot.save(self, path, flavour=snapshot.FLAVOUR_MAPPED if mapped else snapshot.FLAVOUR_COMPACT)
+
+    @classmethod
+    def load(
+            cls,
+            path: Union[str, "os.PathLike[str]"],
+            api: Optional[Overpass] = None,
+            lean: Optional[bool] = None,
+            columnar_nodes: Optional[bool] = None) -> "Result":
+        """
+        Load a result from a snapshot file written by :meth:`Result.save`.
+
+        :param path: Path of the file
+        :param api: The API object to load additional resources and elements
+        :param lean: Share read-only empty tags and attributes between the elements (Default: use setting from api)
+        :param columnar_nodes: Store the nodes in a :class:`overpy.NodeStore` (Default: use setting from api)
+        :return: New instance of Result object
+        :raises overpy.exception.SnapshotError: If the file is not a snapshot or the version is not supported
+        """
+        from overpy import snapshot
+        return snapshot.load(path, api=api, lean=lean, columnar_nodes=columnar_nodes)
+
+    @staticmethod
+    def open_mapped(path: Union[str, "os.PathLike[str]"], api: Optional[Overpass] = None) -> "Result":
+        """
+        Open a snapshot file written with ``mapped=True`` as read-only result without loading the elements, see
+        :class:`overpy.snapshot.MappedResult`.
+
+        :param path: Path of the file
+        :param api: The API object, used for the attribute modifiers
+        :return: The result, close it with :meth:`overpy.snapshot.MappedResult.close` or use it as context manager
+        :raises overpy.exception.SnapshotError: If the file is not a mapped snapshot or the version is not supported
+        """
+        from overpy import snapshot
+        return snapshot.MappedResult(path, api=api)
+
+    def share(self, name: Optional[str] = None):
+        """
+        Publish the result in a shared memory block, see :func:`overpy.snapshot.share`.
+
+        Worker processes open it with :meth:`Result.attach_shared` and read the elements without copying them.
+        Call ``close()`` and ``unlink()`` of the returned block after the workers are done.
+
+        :param name: Name of the block (Default: random name)
+        :return: The :class:`multiprocessing.shared_memory.SharedMemory` object of the block
+        """
+        from overpy import snapshot
+        return snapshot.share(self, name=name)
+
+    @staticmethod
+    def attach_shared(name: str, api: Optional[Overpass] = None) -> "Result":
+        """
+        Open a result published with :meth:`Result.share` as read-only result.
+
+        :param name: Name of the shared memory block
+        :param api: The API object, used for the attribute modifiers
+        :return: The result, close it with :meth:`overpy.snapshot.MappedResult.close` or use it as context manager
+        :raises FileNotFoundError: If no shared memory block with this name exists
+        """
+        from overpy import snapshot
+        return snapshot.MappedResult.attach(name, api=api)
+
+    def iter_ndjson(self) -> Iterator[str]:
+        """
+        Iterate over the elements encoded as newline delimited JSON, one element per line.
+
+        :return: Iterator over the lines, every line is terminated by a line break
+        """
+        return iter_ndjson(self)
+
+    def dump_ndjson(self, fp: TextIO, batch_size: int = 1000):
+        """
+        Write the result as newline delimited JSON to a file-like object, one element per line.
+
+        The output can be split or concatenated at line breaks and loaded with :meth:`Result.from_ndjson`.
+
+        :param fp: File-like object opened in text mode
+        :param batch_size: Number of elements to write at once
+        """
+        dump_ndjson(self, fp, batch_size=batch_size)
+
+    @classmethod
+    def from_ndjson(cls, lines: Iterable[Union[str, bytes]], api: Optional[Overpass] = None) -> "Result":
+        """
+        Create a new instance and load the elements from newline delimited JSON.
+
+        The lines are read one after another, so a file can be loaded without reading it into memory first.
+
+        :param lines: File-like object or other iterable of lines
+        :param api: The API object to load additional resources and elements
+        :return: New instance of Result object
+        """
+        return load_ndjson(lines, result=cls(api=api))
+
+    def dump_xml(self, fp: TextIO, batch_size: int = 1000):
+        """
+        Write the result as OSM XML 0.6 to a file-like object, readable by :meth:`Result.from_xml`.
+
+        The elements are written in batches without building the complete document in memory.
+
+        :param fp: File-like object opened in text mode
+        :param batch_size: Number of elements to write at once
+        """
+        dump_xml(self, fp, batch_size=batch_size)
+
     @classmethod
     def from_xml(
             cls,
             data: Union[str, xml.etree.ElementTree.Element],
             api: Optional[Overpass] = None,
-            parser: Optional[int] = None) -> "Result":
+            parser: Optional[int] = None,
+            element_filter: Optional[ElementFilter] = None) -> "Result":
         """
         Create a new instance and load data from xml data or object.
 
@@ -393,6 +1765,7 @@ class Result:
         :param data: Root element
         :param api: The instance to query additional information if required.
         :param parser: Specify the parser to use(DOM or SAX)(Default: None = autodetect, defaults to SAX)
+        :param element_filter: Only create the elements and fields selected by this filter
         :return: New instance of Result object
         """
         if parser is None:
@@ -402,33 +1775,40 @@ class Result:
                 parser = XML_PARSER_DOM
 
         result = cls(api=api)
-        if parser == XML_PARSER_DOM:
-            import xml.etree.ElementTree as ET
-            if isinstance(data, str):
-                root = ET.fromstring(data)
-            elif isinstance(data, ET.Element):
-                root = data
+        with result._parsing():
+            if parser == XML_PARSER_DOM:
+                import xml.etree.ElementTree as ET
+                if isinstance(data, str):
+                    root = ET.fromstring(data)
+                elif isinstance(data, ET.Element):
+                    root = data
+                else:
+                    raise exception.OverPyException("Unable to detect data type.")
+
+                keep = KEEP_ALL if element_filter is None else element_filter.keep
+                elem_cls: Type[Union["Area", "Node", "Relation", "Way"]]
+                for elem_cls in [Node, Way, Relation, Area]:
+                    type_value = elem_cls._type_value
+                    if element_filter is not None and not element_filter.accepts_type(type_value):
+                        continue
+                    for child in root:
+                        if child.tag.lower() == type_value:
+                            if element_filter is not None and not element_filter.accepts_xml(type_value, child):
+                                continue
+                            result.append(elem_cls.from_xml(child, result=result, keep=keep))
+
+            elif parser == XML_PARSER_SAX:
+                from io import StringIO
+                if not isinstance(data, str):
+                    raise ValueError("data must be of type str if using the SAX parser")
+                source = StringIO(data)
+                sax_handler = OSMSAXHandler(result, element_filter=element_filter)
+                sax_parser = make_parser()
+                sax_parser.setContentHandler(sax_handler)
+                sax_parser.parse(source)
             else:
-                raise exception.OverPyException("Unable to detect data type.")
-
-            elem_cls: Type[Union["Area", "Node", "Relation", "Way"]]
-            for elem_cls in [Node, Way, Relation, Area]:
-                for child in root:
-                    if child.tag.lower() == elem_cls._type_value:
-                        result.append(elem_cls.from_xml(child, result=result))
-
-        elif parser == XML_PARSER_SAX:
-            from io import StringIO
-            if not isinstance(data, str):
-                raise ValueError("data must be of type str if using the SAX parser")
-            source = StringIO(data)
-            sax_handler = OSMSAXHandler(result)
-            sax_parser = make_parser()
-            sax_parser.setContentHandler(sax_handler)
-            sax_parser.parse(source)
-        else:
-            # ToDo: better exception
-            raise Exception("Unknown XML parser")
+                # ToDo: better exception
+                raise Exception("Unknown XML parser")
         return result
 
     def get_area(self, area_id: int, resolve_missing: bool = False) -> "Area":
@@ -441,8 +1821,8 @@ class Result:
         :raises overpy.exception.DataIncomplete: The requested way is not available in the result cache.
         :raises overpy.exception.DataIncomplete: If resolve_missing is True and the area can't be resolved.
         """
-        areas = self.get_areas(area_id=area_id)
-        if len(areas) == 0:
+        area = self._areas.get(area_id)
+        if area is None:
             if resolve_missing is False:
                 raise exception.DataIncomplete("Resolve missing area is disabled")
 
@@ -454,12 +1834,12 @@ class Result:
             tmp_result = self.api.query(query)
             self.expand(tmp_result)
 
-            areas = self.get_areas(area_id=area_id)
+            area = self._areas.get(area_id)
 
-        if len(areas) == 0:
+        if area is None:
             raise exception.DataIncomplete("Unable to resolve requested areas")
 
-        return areas[0]
+        return area
 
     def get_areas(self, area_id: Optional[int] = None) -> List["Area"]:
         """
@@ -480,8 +1860,8 @@ class Result:
         :raises overpy.exception.DataIncomplete: At least one referenced node is not available in the result cache.
         :raises overpy.exception.DataIncomplete: If resolve_missing is True and at least one node can't be resolved.
         """
-        nodes = self.get_nodes(node_id=node_id)
-        if len(nodes) == 0:
+        node = self._nodes.get(node_id)
+        if node is None:
             if not resolve_missing:
                 raise exception.DataIncomplete("Resolve missing nodes is disabled")
 
@@ -493,12 +1873,12 @@ class Result:
             tmp_result = self.api.query(query)
             self.expand(tmp_result)
 
-            nodes = self.get_nodes(node_id=node_id)
+            node = self._nodes.get(node_id)
 
-        if len(nodes) == 0:
+        if node is None:
             raise exception.DataIncomplete("Unable to resolve all nodes")
 
-        return nodes[0]
+        return node
 
     def get_nodes(self, node_id: Optional[int] = None) -> List["Node"]:
         """
@@ -520,8 +1900,8 @@ class Result:
         :raises overpy.exception.DataIncomplete: The requested relation is not available in the result cache.
         :raises overpy.exception.DataIncomplete: If resolve_missing is True and the relation can't be resolved.
         """
-        relations = self.get_relations(rel_id=rel_id)
-        if len(relations) == 0:
+        relation = self._relations.get(rel_id)
+        if relation is None:
             if resolve_missing is False:
                 raise exception.DataIncomplete("Resolve missing relations is disabled")
 
@@ -533,12 +1913,12 @@ class Result:
             tmp_result = self.api.query(query)
             self.expand(tmp_result)
 
-            relations = self.get_relations(rel_id=rel_id)
+            relation = self._relations.get(rel_id)
 
-        if len(relations) == 0:
+        if relation is None:
             raise exception.DataIncomplete("Unable to resolve requested reference")
 
-        return relations[0]
+        return relation
 
     def get_relations(self, rel_id: int = None) -> List["Relation"]:
         """
@@ -559,8 +1939,8 @@ class Result:
         :raises overpy.exception.DataIncomplete: The requested way is not available in the result cache.
         :raises overpy.exception.DataIncomplete: If resolve_missing is True and the way can't be resolved.
         """
-        ways = self.get_ways(way_id=way_id)
-        if len(ways) == 0:
+        way = self._ways.get(way_id)
+        if way is None:
             if resolve_missing is False:
                 raise exception.DataIncomplete("Resolve missing way is disabled")
 
@@ -572,12 +1952,12 @@ class Result:
             tmp_result = self.api.query(query)
             self.expand(tmp_result)
 
-            ways = self.get_ways(way_id=way_id)
+            way = self._ways.get(way_id)
 
-        if len(ways) == 0:
+        if way is None:
             raise exception.DataIncomplete("Unable to resolve requested way")
 
-        return ways[0]
+        return way
 
     def get_ways(self, way_id: Optional[int] = None) -> List["Way"]:
         """
@@ -588,14 +1968,133 @@ class Result:
         """
         return self.get_elements(Way, elem_id=way_id)
 
-    area_ids = property(get_area_ids)
-    areas = property(get_areas)
-    node_ids = property(get_node_ids)
-    nodes = property(get_nodes)
-    relation_ids = property(get_relation_ids)
-    relations = property(get_relations)
-    way_ids = property(get_way_ids)
-    ways = property(get_ways)
+    @property
+    def area_ids(self) -> ElementIdView:
+        """
+        Live view on the IDs of all areas
+        """
+        return ElementIdView(self._areas, self._positions[Area])
+
+    @property
+    def areas(self) -> ElementView:
+        """
+        Live view on all areas
+        """
+        return ElementView(self._areas, self._positions[Area])
+
+    @property
+    def node_ids(self) -> ElementIdView:
+        """
+        Live view on the IDs of all nodes
+        """
+        return ElementIdView(self._nodes, self._positions[Node])
+
+    @property
+    def nodes(self) -> ElementView:
+        """
+        Live view on all nodes
+        """
+        return ElementView(self._nodes, self._positions[Node])
+
+    @property
+    def relation_ids(self) -> ElementIdView:
+        """
+        Live view on the IDs of all relations
+        """
+        return ElementIdView(self._relations, self._positions[Relation])
+
+    @property
+    def relations(self) -> ElementView:
+        """
+        Live view on all relations
+        """
+        return ElementView(self._relations, self._positions[Relation])
+
+    @property
+    def way_ids(self) -> ElementIdView:
+        """
+        Live view on the IDs of all ways
+        """
+        return ElementIdView(self._ways, self._positions[Way])
+
+    @property
+    def ways(self) -> ElementView:
+        """
+        Live view on all ways
+        """
+        return ElementView(self._ways, self._positions[Way])
+
+
+def _restore_result(
+        cls: Type[Result],
+        api: Optional[Overpass],
+        lean: bool,
+        columnar_nodes: bool,
+        state: tuple) -> Result:
+    result = cls(api=api, lean=lean, columnar_nodes=columnar_nodes)
+    modifiers = result.attribute_modifiers
+    node_state, way_state, relation_state, area_state = state
+
+    def restore(elem_cls: Type[ElementTypeVar], columns: tuple) -> List[ElementTypeVar]:
+        collection = result._class_collection_map[elem_cls]
+        elements = []
+        for elem_id, tags, attributes in zip(*columns[:3]):
+            element = elem_cls.__new__(elem_cls)
+            element._result = result
+            element.id = elem_id
+            element.tags = tags
+            element.attributes = _restore_attributes(attributes, modifiers)
+            collection[elem_id] = element
+            elements.append(element)
+        return elements
+
+    if columnar_nodes:
+        nodes = result._nodes
+        ids, nodes.lats, nodes.lons, nodes._tags, attributes = node_state
+        nodes.ids = ids
+        nodes._attributes = {row: _restore_attributes(value, modifiers) for row, value in attributes.items()}
+        if any(ids[i] >= ids[i + 1] for i in range(len(ids) - 1)):
+            nodes._build_index()
+    else:
+        lats = _restore_coordinates(node_state[3])
+        lons = _restore_coordinates(node_state[4])
+        for node, lat, lon in zip(restore(Node, node_state), lats, lons):
+            node.lat = lat
+            node.lon = lon
+
+    counts, refs = way_state[3:5]
+    center_lats = _restore_coordinates(way_state[5])
+    center_lons = _restore_coordinates(way_state[6])
+    start = 0
+    for way, count, center_lat, center_lon in zip(restore(Way, way_state), counts, center_lats, center_lons):
+        if count < 0:
+            way._node_ids = None
+        else:
+            way._node_ids = refs[start:start + count]
+            start += count
+        way.center_lat = center_lat
+        way.center_lon = center_lon
+
+    center_lats = _restore_coordinates(relation_state[3])
+    center_lons = _restore_coordinates(relation_state[4])
+    members = relation_state[5]
+    for relation, center_lat, center_lon, relation_members in zip(
+            restore(Relation, relation_state), center_lats, center_lons, members):
+        relation.center_lat = center_lat
+        relation.center_lon = center_lon
+        relation.members = None if relation_members is None else [
+            member_cls(
+                attributes=_restore_attributes(attributes, modifiers),
+                geometry=geometry,
+                ref=ref,
+                role=role,
+                result=result
+            )
+            for member_cls, ref, role, attributes, geometry in relation_members
+        ]
+
+    restore(Area, area_state)
+    return result
 
 
 class Element:
@@ -607,16 +2106,28 @@ class Element:
     :param tags: List of tags
     """
 
+    __slots__ = ("_result", "attributes", "id", "tags")
+
     _type_value: str
 
     def __init__(self, attributes: Optional[dict] = None, result: Optional[Result] = None, tags: Optional[Dict] = None):
         self._result = result
-        self.attributes = attributes
-        # ToDo: Add option to modify attribute modifiers
-        attribute_modifiers: Dict[str, Callable] = dict(GLOBAL_ATTRIBUTE_MODIFIERS.items())
-        for n, m in attribute_modifiers.items():
-            if n in self.attributes:
-                self.attributes[n] = m(self.attributes[n])
+        if result is not None and result.lean:
+            if not attributes:
+                attributes = _EMPTY_DICT
+            if not tags:
+                tags = _EMPTY_DICT
+        elif attributes is None:
+            attributes = {}
+        if tags and result is not None and result._tag_pool is not None:
+            tags = result._tag_pool.get(tags)
+
+        if attributes:
+            attribute_modifiers = GLOBAL_ATTRIBUTE_MODIFIERS if result is None else result.attribute_modifiers
+            if attributes.keys() & attribute_modifiers.keys():
+                attributes = _LazyAttributes(attributes, attribute_modifiers)
+        #: The attributes of the element, the values are converted on first access
+        self.attributes: dict = attributes
 
         #: The ID of the element form the OSM data
         self.id: int
@@ -624,6 +2135,12 @@ class Element:
         #: The tags of the element
         self.tags: Optional[Dict] = tags
 
+    def __reduce__(self):
+        """
+        Pickle the element without the result it belongs to.
+        """
+        return _restore_element, (self.__class__, _element_state(self))
+
     @classmethod
     def get_center_from_json(cls, data: dict) -> Tuple[Decimal, Decimal]:
         """
@@ -655,11 +2172,16 @@ class Element:
         return center_lat, center_lon
 
     @classmethod
-    def from_json(cls: Type[ElementTypeVar], data: dict, result: Optional[Result] = None) -> ElementTypeVar:
+    def from_json(
+            cls: Type[ElementTypeVar],
+            data: dict,
+            result: Optional[Result] = None,
+            keep: int = KEEP_ALL) -> ElementTypeVar:
         """
         Create new Element() from json data
         :param data:
         :param result:
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return:
         """
         raise NotImplementedError
@@ -673,7 +2195,8 @@ class Element:
     def from_xml(
             cls: Type[ElementTypeVar],
             child: xml.etree.ElementTree.Element,
-            result: Optional[Result] = None) -> ElementTypeVar:
+            result: Optional[Result] = None,
+            keep: int = KEEP_ALL) -> ElementTypeVar:
         """
         Create new Element() element from XML data
         """
@@ -688,6 +2211,8 @@ class Area(Element):
     :param kwargs: Additional arguments are passed directly to the parent class
     """
 
+    __slots__ = ()
+
     _type_value = "area"
 
     def __init__(self, area_id: Optional[int] = None, **kwargs):
@@ -699,12 +2224,13 @@ class Area(Element):
         return f"<overpy.Area id={self.id}>"
 
     @classmethod
-    def from_json(cls, data: dict, result: Optional[Result] = None) -> "Area":
+    def from_json(cls, data: dict, result: Optional[Result] = None, keep: int = KEEP_ALL) -> "Area":
         """
         Create new Area element from JSON data
 
         :param data: Element data from JSON
         :param result: The result this element belongs to
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return: New instance of Way
         :raises overpy.exception.ElementDataWrongType: If type value of the passed JSON data does not match.
         """
@@ -714,26 +2240,33 @@ class Area(Element):
                 type_provided=data.get("type")
             )
 
-        tags = data.get("tags", {})
+        tags = data.get("tags", {}) if keep & KEEP_TAGS else _EMPTY_DICT
 
         area_id = data.get("id")
 
-        attributes = {}
-        ignore = ["id", "tags", "type"]
-        for n, v in data.items():
-            if n in ignore:
-                continue
-            attributes[n] = v
+        attributes = _EMPTY_DICT
+        if keep & KEEP_ATTRIBUTES:
+            attributes = {}
+            ignore = ["id", "tags", "type"]
+            for n, v in data.items():
+                if n in ignore:
+                    continue
+                attributes[n] = v
 
         return cls(area_id=area_id, attributes=attributes, tags=tags, result=result)
 
     @classmethod
-    def from_xml(cls, child: xml.etree.ElementTree.Element, result: Optional[Result] = None) -> "Area":
+    def from_xml(
+            cls,
+            child: xml.etree.ElementTree.Element,
+            result: Optional[Result] = None,
+            keep: int = KEEP_ALL) -> "Area":
         """
         Create new way element from XML data
 
         :param child: XML node to be parsed
         :param result: The result this node belongs to
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return: New Way oject
         :raises overpy.exception.ElementDataWrongType: If name of the xml child node doesn't match
         :raises ValueError: If the ref attribute of the xml node is not provided
@@ -745,10 +2278,10 @@ class Area(Element):
                 type_provided=child.tag.lower()
             )
 
-        tags = {}
+        tags = {} if keep & KEEP_TAGS else _EMPTY_DICT
 
         for sub_child in child:
-            if sub_child.tag.lower() == "tag":
+            if sub_child.tag.lower() == "tag" and keep & KEEP_TAGS:
                 name = sub_child.attrib.get("k")
                 if name is None:
                     raise ValueError("Tag without name/key.")
@@ -760,12 +2293,14 @@ class Area(Element):
         if area_id_str is not None:
             area_id = int(area_id_str)
 
-        attributes = {}
-        ignore = ["id"]
-        for n, v in child.attrib.items():
-            if n in ignore:
-                continue
-            attributes[n] = v
+        attributes = _EMPTY_DICT
+        if keep & KEEP_ATTRIBUTES:
+            attributes = {}
+            ignore = ["id"]
+            for n, v in child.attrib.items():
+                if n in ignore:
+                    continue
+                attributes[n] = v
 
         return cls(area_id=area_id, attributes=attributes, tags=tags, result=result)
 
@@ -780,6 +2315,8 @@ class Node(Element):
     :param kwargs: Additional arguments are passed directly to the parent class
     """
 
+    __slots__ = ("lat", "lon")
+
     _type_value = "node"
 
     def __init__(
@@ -804,12 +2341,13 @@ class Node(Element):
         return f"<overpy.Node id={self.id} lat={self.lat} lon={self.lon}>"
 
     @classmethod
-    def from_json(cls, data: dict, result: Optional[Result] = None) -> "Node":
+    def from_json(cls, data: dict, result: Optional[Result] = None, keep: int = KEEP_ALL) -> "Node":
         """
         Create new Node element from JSON data
 
         :param data: Element data from JSON
         :param result: The result this element belongs to
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return: New instance of Node
         :raises overpy.exception.ElementDataWrongType: If type value of the passed JSON data does not match.
         """
@@ -819,18 +2357,20 @@ class Node(Element):
                 type_provided=data.get("type")
             )
 
-        tags = data.get("tags", {})
+        tags = data.get("tags", {}) if keep & KEEP_TAGS else _EMPTY_DICT
 
         node_id = data.get("id")
         lat = data.get("lat")
         lon = data.get("lon")
 
-        attributes = {}
-        ignore = ["type", "id", "lat", "lon", "tags"]
-        for n, v in data.items():
-            if n in ignore:
-                continue
-            attributes[n] = v
+        attributes = _EMPTY_DICT
+        if keep & KEEP_ATTRIBUTES:
+            attributes = {}
+            ignore = ["type", "id", "lat", "lon", "tags"]
+            for n, v in data.items():
+                if n in ignore:
+                    continue
+                attributes[n] = v
 
         return cls(node_id=node_id, lat=lat, lon=lon, tags=tags, attributes=attributes, result=result)
 
@@ -841,12 +2381,17 @@ class Node(Element):
         return d
 
     @classmethod
-    def from_xml(cls, child: xml.etree.ElementTree.Element, result: Optional[Result] = None) -> "Node":
+    def from_xml(
+            cls,
+            child: xml.etree.ElementTree.Element,
+            result: Optional[Result] = None,
+            keep: int = KEEP_ALL) -> "Node":
         """
         Create new way element from XML data
 
         :param child: XML node to be parsed
         :param result: The result this node belongs to
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return: New Way oject
         :raises overpy.exception.ElementDataWrongType: If name of the xml child node doesn't match
         :raises ValueError: If a tag doesn't have a name
@@ -857,10 +2402,10 @@ class Node(Element):
                 type_provided=child.tag.lower()
             )
 
-        tags = {}
+        tags = {} if keep & KEEP_TAGS else _EMPTY_DICT
 
         for sub_child in child:
-            if sub_child.tag.lower() == "tag":
+            if sub_child.tag.lower() == "tag" and keep & KEEP_TAGS:
                 name = sub_child.attrib.get("k")
                 if name is None:
                     raise ValueError("Tag without name/key.")
@@ -882,27 +2427,174 @@ class Node(Element):
         if lon_str is not None:
             lon = Decimal(lon_str)
 
-        attributes = {}
-        ignore = ["id", "lat", "lon"]
-        for n, v in child.attrib.items():
-            if n in ignore:
-                continue
-            attributes[n] = v
+        attributes = _EMPTY_DICT
+        if keep & KEEP_ATTRIBUTES:
+            attributes = {}
+            ignore = ["id", "lat", "lon"]
+            for n, v in child.attrib.items():
+                if n in ignore:
+                    continue
+                attributes[n] = v
 
         return cls(node_id=node_id, lat=lat, lon=lon, tags=tags, attributes=attributes, result=result)
 
 
+class NodeStore(MutableMapping):
+    """
+    Columnar storage for the nodes of a result.
+
+    The IDs and coordinates are stored in contiguous arrays. Tags and attributes are only stored for nodes having
+    them. :class:`overpy.Node` objects are created on access, changes to the coordinates of such an object are not
+    written back to the store. Nodes without tags or attributes share a read-only empty mapping.
+
+    As long as the nodes are added with ascending IDs the lookup is done by binary search on the ID column, otherwise
+    a hash index is built.
+
+    :param result: The result the nodes belong to
+    """
+
+    def __init__(self, result: Optional[Result] = None):
+        self._result = result
+        #: The IDs of the nodes
+        self.ids = array("q")
+        #: The latitudes of the nodes, NaN if not available
+        self.lats = array("d")
+        #: The longitudes of the nodes, NaN if not available
+        self.lons = array("d")
+        self._index: Optional[Dict[int, int]] = None
+        self._tags: Dict[int, dict] = {}
+        self._attributes: Dict[int, dict] = {}
+
+    def _build_index(self):
+        self._index = {node_id: row for row, node_id in enumerate(self.ids)}
+
+    def get_row(self, node_id: int) -> int:
+        """
+        Get the row of a node in the columns.
+
+        :param node_id: The ID of the node
+        :return: The row or -1 if the node is not available
+        """
+        if self._index is not None:
+            return self._index.get(node_id, -1)
+        row = bisect_left(self.ids, node_id)
+        if row < len(self.ids) and self.ids[row] == node_id:
+            return row
+        return -1
+
+    def tag_rows(self) -> Iterator[Tuple[int, dict]]:
+        """
+        Iterate over the tags of the nodes having tags.
+
+        :return: Tuples of row and tags, ordered by row
+        """
+        return iter(sorted(self._tags.items()))
+
+    def attribute_rows(self) -> Iterator[Tuple[int, dict]]:
+        """
+        Iterate over the attributes of the nodes having attributes.
+
+        :return: Tuples of row and attributes, ordered by row
+        """
+        return iter(sorted(self._attributes.items()))
+
+    def _create_node(self, row: int) -> "Node":
+        node = Node.__new__(Node)
+        node._result = self._result
+        node.id = self.ids[row]
+        lat = self.lats[row]
+        lon = self.lons[row]
+        node.lat = None if lat != lat else Decimal(repr(lat))
+        node.lon = None if lon != lon else Decimal(repr(lon))
+        node.tags = self._tags.get(row, _EMPTY_DICT)
+        node.attributes = self._attributes.get(row, _EMPTY_DICT)
+        return node
+
+    def _set_row(self, row: int, node: "Node"):
+        self.lats[row] = float("nan") if node.lat is None else float(node.lat)
+        self.lons[row] = float("nan") if node.lon is None else float(node.lon)
+        for values, value in ((self._tags, node.tags), (self._attributes, node.attributes)):
+            if value:
+                values[row] = value
+            else:
+                values.pop(row, None)
+
+    def __getitem__(self, node_id: int) -> "Node":
+        row = self.get_row(node_id)
+        if row < 0:
+            raise KeyError(node_id)
+        return self._create_node(row)
+
+    def __setitem__(self, node_id: int, node: "Node"):
+        row = self.get_row(node_id)
+        if row >= 0:
+            self._set_row(row, node)
+            return
+
+        row = len(self.ids)
+        if self._index is None and row and node_id < self.ids[-1]:
+            self._build_index()
+        self.ids.append(node_id)
+        self.lats.append(0.0)
+        self.lons.append(0.0)
+        if self._index is not None:
+            self._index[node_id] = row
+        self._set_row(row, node)
+
+    def __delitem__(self, node_id: int):
+        row = self.get_row(node_id)
+        if row < 0:
+            raise KeyError(node_id)
+        del self.ids[row]
+        del self.lats[row]
+        del self.lons[row]
+        for values in (self._tags, self._attributes):
+            values.pop(row, None)
+            for moved_row in sorted(r for r in values if r > row):
+                values[moved_row - 1] = values.pop(moved_row)
+        if self._index is not None:
+            self._build_index()
+
+    def __contains__(self, node_id) -> bool:
+        return self.get_row(node_id) >= 0
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def setdefault(self, node_id: int, node: "Node" = None) -> "Node":
+        if node_id not in self:
+            self[node_id] = node
+            return node
+        return self[node_id]
+
+    def values(self) -> "_NodeStoreValuesView":
+        return _NodeStoreValuesView(self)
+
+
+class _NodeStoreValuesView(ValuesView):
+    def __iter__(self):
+        store: NodeStore = self._mapping
+        create_node = store._create_node
+        for row in range(len(store.ids)):
+            yield create_node(row)
+
+
 class Way(Element):
     """
     Class to represent an element of type way
 
     :param center_lat: The latitude of the center of the way (optional depending on query)
     :param center_lon: The longitude of the center of the way (optional depending on query)
-    :param node_ids: List of node IDs
+    :param node_ids: IDs of the nodes, stored as array of signed 64-bit integers
     :param way_id: Id of the way element
     :param kwargs: Additional arguments are passed directly to the parent class
     """
 
+    __slots__ = ("_node_ids", "center_lat", "center_lon")
+
     _type_value = "way"
 
     def __init__(
@@ -910,15 +2602,17 @@ class Way(Element):
             way_id: Optional[int] = None,
             center_lat: Optional[Union[Decimal, float]] = None,
             center_lon: Optional[Union[Decimal, float]] = None,
-            node_ids: Optional[Union[List[int], Tuple[int]]] = None,
+            node_ids: Optional[Union[List[int], Tuple[int], array]] = None,
             **kwargs):
 
         Element.__init__(self, **kwargs)
         #: The id of the way
         self.id = way_id
 
-        #: List of Ids of the associated nodes
-        self._node_ids = node_ids
+        if node_ids is not None and not isinstance(node_ids, array):
+            node_ids = array("q", node_ids)
+        #: Ids of the associated nodes
+        self._node_ids: Optional[array] = node_ids
 
         #: The latitude of the center of the way (optional depending on query)
         self.center_lat = center_lat
@@ -927,7 +2621,15 @@ class Way(Element):
         self.center_lon = center_lon
 
     def __repr__(self):
-        return f"<overpy.Way id={self.id} nodes={self._node_ids}>"
+        node_ids = None if self._node_ids is None else self._node_ids.tolist()
+        return f"<overpy.Way id={self.id} nodes={node_ids}>"
+
+    @property
+    def node_ids(self) -> Optional[array]:
+        """
+        IDs of the nodes associated with the way as array of signed 64-bit integers.
+        """
+        return self._node_ids
 
     @property
     def nodes(self) -> List[Node]:
@@ -949,11 +2651,7 @@ class Way(Element):
         resolved = False
 
         for node_id in self._node_ids:
-            try:
-                node = self._result.get_node(node_id)
-            except exception.DataIncomplete:
-                node = None
-
+            node = self._result._nodes.get(node_id)
             if node is not None:
                 result.append(node)
                 continue
@@ -988,12 +2686,13 @@ class Way(Element):
         return result
 
     @classmethod
-    def from_json(cls, data: dict, result: Optional[Result] = None) -> "Way":
+    def from_json(cls, data: dict, result: Optional[Result] = None, keep: int = KEEP_ALL) -> "Way":
         """
         Create new Way element from JSON data
 
         :param data: Element data from JSON
         :param result: The result this element belongs to
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return: New instance of Way
         :raises overpy.exception.ElementDataWrongType: If type value of the passed JSON data does not match.
         """
@@ -1003,18 +2702,20 @@ class Way(Element):
                 type_provided=data.get("type")
             )
 
-        tags = data.get("tags", {})
+        tags = data.get("tags", {}) if keep & KEEP_TAGS else _EMPTY_DICT
 
         way_id = data.get("id")
         node_ids = data.get("nodes")
-        (center_lat, center_lon) = cls.get_center_from_json(data=data)
+        (center_lat, center_lon) = cls.get_center_from_json(data=data) if keep & KEEP_CENTER else (None, None)
 
-        attributes = {}
-        ignore = ["center", "id", "nodes", "tags", "type"]
-        for n, v in data.items():
-            if n in ignore:
-                continue
-            attributes[n] = v
+        attributes = _EMPTY_DICT
+        if keep & KEEP_ATTRIBUTES:
+            attributes = {}
+            ignore = ["center", "id", "nodes", "tags", "type"]
+            for n, v in data.items():
+                if n in ignore:
+                    continue
+                attributes[n] = v
 
         return cls(
             attributes=attributes,
@@ -1030,16 +2731,21 @@ class Way(Element):
         d = super().to_json()
         if self.center_lat is not None and self.center_lon is not None:
             d["center"] = {"lat": self.center_lat, "lon": self.center_lon}
-        d["nodes"] = self._node_ids
+        d["nodes"] = None if self._node_ids is None else self._node_ids.tolist()
         return d
 
     @classmethod
-    def from_xml(cls, child: xml.etree.ElementTree.Element, result: Optional[Result] = None) -> "Way":
+    def from_xml(
+            cls,
+            child: xml.etree.ElementTree.Element,
+            result: Optional[Result] = None,
+            keep: int = KEEP_ALL) -> "Way":
         """
         Create new way element from XML data
 
         :param child: XML node to be parsed
         :param result: The result this node belongs to
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return: New Way oject
         :raises overpy.exception.ElementDataWrongType: If name of the xml child node doesn't match
         :raises ValueError: If the ref attribute of the xml node is not provided
@@ -1051,13 +2757,13 @@ class Way(Element):
                 type_provided=child.tag.lower()
             )
 
-        tags = {}
-        node_ids = []
+        tags = {} if keep & KEEP_TAGS else _EMPTY_DICT
+        node_ids = array("q")
         center_lat = None
         center_lon = None
 
         for sub_child in child:
-            if sub_child.tag.lower() == "tag":
+            if sub_child.tag.lower() == "tag" and keep & KEEP_TAGS:
                 name = sub_child.attrib.get("k")
                 if name is None:
                     raise ValueError("Tag without name/key.")
@@ -1069,7 +2775,7 @@ class Way(Element):
                     raise ValueError("Unable to find required ref value.")
                 ref_id: int = int(ref_id_str)
                 node_ids.append(ref_id)
-            if sub_child.tag.lower() == "center":
+            if sub_child.tag.lower() == "center" and keep & KEEP_CENTER:
                 (center_lat, center_lon) = cls.get_center_from_xml_dom(sub_child=sub_child)
 
         way_id: Optional[int] = None
@@ -1077,12 +2783,14 @@ class Way(Element):
         if way_id_str is not None:
             way_id = int(way_id_str)
 
-        attributes = {}
-        ignore = ["id"]
-        for n, v in child.attrib.items():
-            if n in ignore:
-                continue
-            attributes[n] = v
+        attributes = _EMPTY_DICT
+        if keep & KEEP_ATTRIBUTES:
+            attributes = {}
+            ignore = ["id"]
+            for n, v in child.attrib.items():
+                if n in ignore:
+                    continue
+                attributes[n] = v
 
         return cls(way_id=way_id, center_lat=center_lat, center_lon=center_lon,
                    attributes=attributes, node_ids=node_ids, tags=tags, result=result)
@@ -1100,6 +2808,8 @@ class Relation(Element):
     :return:
     """
 
+    __slots__ = ("center_lat", "center_lon", "members")
+
     _type_value = "relation"
 
     def __init__(
@@ -1123,13 +2833,24 @@ class Relation(Element):
     def __repr__(self):
         return f"<overpy.Relation id={self.id}>"
 
+    def to_multipolygon(self, resolve_missing: bool = False) -> List[Polygon]:
+        """
+        Assemble the polygons of a multipolygon or boundary relation, see :func:`overpy.geometry.multipolygon`
+
+        :param resolve_missing: Try to resolve missing ways and nodes
+        :return: List of tuples with the outer ring and the list of inner rings
+        :raises overpy.exception.DataIncomplete: If a member way or one of its nodes is not available.
+        """
+        return multipolygon(self, resolve_missing=resolve_missing)
+
     @classmethod
-    def from_json(cls, data: dict, result: Optional[Result] = None) -> "Relation":
+    def from_json(cls, data: dict, result: Optional[Result] = None, keep: int = KEEP_ALL) -> "Relation":
         """
         Create new Relation element from JSON data
 
         :param data: Element data from JSON
         :param result: The result this element belongs to
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return: New instance of Relation
         :raises overpy.exception.ElementDataWrongType: If type value of the passed JSON data does not match.
         """
@@ -1139,10 +2860,10 @@ class Relation(Element):
                 type_provided=data.get("type")
             )
 
-        tags = data.get("tags", {})
+        tags = data.get("tags", {}) if keep & KEEP_TAGS else _EMPTY_DICT
 
         rel_id = data.get("id")
-        (center_lat, center_lon) = cls.get_center_from_json(data=data)
+        (center_lat, center_lon) = cls.get_center_from_json(data=data) if keep & KEEP_CENTER else (None, None)
 
         members = []
 
@@ -1158,12 +2879,14 @@ class Relation(Element):
                         )
                     )
 
-        attributes = {}
-        ignore = ["id", "members", "tags", "type"]
-        for n, v in data.items():
-            if n in ignore:
-                continue
-            attributes[n] = v
+        attributes = _EMPTY_DICT
+        if keep & KEEP_ATTRIBUTES:
+            attributes = {}
+            ignore = ["id", "members", "tags", "type"]
+            for n, v in data.items():
+                if n in ignore:
+                    continue
+                attributes[n] = v
 
         return cls(
             rel_id=rel_id,
@@ -1184,12 +2907,17 @@ class Relation(Element):
         return d
 
     @classmethod
-    def from_xml(cls, child: xml.etree.ElementTree.Element, result: Optional[Result] = None) -> "Relation":
+    def from_xml(
+            cls,
+            child: xml.etree.ElementTree.Element,
+            result: Optional[Result] = None,
+            keep: int = KEEP_ALL) -> "Relation":
         """
         Create new way element from XML data
 
         :param child: XML node to be parsed
         :param result: The result this node belongs to
+        :param keep: The fields to keep, a combination of KEEP_TAGS, KEEP_ATTRIBUTES and KEEP_CENTER
         :return: New Way oject
         :raises overpy.exception.ElementDataWrongType: If name of the xml child node doesn't match
         :raises ValueError: If a tag doesn't have a name
@@ -1200,14 +2928,14 @@ class Relation(Element):
                 type_provided=child.tag.lower()
             )
 
-        tags = {}
+        tags = {} if keep & KEEP_TAGS else _EMPTY_DICT
         members = []
         center_lat = None
         center_lon = None
 
         supported_members = [RelationNode, RelationWay, RelationRelation, RelationArea]
         for sub_child in child:
-            if sub_child.tag.lower() == "tag":
+            if sub_child.tag.lower() == "tag" and keep & KEEP_TAGS:
                 name = sub_child.attrib.get("k")
                 if name is None:
                     raise ValueError("Tag without name/key.")
@@ -1223,7 +2951,7 @@ class Relation(Element):
                                 result=result
                             )
                         )
-            if sub_child.tag.lower() == "center":
+            if sub_child.tag.lower() == "center" and keep & KEEP_CENTER:
                 (center_lat, center_lon) = cls.get_center_from_xml_dom(sub_child=sub_child)
 
         rel_id: Optional[int] = None
@@ -1231,12 +2959,14 @@ class Relation(Element):
         if rel_id_str is not None:
             rel_id = int(rel_id_str)
 
-        attributes = {}
-        ignore = ["id"]
-        for n, v in child.attrib.items():
-            if n in ignore:
-                continue
-            attributes[n] = v
+        attributes = _EMPTY_DICT
+        if keep & KEEP_ATTRIBUTES:
+            attributes = {}
+            ignore = ["id"]
+            for n, v in child.attrib.items():
+                if n in ignore:
+                    continue
+                attributes[n] = v
 
         return cls(
             rel_id=rel_id,
@@ -1258,6 +2988,9 @@ class RelationMember:
     :param role: The role of the relation member
     :param result:
     """
+
+    __slots__ = ("_result", "attributes", "geometry", "ref", "role")
+
     _type_value: Optional[str] = None
 
     def __init__(
@@ -1274,6 +3007,12 @@ class RelationMember:
         self.attributes = attributes
         self.geometry = geometry
 
+    def __reduce__(self):
+        """
+        Pickle the member without the result it belongs to.
+        """
+        return _restore_element, (self.__class__, _element_state(self))
+
     @classmethod
     def from_json(cls, data: dict, result: Optional[Result] = None) -> "RelationMember":
         """
@@ -1384,6 +3123,8 @@ class RelationMember:
 
 
 class RelationNode(RelationMember):
+    __slots__ = ()
+
     _type_value = "node"
 
     def resolve(self, resolve_missing: bool = False) -> Node:
@@ -1394,6 +3135,8 @@ class RelationNode(RelationMember):
 
 
 class RelationWay(RelationMember):
+    __slots__ = ()
+
     _type_value = "way"
 
     def resolve(self, resolve_missing: bool = False) -> Way:
@@ -1404,6 +3147,8 @@ class RelationWay(RelationMember):
 
 
 class RelationWayGeometryValue:
+    __slots__ = ("lat", "lon")
+
     def __init__(self, lat: Union[Decimal, float], lon: Union[Decimal, float]):
         self.lat = lat
         self.lon = lon
@@ -1413,6 +3158,8 @@ class RelationWayGeometryValue:
 
 
 class RelationRelation(RelationMember):
+    __slots__ = ()
+
     _type_value = "relation"
 
     def resolve(self, resolve_missing: bool = False) -> Relation:
@@ -1423,6 +3170,8 @@ class RelationRelation(RelationMember):
 
 
 class RelationArea(RelationMember):
+    __slots__ = ()
+
     _type_value = "area"
 
     def resolve(self, resolve_missing: bool = False) -> Area:
@@ -1437,19 +3186,30 @@ class OSMSAXHandler(handler.ContentHandler):
     SAX parser for Overpass XML response.
 
     :param result: Append results to this result set.
+    :param element_filter: Only create the elements and fields selected by this filter
     """
     #: Tuple of opening elements to ignore
     ignore_start: ClassVar = ('osm', 'meta', 'note', 'bounds', 'remark')
     #: Tuple of closing elements to ignore
     ignore_end: ClassVar = ('osm', 'meta', 'note', 'bounds', 'remark', 'tag', 'nd', 'center')
 
-    def __init__(self, result: Result):
+    def __init__(self, result: Result, element_filter: Optional[ElementFilter] = None):
         handler.ContentHandler.__init__(self)
         self._result = result
         self._curr: Dict[str, Any] = {}
         #: Current relation member object
         self.cur_relation_member: Optional[RelationMember] = None
 
+        self._element_filter = element_filter
+        self._keep = KEEP_ALL if element_filter is None else element_filter.keep
+        #: Elements of these types are skipped without handling their child elements
+        self._skip_types: frozenset = frozenset()
+        if element_filter is not None and element_filter.types is not None:
+            self._skip_types = frozenset({"area", "node", "relation", "way"} - element_filter.types)
+        #: Name of the element skipped at the moment
+        self._skipping: Optional[str] = None
+        self._collect_tags = self._keep & KEEP_TAGS or (element_filter is not None and element_filter.uses_tags)
+
     def startElement(self, name: Any, attrs: Any):
         """
         Handle opening elements.
@@ -1457,7 +3217,10 @@ class OSMSAXHandler(handler.ContentHandler):
         :param name: Name of the element
         :param attrs: Attributes of the element
         """
-        if name in self.ignore_start:
+        if name in self.ignore_start or self._skipping is not None:
+            return
+        if name in self._skip_types:
+            self._skipping = name
             return
         try:
             handler = getattr(self, f"_handle_start_{name}")
@@ -1471,6 +3234,10 @@ class OSMSAXHandler(handler.ContentHandler):
 
         :param name: Name of the element
         """
+        if self._skipping is not None:
+            if name == self._skipping:
+                self._skipping = None
+            return
         if name in self.ignore_end:
             return
         try:
@@ -1479,6 +3246,25 @@ class OSMSAXHandler(handler.ContentHandler):
             raise KeyError(f"Unknown element end {name!r}")
         handler()
 
+    def _append_current(self, elem_cls: Type[Union["Area", "Node", "Relation", "Way"]], id_name: str):
+        """
+        Create the current element and append it to the result if the filter accepts it.
+
+        :param elem_cls: The class of the element
+        :param id_name: Name of the ID argument of the class
+        """
+        curr = self._curr
+        self._curr = {}
+        element_filter = self._element_filter
+        if element_filter is not None:
+            if not element_filter.accepts(elem_cls._type_value, curr[id_name], curr["tags"]):
+                return
+            if not self._keep & KEEP_TAGS:
+                curr["tags"] = _EMPTY_DICT
+            if not self._keep & KEEP_ATTRIBUTES:
+                curr["attributes"] = _EMPTY_DICT
+        self._result.append(elem_cls(result=self._result, **curr))
+
     def _handle_start_center(self, attrs: dict):
         """
         Handle opening center element
@@ -1486,6 +3272,8 @@ class OSMSAXHandler(handler.ContentHandler):
         :param attrs: Attributes of the element
         :type attrs: Dict
         """
+        if not self._keep & KEEP_CENTER:
+            return
         center_lat = attrs.get("lat")
         center_lon = attrs.get("lon")
         if center_lat is None or center_lon is None:
@@ -1499,6 +3287,8 @@ class OSMSAXHandler(handler.ContentHandler):
 
         :param attrs: Attributes of the element
         """
+        if not self._collect_tags:
+            return
         try:
             tag_key = attrs['k']
         except KeyError:
@@ -1532,8 +3322,7 @@ class OSMSAXHandler(handler.ContentHandler):
         """
         Handle closing node element
         """
-        self._result.append(Node(result=self._result, **self._curr))
-        self._curr = {}
+        self._append_current(Node, "node_id")
 
     def _handle_start_way(self, attrs: dict):
         """
@@ -1545,7 +3334,7 @@ class OSMSAXHandler(handler.ContentHandler):
             'center_lat': None,
             'center_lon': None,
             'attributes': dict(attrs),
-            'node_ids': [],
+            'node_ids': array("q"),
             'tags': {},
             'way_id': None
         }
@@ -1557,8 +3346,7 @@ class OSMSAXHandler(handler.ContentHandler):
         """
         Handle closing way element
         """
-        self._result.append(Way(result=self._result, **self._curr))
-        self._curr = {}
+        self._append_current(Way, "way_id")
 
     def _handle_start_area(self, attrs: dict):
         """
@@ -1579,8 +3367,7 @@ class OSMSAXHandler(handler.ContentHandler):
         """
         Handle closing area element
         """
-        self._result.append(Area(result=self._result, **self._curr))
-        self._curr = {}
+        self._append_current(Area, "area_id")
 
     def _handle_start_nd(self, attrs: dict):
         """
@@ -1624,8 +3411,7 @@ class OSMSAXHandler(handler.ContentHandler):
         """
         Handle closing relation element
         """
-        self._result.append(Relation(result=self._result, **self._curr))
-        self._curr = {}
+        self._append_current(Relation, "rel_id")
 
     def _handle_start_member(self, attrs: dict):
         """
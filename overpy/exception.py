@@ -34,6 +34,12 @@ class ElementDataWrongType(OverPyException):
         return f"Type expected {self.type_expected!r} but {self.type_provided!r} provided"
 
 
+class SnapshotError(OverPyException):
+    """
+    Raised if a snapshot file is invalid or written in an unsupported version.
+    """
+
+
 class MaxRetriesReached(OverPyException):
     """
     Raised if max retries reached and the Overpass server didn't respond with a result.
@@ -0,0 +1,400 @@
+from array import array
+from math import asin, cos, radians, sin, sqrt
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import overpy
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+#: Mean radius of the earth in meters
+EARTH_RADIUS = 6371008.8
+
+Point = Tuple[float, float]
+#: Outer ring and list of inner rings
+Polygon = Tuple[List[Point], List[List[Point]]]
+
+
+class WayMetrics(NamedTuple):
+    """
+    Geometry metrics of all ways of a result. Every field is an array with one value per way.
+
+    Metrics of ways with missing nodes are NaN.
+    """
+
+    #: IDs of the ways
+    way_ids: Any
+    #: Length in meters
+    lengths: Any
+    #: South of the bounding box
+    south: Any
+    #: West of the bounding box
+    west: Any
+    #: North of the bounding box
+    north: Any
+    #: East of the bounding box
+    east: Any
+    #: 1 if the first and the last node are the same, otherwise 0
+    closed: Any
+    #: Area of closed ways in square degrees, 0 for open ways
+    planar_areas: Any
+    #: Area of closed ways on the sphere in square meters, 0 for open ways
+    areas: Any
+    #: Latitude of the centroid, the mean of the nodes for open or degenerated ways
+    centroid_lats: Any
+    #: Longitude of the centroid
+    centroid_lons: Any
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate the great circle distance between two points.
+
+    :param lat1: Latitude of the first point in degrees
+    :param lon1: Longitude of the first point in degrees
+    :param lat2: Latitude of the second point in degrees
+    :param lon2: Longitude of the second point in degrees
+    :return: Distance in meters
+    """
+    phi1 = radians(lat1)
+    phi2 = radians(lat2)
+    a = sin((phi2 - phi1) / 2) ** 2 + cos(phi1) * cos(phi2) * sin(radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(a)))
+
+
+def points(
+        element: Union["overpy.Way", "overpy.RelationMember", Sequence[Any]],
+        resolve_missing: bool = False) -> List[Point]:
+    """
+    Get the coordinates of a way, of a relation member with geometry or of a list of nodes or geometry values.
+
+    :param element: The way, the relation member or the list
+    :param resolve_missing: Try to resolve missing nodes of a way
+    :return: List of tuples with latitude and longitude
+    :raises overpy.exception.DataIncomplete: If a node of a way is not available.
+    :raises ValueError: If a relation member has no geometry.
+    """
+    if isinstance(element, overpy.Way):
+        element = element.get_nodes(resolve_missing=resolve_missing)
+    elif isinstance(element, overpy.RelationMember):
+        if element.geometry is None:
+            raise ValueError("Relation member has no geometry, query with 'out geom'")
+        element = element.geometry
+    return [(float(value.lat), float(value.lon)) for value in element]
+
+
+def length(coordinates: Sequence[Point]) -> float:
+    """
+    Calculate the length of a line.
+
+    :param coordinates: The points of the line
+    :return: Length in meters
+    """
+    return sum(
+        haversine(lat1, lon1, lat2, lon2)
+        for (lat1, lon1), (lat2, lon2) in zip(coordinates, coordinates[1:])
+    )
+
+
+def bbox(coordinates: Sequence[Point]) -> Tuple[float, float, float, float]:
+    """
+    Calculate the bounding box of points.
+
+    :param coordinates: The points
+    :return: Tuple of south, west, north and east
+    :raises ValueError: If no points are provided
+    """
+    if not coordinates:
+        raise ValueError("Unable to calculate bounding box without points")
+    lats = [lat for lat, _ in coordinates]
+    lons = [lon for _, lon in coordinates]
+    return min(lats), min(lons), max(lats), max(lons)
+
+
+def planar_area(coordinates: Sequence[Point]) -> float:
+    """
+    Calculate the area of a ring using the shoelace formula on the raw coordinates.
+
+    :param coordinates: The points of the ring, the last point should be the first one
+    :return: Signed area in square degrees, positive for counterclockwise rings
+    """
+    return sum(
+        lon1 * lat2 - lon2 * lat1
+        for (lat1, lon1), (lat2, lon2) in zip(coordinates, coordinates[1:])
+    ) / 2.0
+
+
+def area(coordinates: Sequence[Point]) -> float:
+    """
+    Calculate the area of a ring on the sphere.
+
+    See Chamberlain and Duquette, Some Algorithms for Polygons on a Sphere, 2007
+
+    :param coordinates: The points of the ring, the last point should be the first one
+    :return: Area in square meters
+    """
+    total = sum(
+        radians(lon2 - lon1) * (2 + sin(radians(lat1)) + sin(radians(lat2)))
+        for (lat1, lon1), (lat2, lon2) in zip(coordinates, coordinates[1:])
+    )
+    return abs(total) * EARTH_RADIUS ** 2 / 2.0
+
+
+def centroid(coordinates: Sequence[Point]) -> Point:
+    """
+    Calculate the centroid of a ring or the mean of the points if the points don't enclose an area.
+
+    :param coordinates: The points
+    :return: Tuple of latitude and longitude
+    :raises ValueError: If no points are provided
+    """
+    if not coordinates:
+        raise ValueError("Unable to calculate centroid without points")
+    a = 0.0
+    c_lat = 0.0
+    c_lon = 0.0
+    closed = len(coordinates) > 3 and coordinates[0] == coordinates[-1]
+    if closed:
+        for (lat1, lon1), (lat2, lon2) in zip(coordinates, coordinates[1:]):
+            cross = lon1 * lat2 - lon2 * lat1
+            a += cross
+            c_lat += (lat1 + lat2) * cross
+            c_lon += (lon1 + lon2) * cross
+    if a == 0.0:
+        count = len(coordinates)
+        return sum(lat for lat, _ in coordinates) / count, sum(lon for _, lon in coordinates) / count
+    return c_lat / (3.0 * a), c_lon / (3.0 * a)
+
+
+def is_closed(way: "overpy.Way") -> bool:
+    """
+    Test if the first and the last node of a way are the same.
+
+    :param way: The way
+    :return: True if the way is closed
+    """
+    node_ids = way.node_ids
+    return node_ids is not None and len(node_ids) > 3 and node_ids[0] == node_ids[-1]
+
+
+def build_rings(lines: Sequence[Sequence[Point]]) -> Tuple[List[List[Point]], List[List[Point]]]:
+    """
+    Join lines to closed rings.
+
+    The lines are joined at shared end points looked up in a hash map, so the time needed grows linear with the
+    number of lines. Lines are reversed if required.
+
+    :param lines: The lines to join
+    :return: Tuple of the closed rings in the order of their first line and of the lines which could not be closed
+    """
+    lines = [line for line in lines if len(line) > 1]
+    endpoints: Dict[Point, List[int]] = {}
+    for i, line in enumerate(lines):
+        endpoints.setdefault(line[0], []).append(i)
+        endpoints.setdefault(line[-1], []).append(i)
+
+    rings: List[List[Point]] = []
+    unclosed: List[List[Point]] = []
+    used = [False] * len(lines)
+    for i, line in enumerate(lines):
+        if used[i]:
+            continue
+        used[i] = True
+        ring = list(line)
+        while ring[0] != ring[-1]:
+            end = ring[-1]
+            for j in endpoints[end]:
+                if not used[j]:
+                    break
+            else:
+                break
+            used[j] = True
+            other = lines[j]
+            if other[0] == end:
+                ring.extend(other[1:])
+            else:
+                ring.extend(reversed(other[:-1]))
+        if ring[0] == ring[-1] and len(ring) > 3:
+            rings.append(ring)
+        else:
+            unclosed.append(ring)
+    return rings, unclosed
+
+
+def _point_in_ring(lat: float, lon: float, ring: Sequence[Point]) -> bool:
+    inside = False
+    for (lat1, lon1), (lat2, lon2) in zip(ring, ring[1:]):
+        if (lat1 > lat) != (lat2 > lat) and lon < (lon2 - lon1) * (lat - lat1) / (lat2 - lat1) + lon1:
+            inside = not inside
+    return inside
+
+
+def multipolygon(relation: "overpy.Relation", resolve_missing: bool = False) -> List[Polygon]:
+    """
+    Assemble the polygons of a multipolygon or boundary relation.
+
+    The coordinates are taken from the member geometry if the relation was queried with 'out geom', otherwise from
+    the resolved member ways. Members with role 'inner' are inner rings, all other way members are outer rings.
+    Every inner ring is assigned to the smallest outer ring containing it. The bounding boxes of the outer rings are
+    stored in a :class:`overpy.spatial.GridIndex`, so only outer rings near the inner ring whose bounding box contains
+    the one of the inner ring are tested. Outer rings are oriented counterclockwise and inner
+    rings clockwise. Lines which can not be joined to closed rings are ignored.
+
+    :param relation: The relation
+    :param resolve_missing: Try to resolve missing ways and nodes
+    :return: List of tuples with the outer ring and the list of inner rings
+    :raises overpy.exception.DataIncomplete: If a member way or one of its nodes is not available.
+    """
+    outer_lines: List[List[Point]] = []
+    inner_lines: List[List[Point]] = []
+    for member in relation.members or ():
+        if not isinstance(member, overpy.RelationWay):
+            continue
+        if member.geometry is not None:
+            coordinates = points(member)
+        else:
+            coordinates = points(member.resolve(resolve_missing=resolve_missing), resolve_missing=resolve_missing)
+        if member.role == "inner":
+            inner_lines.append(coordinates)
+        else:
+            outer_lines.append(coordinates)
+
+    outers, _ = build_rings(outer_lines)
+    inners, _ = build_rings(inner_lines)
+    polygons: List[Polygon] = []
+    outer_bboxes = []
+    outer_areas = []
+    for ring in outers:
+        signed_area = planar_area(ring)
+        if signed_area < 0:
+            ring.reverse()
+        polygons.append((ring, []))
+        outer_bboxes.append(bbox(ring))
+        outer_areas.append(abs(signed_area))
+
+    if not inners or not outers:
+        return polygons
+
+    # Cells of the size of a typical outer ring keep the number of cells per ring and of rings per cell small
+    extents = sorted(max(o_north - o_south, o_east - o_west) for o_south, o_west, o_north, o_east in outer_bboxes)
+    index = overpy.GridIndex(cell_size=extents[len(extents) // 2] or 0.01)
+    for i, outer_bbox in enumerate(outer_bboxes):
+        index.insert(i, *outer_bbox)
+
+    for ring in inners:
+        if planar_area(ring) > 0:
+            ring.reverse()
+        south, west, north, east = bbox(ring)
+        lat, lon = ring[0]
+        # An outer ring containing the inner ring contains its first point, test the smallest rings first
+        candidates = sorted(index.query(lat, lon, lat, lon), key=outer_areas.__getitem__)
+        for i in candidates:
+            o_south, o_west, o_north, o_east = outer_bboxes[i]
+            if o_south <= south and o_west <= west and o_north >= north and o_east >= east and \
+                    _point_in_ring(lat, lon, polygons[i][0]):
+                polygons[i][1].append(ring)
+                break
+    return polygons
+
+
+def way_metrics(result: "overpy.Result", use_numpy: Optional[bool] = None) -> WayMetrics:
+    """
+    Calculate length, bounding box, closedness, area and centroid of all ways of a result in one batched pass.
+
+    :param result: The result
+    :param use_numpy: Use NumPy to calculate the metrics (Default: use NumPy if available)
+    :return: The metrics, the fields are NumPy arrays if NumPy is used otherwise arrays
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    way_ids, offsets, lats, lons = result.way_coordinates(allow_missing=True, use_numpy=use_numpy)
+    ways = result._ways
+    closed = array("b", [is_closed(ways[way_id]) for way_id in way_ids])
+    if use_numpy:
+        return _way_metrics_numpy(way_ids, offsets, lats, lons, closed)
+
+    nan = float("nan")
+    columns: Tuple[array, ...] = tuple(array("d") for _ in range(9))
+    (lengths, south, west, north, east, planar_areas, areas, centroid_lats, centroid_lons) = columns
+    for i in range(len(way_ids)):
+        start, end = offsets[i], offsets[i + 1]
+        coordinates = list(zip(lats[start:end], lons[start:end]))
+        if not coordinates or any(lat != lat or lon != lon for lat, lon in coordinates):
+            for column in columns:
+                column.append(nan)
+            continue
+        lengths.append(length(coordinates))
+        for column, value in zip((south, west, north, east), bbox(coordinates)):
+            column.append(value)
+        if closed[i]:
+            planar_areas.append(abs(planar_area(coordinates)))
+            areas.append(area(coordinates))
+        else:
+            planar_areas.append(0.0)
+            areas.append(0.0)
+        c_lat, c_lon = centroid(coordinates)
+        centroid_lats.append(c_lat)
+        centroid_lons.append(c_lon)
+
+    return WayMetrics(
+        way_ids=way_ids, lengths=lengths, south=south, west=west, north=north, east=east, closed=closed,
+        planar_areas=planar_areas, areas=areas, centroid_lats=centroid_lats, centroid_lons=centroid_lons
+    )
+
+
+def _way_metrics_numpy(way_ids, offsets, lats, lons, closed) -> WayMetrics:
+    way_count = len(way_ids)
+    counts = numpy.diff(offsets)
+    closed = numpy.frombuffer(closed, dtype=numpy.int8).astype(bool)
+    # Index of the way for every point and for every segment starting at the point
+    point_way = numpy.repeat(numpy.arange(way_count), counts)
+    segment = numpy.ones(len(lats), dtype=bool)
+    segment[offsets[1:][counts > 0] - 1] = False
+    segment = segment[:-1] if len(lats) else segment
+    segment_way = point_way[:-1][segment]
+
+    lat1, lat2 = lats[:-1][segment], lats[1:][segment]
+    lon1, lon2 = lons[:-1][segment], lons[1:][segment]
+    phi1, phi2 = numpy.radians(lat1), numpy.radians(lat2)
+
+    def per_way(values):
+        return numpy.bincount(segment_way, weights=values, minlength=way_count)
+
+    a = numpy.sin((phi2 - phi1) / 2) ** 2 + numpy.cos(phi1) * numpy.cos(phi2) * numpy.sin(
+        numpy.radians(lon2 - lon1) / 2) ** 2
+    lengths = per_way(2 * EARTH_RADIUS * numpy.arcsin(numpy.minimum(1.0, numpy.sqrt(a))))
+
+    south, west, north, east = (numpy.full(way_count, numpy.nan) for _ in range(4))
+    non_empty = counts > 0
+    if non_empty.any():
+        starts = offsets[:-1][non_empty]
+        south[non_empty] = numpy.minimum.reduceat(lats, starts)
+        west[non_empty] = numpy.minimum.reduceat(lons, starts)
+        north[non_empty] = numpy.maximum.reduceat(lats, starts)
+        east[non_empty] = numpy.maximum.reduceat(lons, starts)
+
+    cross = lon1 * lat2 - lon2 * lat1
+    signed_planar = per_way(cross) / 2.0
+    spherical = per_way(numpy.radians(lon2 - lon1) * (2 + numpy.sin(phi1) + numpy.sin(phi2)))
+    planar_areas = numpy.where(closed, numpy.abs(signed_planar), 0.0)
+    areas = numpy.where(closed, numpy.abs(spherical) * EARTH_RADIUS ** 2 / 2.0, 0.0)
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        mean_lats = numpy.bincount(point_way, weights=lats, minlength=way_count) / counts
+        mean_lons = numpy.bincount(point_way, weights=lons, minlength=way_count) / counts
+        polygon = closed & (signed_planar != 0.0)
+        centroid_lats = numpy.where(polygon, per_way((lat1 + lat2) * cross) / (6.0 * signed_planar), mean_lats)
+        centroid_lons = numpy.where(polygon, per_way((lon1 + lon2) * cross) / (6.0 * signed_planar), mean_lons)
+
+    # Ways with missing nodes or without nodes
+    invalid = numpy.bincount(point_way, weights=numpy.isnan(lats) | numpy.isnan(lons), minlength=way_count) > 0
+    invalid |= ~non_empty
+    for values in (lengths, planar_areas, areas, centroid_lats, centroid_lons):
+        values[invalid] = numpy.nan
+
+    return WayMetrics(
+        way_ids=way_ids, lengths=lengths, south=south, west=west, north=north, east=east, closed=closed,
+        planar_areas=planar_areas, areas=areas, centroid_lats=centroid_lats, centroid_lons=centroid_lons
+    )
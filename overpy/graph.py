@@ -0,0 +1,218 @@
+from array import array
+from heapq import heappop, heappush
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import overpy
+from overpy.geometry import haversine
+
+#: Values of the oneway tag for ways only usable in the direction of the nodes
+ONEWAY_FORWARD = ("yes", "true", "1")
+#: Values of the oneway tag for ways only usable against the direction of the nodes
+ONEWAY_BACKWARD = ("-1", "reverse")
+
+
+class Graph:
+    """
+    Directed graph in compressed sparse row (CSR) format.
+
+    The edges leaving the vertex ``i`` are ``offsets[i]`` to ``offsets[i + 1]``, the vertex the edge ``j`` leads to
+    is ``targets[j]``. Create it with :meth:`overpy.Result.to_graph`.
+
+    :param node_ids: ID of the node of every vertex
+    :param offsets: Index of the first edge of every vertex and the number of edges as last value
+    :param targets: Index of the target vertex of every edge
+    :param lengths: Length of every edge in meters
+    :param way_ids: ID of the way of every edge
+    """
+
+    def __init__(self, node_ids: array, offsets: array, targets: array, lengths: array, way_ids: array):
+        #: ID of the node of every vertex (int64)
+        self.node_ids = node_ids
+        #: Index of the first edge of every vertex (int64)
+        self.offsets = offsets
+        #: Index of the target vertex of every edge (int32)
+        self.targets = targets
+        #: Length of every edge in meters (float64)
+        self.lengths = lengths
+        #: ID of the way of every edge (int64)
+        self.way_ids = way_ids
+        self._index: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __repr__(self) -> str:
+        return f"<overpy.graph.Graph vertices={len(self.node_ids)} edges={len(self.targets)}>"
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Number of edges
+        """
+        return len(self.targets)
+
+    def index(self, node_id: int) -> int:
+        """
+        Get the vertex of a node.
+
+        :param node_id: ID of the node
+        :return: Index of the vertex
+        :raises KeyError: If the node is not a vertex of the graph
+        """
+        if self._index is None:
+            self._index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        return self._index[node_id]
+
+    def edges(self, vertex: int) -> Iterator[Tuple[int, float, int]]:
+        """
+        Iterate over the edges leaving a vertex.
+
+        :param vertex: Index of the vertex
+        :return: Tuples of target vertex, length and way ID
+        """
+        for j in range(self.offsets[vertex], self.offsets[vertex + 1]):
+            yield self.targets[j], self.lengths[j], self.way_ids[j]
+
+    def shortest_path(self, source: int, target: int) -> Optional[Tuple[float, List[int]]]:
+        """
+        Find the shortest path between two nodes using Dijkstra's algorithm.
+
+        :param source: ID of the start node
+        :param target: ID of the destination node
+        :return: Tuple of the length in meters and the IDs of the vertex nodes on the path or None if the
+                 destination can not be reached
+        :raises KeyError: If one of the nodes is not a vertex of the graph
+        """
+        start = self.index(source)
+        end = self.index(target)
+        offsets = self.offsets
+        targets = self.targets
+        lengths = self.lengths
+
+        distances = {start: 0.0}
+        previous: Dict[int, int] = {}
+        queue = [(0.0, start)]
+        while queue:
+            distance, vertex = heappop(queue)
+            if vertex == end:
+                path = [end]
+                while path[-1] != start:
+                    path.append(previous[path[-1]])
+                return distance, [self.node_ids[i] for i in reversed(path)]
+            if distance > distances[vertex]:
+                continue
+            for j in range(offsets[vertex], offsets[vertex + 1]):
+                next_vertex = targets[j]
+                next_distance = distance + lengths[j]
+                if next_distance < distances.get(next_vertex, float("inf")):
+                    distances[next_vertex] = next_distance
+                    previous[next_vertex] = vertex
+                    heappush(queue, (next_distance, next_vertex))
+        return None
+
+
+def _direction(tags: Dict[str, str]) -> int:
+    value = tags.get("oneway")
+    if value in ONEWAY_FORWARD:
+        return 1
+    if value in ONEWAY_BACKWARD:
+        return -1
+    if value is None and tags.get("junction") in ("roundabout", "circular"):
+        return 1
+    return 0
+
+
+def build_graph(result: "overpy.Result", key: Optional[str] = "highway", oneway: bool = True) -> Graph:
+    """
+    Build a routing graph from the ways of a result.
+
+    Ways are split at nodes used more than once, the vertices of the graph are these nodes and the end nodes of the
+    ways. Every edge follows a way from one vertex to the next one and its length is the length of the way between
+    them. Ways with missing nodes are skipped.
+
+    :param result: The result
+    :param key: Only use ways with this tag, None to use all ways
+    :param oneway: Add only one edge for ways tagged with oneway or as roundabout, otherwise add edges in both
+                   directions
+    :return: The graph
+    """
+    way_ids, offsets, lats, lons = result.way_coordinates(allow_missing=True)
+    ways = result._ways
+
+    selected = []
+    usage: Dict[int, int] = {}
+    for i, way_id in enumerate(way_ids):
+        way = ways[way_id]
+        refs = way._node_ids
+        if refs is None or len(refs) < 2 or (key is not None and (way.tags is None or key not in way.tags)):
+            continue
+        start, end = offsets[i], offsets[i + 1]
+        if any(lat != lat for lat in lats[start:end]):
+            continue
+        selected.append(i)
+        for node_id in refs:
+            usage[node_id] = usage.get(node_id, 0) + 1
+        # End nodes are always vertices
+        usage[refs[0]] += 1
+        usage[refs[-1]] += 1
+
+    vertices: Dict[int, int] = {}
+    node_ids = array("q")
+    sources = array("i")
+    targets = array("i")
+    lengths = array("d")
+    edge_way_ids = array("q")
+    for i in selected:
+        way_id = way_ids[i]
+        way = ways[way_id]
+        direction = _direction(way.tags) if oneway and way.tags else 0
+        start = offsets[i]
+        previous = -1
+        length = 0.0
+        for pos, node_id in enumerate(way._node_ids):
+            if previous >= 0:
+                length += haversine(lats[start + pos - 1], lons[start + pos - 1], lats[start + pos], lons[start + pos])
+            if usage[node_id] < 2:
+                continue
+            vertex = vertices.get(node_id)
+            if vertex is None:
+                vertex = vertices[node_id] = len(node_ids)
+                node_ids.append(node_id)
+            if previous >= 0:
+                if direction >= 0:
+                    sources.append(previous)
+                    targets.append(vertex)
+                    lengths.append(length)
+                    edge_way_ids.append(way_id)
+                if direction <= 0:
+                    sources.append(vertex)
+                    targets.append(previous)
+                    lengths.append(length)
+                    edge_way_ids.append(way_id)
+            previous = vertex
+            length = 0.0
+
+    # Sort the edges by source vertex with a counting sort
+    vertex_offsets = array("q", bytes(8 * (len(node_ids) + 1)))
+    for source in sources:
+        vertex_offsets[source + 1] += 1
+    for i in range(len(node_ids)):
+        vertex_offsets[i + 1] += vertex_offsets[i]
+    positions = vertex_offsets[:-1]
+    sorted_targets = array("i", bytes(4 * len(targets)))
+    sorted_lengths = array("d", bytes(8 * len(lengths)))
+    sorted_way_ids = array("q", bytes(8 * len(edge_way_ids)))
+    for j, source in enumerate(sources):
+        pos = positions[source]
+        positions[source] = pos + 1
+        sorted_targets[pos] = targets[j]
+        sorted_lengths[pos] = lengths[j]
+        sorted_way_ids[pos] = edge_way_ids[j]
+
+    return Graph(
+        node_ids=node_ids,
+        offsets=vertex_offsets,
+        targets=sorted_targets,
+        lengths=sorted_lengths,
+        way_ids=sorted_way_ids
+    )
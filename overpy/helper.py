@@ -1,4 +1,5 @@
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 __author__ = 'mjob'
 
 import overpy
@@ -39,6 +40,67 @@ def get_street(
     return data
 
 
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def get_streets(
+        streets: Iterable[str],
+        areacode: str,
+        api: Optional[overpy.Overpass] = None,
+        batch_size: int = 200,
+        max_workers: int = 2) -> Dict[str, overpy.Result]:
+    """
+    Retrieve many streets in a given bounding area
+
+    The streets are fetched with one query per batch of names, the batches are queried concurrently.
+
+    :param streets: Names of the streets
+    :param areacode: The OSM id of the bounding area
+    :param api: API object to fetch missing elements
+    :param batch_size: Max number of names per query
+    :param max_workers: Max number of concurrent queries
+    :return: Dict with the name as key and a result with the ways of the street and their nodes as value
+    :raises overpy.exception.OverPyException: If something bad happens.
+    """
+    if api is None:
+        api = overpy.Overpass()
+
+    names = list(dict.fromkeys(streets))
+    batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+
+    def query_batch(batch: List[str]) -> overpy.Result:
+        selection = "\n".join(f'way[highway][name="{_quote(name)}"](area.location);' for name in batch)
+        query = f"""
+            area({areacode})->.location;
+            (
+                (
+                    {selection}
+                );
+                - (
+                    way[highway=service](area.location);
+                    way[highway=track](area.location);
+                );
+            );
+            out body;
+            >;
+            out skel qt;
+        """
+        return api.query(query)
+
+    streets_result: Dict[str, overpy.Result] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch, data in zip(batches, executor.map(query_batch, batches)):
+            for name in batch:
+                elements: Dict[Tuple[str, int], overpy.Element] = {}
+                for way in data.find("name", name, types=["way"]):
+                    elements[("way", way.id)] = way
+                    for node in way.get_nodes():
+                        elements[("node", node.id)] = node
+                streets_result[name] = overpy.Result(elements=list(elements.values()), api=api)
+    return streets_result
+
+
 def get_intersection(
         street1: str,
         street2: str,
@@ -58,7 +120,7 @@ def get_intersection(
         api = overpy.Overpass()
 
     query = f"""
-        area({areacode}->.location;
+        area({areacode})->.location;
         (
             way[highway][name="{street1}"](area.location); node(w)->.n1;
             way[highway][name="{street2}"](area.location); node(w)->.n2;
@@ -70,3 +132,62 @@ def get_intersection(
     data = api.query(query)
 
     return data.get_nodes()
+
+
+def get_intersections(
+        areacode: str,
+        api: Optional[overpy.Overpass] = None) -> Dict[Tuple[str, str], List[overpy.Node]]:
+    """
+    Retrieve the intersections of all streets in a given bounding area
+
+    All named streets are downloaded with one query and the intersections are calculated locally.
+
+    :param areacode: The OSM id of the bounding area
+    :param api: API object to fetch missing elements
+    :return: Intersections grouped by street names, see :func:`find_intersections`
+    :raises overpy.exception.OverPyException: If something bad happens.
+    """
+    if api is None:
+        api = overpy.Overpass()
+
+    query = f"""
+        area({areacode})->.location;
+        (
+            way[highway][name](area.location);
+            - (
+                way[highway=service](area.location);
+                way[highway=track](area.location);
+            );
+        );
+        out body;
+        >;
+        out skel qt;
+    """
+
+    data = api.query(query)
+
+    return find_intersections(data)
+
+
+def find_intersections(result: overpy.Result) -> Dict[Tuple[str, str], List[overpy.Node]]:
+    """
+    Find the intersections of named streets in a result
+
+    Two streets intersect at every node referenced by ways of both streets.
+
+    :param result: Result with the ways of the streets and their nodes
+    :return: Dict with the sorted tuple of both street names as key and the list of intersection nodes as value
+    """
+    intersections: Dict[Tuple[str, str], List[overpy.Node]] = {}
+    for node_id in result.node_ids:
+        ways = result.ways_for_node(node_id)
+        if len(ways) < 2:
+            continue
+        names = sorted({way.tags["name"] for way in ways if "highway" in way.tags and "name" in way.tags})
+        if len(names) < 2:
+            continue
+        node = result.get_node(node_id)
+        for i, name1 in enumerate(names):
+            for name2 in names[i + 1:]:
+                intersections.setdefault((name1, name2), []).append(node)
+    return intersections
@@ -0,0 +1,260 @@
+"""
+Parse large responses in a process pool.
+
+The raw response is split at element boundaries, the chunks are parsed by the workers and the results are merged in
+the order of the chunks. Elements already in the result are kept like in :meth:`overpy.Result.append`, so the merged
+result is the same as the result of the serial parser.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+import gc
+from itertools import repeat
+import json
+import re
+from typing import List, Optional, Tuple
+from xml.sax import SAXException
+
+import overpy
+
+#: Min number of characters per chunk, smaller responses are parsed with fewer workers
+MIN_CHUNK_SIZE = 1 << 20
+
+_JSON_ELEMENTS_START = re.compile(r'"elements"\s*:\s*\[')
+_JSON_OBJECT_START = re.compile(r",\s*\{")
+_XML_ELEMENT_START = re.compile(r"<(?:node|way|relation|area)[\s/>]")
+
+
+def chunk_count(data: str, workers: int, min_chunk_size: int = MIN_CHUNK_SIZE) -> int:
+    """
+    Get the number of chunks to split a response into.
+
+    :param data: The response
+    :param workers: Max number of chunks
+    :param min_chunk_size: Min number of characters per chunk
+    :return: Number of chunks
+    """
+    return max(1, min(workers, len(data) // max(1, min_chunk_size)))
+
+
+def split_json(data: str, chunks: int) -> Optional[Tuple[dict, List[str]]]:
+    """
+    Split a JSON response into chunks of the elements array.
+
+    Every chunk starts with an element object, the elements are separated by commas and the last element may be
+    followed by a comma.
+
+    :param data: The JSON response
+    :param chunks: Number of chunks to create, fewer chunks are returned if not enough elements are found
+    :return: Tuple of the response without elements and the chunks or None if the elements array is not found
+    """
+    match = _JSON_ELEMENTS_START.search(data)
+    if match is None:
+        return None
+    start = match.end()
+
+    # Search the end of the elements array from the end, other values may follow
+    end = len(data)
+    while True:
+        end = data.rfind("]", start, end)
+        if end < 0:
+            return None
+        try:
+            response = json.loads(data[:start] + data[end:], parse_float=Decimal)
+            break
+        except ValueError:
+            continue
+
+    decoder = json.JSONDecoder()
+    boundaries = [start]
+    step = (end - start) // chunks
+    for i in range(1, chunks):
+        pos = max(start + i * step, boundaries[-1] + 1)
+        while True:
+            match = _JSON_OBJECT_START.search(data, pos, end)
+            if match is None:
+                break
+            candidate = match.end() - 1
+            try:
+                value, _ = decoder.raw_decode(data, candidate)
+            except ValueError:
+                value = None
+            # Members and geometry values of relations are objects too, but have no id
+            if isinstance(value, dict) and "type" in value and "id" in value:
+                boundaries.append(candidate)
+                break
+            pos = candidate + 1
+        if match is None:
+            break
+    boundaries.append(end)
+    return response, [data[chunk_start:chunk_end] for chunk_start, chunk_end in zip(boundaries, boundaries[1:])]
+
+
+def split_xml(data: str, chunks: int) -> Optional[List[str]]:
+    """
+    Split an XML response into chunks of top-level ``node``, ``way``, ``relation`` and ``area`` elements.
+
+    :param data: The XML response
+    :param chunks: Number of chunks to create, fewer chunks are returned if not enough elements are found
+    :return: The chunks or None if no elements are found
+    """
+    match = _XML_ELEMENT_START.search(data)
+    end = data.rfind("</osm>")
+    if match is None or end < match.start():
+        return None
+    start = match.start()
+
+    boundaries = [start]
+    step = (end - start) // chunks
+    for i in range(1, chunks):
+        match = _XML_ELEMENT_START.search(data, max(start + i * step, boundaries[-1] + 1), end)
+        if match is None:
+            break
+        boundaries.append(match.start())
+    boundaries.append(end)
+    return [data[chunk_start:chunk_end] for chunk_start, chunk_end in zip(boundaries, boundaries[1:])]
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause the cyclic garbage collector while the results of the workers are unpickled and merged.
+
+    Unpickling creates many objects without creating garbage, the collections triggered by the allocations take
+    longer than unpickling itself.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _parse_json_chunk(
+        chunk: str,
+        api: "overpy.Overpass",
+        element_filter: Optional["overpy.ElementFilter"]) -> "overpy.Result":
+    chunk = chunk.rstrip()
+    if chunk.endswith(","):
+        chunk = chunk[:-1]
+    elements = json.loads("[" + chunk + "]", parse_float=Decimal)
+    return overpy.Result.from_json({"elements": elements}, api=api, element_filter=element_filter)
+
+
+def _parse_xml_chunk(
+        chunk: str,
+        api: "overpy.Overpass",
+        parser: int,
+        element_filter: Optional["overpy.ElementFilter"]) -> "overpy.Result":
+    return overpy.Result.from_xml("<osm>" + chunk + "</osm>", api=api, parser=parser, element_filter=element_filter)
+
+
+def merge(results: List["overpy.Result"], api: Optional["overpy.Overpass"] = None) -> "overpy.Result":
+    """
+    Merge the results of the chunks into the first result.
+
+    Elements already in the merged result are skipped. The elements of the other results are moved, their reference
+    to the result is updated.
+
+    :param results: The results in the order of the chunks
+    :param api: The API object to set on the merged result
+    :return: The merged result
+    """
+    result = results[0]
+    result.api = api
+    for other in results[1:]:
+        nodes = result._nodes
+        other_nodes = other._nodes
+        if isinstance(nodes, overpy.NodeStore) and isinstance(other_nodes, overpy.NodeStore) and \
+                nodes._index is None and other_nodes._index is None and \
+                (not nodes.ids or not other_nodes.ids or nodes.ids[-1] < other_nodes.ids[0]):
+            # Both stores are sorted and don't overlap, append the columns
+            offset = len(nodes.ids)
+            nodes.ids.extend(other_nodes.ids)
+            nodes.lats.extend(other_nodes.lats)
+            nodes.lons.extend(other_nodes.lons)
+            nodes._tags.update((row + offset, tags) for row, tags in other_nodes.tag_rows())
+            nodes._attributes.update((row + offset, value) for row, value in other_nodes.attribute_rows())
+        else:
+            for node in other_nodes.values():
+                if node.id not in nodes:
+                    node._result = result
+                    nodes[node.id] = node
+
+        for elem_cls in (overpy.Way, overpy.Relation, overpy.Area):
+            collection = result._class_collection_map[elem_cls]
+            for elem_id, element in other._class_collection_map[elem_cls].items():
+                if elem_id in collection:
+                    continue
+                element._result = result
+                if elem_cls is overpy.Relation:
+                    for member in element.members or ():
+                        member._result = result
+                collection[elem_id] = element
+    return result
+
+
+def parse_json(
+        api: "overpy.Overpass",
+        data: str,
+        workers: int,
+        element_filter: Optional["overpy.ElementFilter"] = None) -> Optional["overpy.Result"]:
+    """
+    Parse a JSON response in a process pool.
+
+    :param api: The API object, it is sent to the workers and its attribute modifiers have to be picklable
+    :param data: The JSON response
+    :param workers: Number of worker processes
+    :param element_filter: Only create the elements and fields selected by this filter, it has to be picklable
+    :return: The result or None if the response can not be split, parse it with the serial parser in this case
+    :raises overpy.exception.OverpassRuntimeError: If the response contains a remark
+    """
+    split = split_json(data, chunk_count(data, workers, MIN_CHUNK_SIZE))
+    if split is None:
+        return None
+    response, chunks = split
+    if "remark" in response:
+        api._handle_remark_msg(msg=response.get("remark"))
+    if len(chunks) < 2:
+        return None
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor, _gc_paused():
+        try:
+            results = list(executor.map(_parse_json_chunk, chunks, repeat(api), repeat(element_filter)))
+        except ValueError:
+            # The response was not split at element boundaries
+            return None
+        return merge(results, api=api)
+
+
+def parse_xml(
+        api: "overpy.Overpass",
+        data: str,
+        workers: int,
+        parser: int,
+        element_filter: Optional["overpy.ElementFilter"] = None) -> Optional["overpy.Result"]:
+    """
+    Parse an XML response in a process pool.
+
+    :param api: The API object, it is sent to the workers and its attribute modifiers have to be picklable
+    :param data: The XML response
+    :param workers: Number of worker processes
+    :param parser: The XML parser to use
+    :param element_filter: Only create the elements and fields selected by this filter, it has to be picklable
+    :return: The result or None if the response can not be split, parse it with the serial parser in this case
+    """
+    chunks = split_xml(data, chunk_count(data, workers, MIN_CHUNK_SIZE))
+    if chunks is None or len(chunks) < 2:
+        return None
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor, _gc_paused():
+        try:
+            results = list(executor.map(
+                _parse_xml_chunk, chunks, repeat(api), repeat(parser), repeat(element_filter)
+            ))
+        except (SAXException, SyntaxError, ValueError):
+            # The response was not split at element boundaries
+            return None
+        return merge(results, api=api)
@@ -0,0 +1,289 @@
+from datetime import datetime
+from decimal import Decimal
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+import json
+from xml.sax.saxutils import escape
+
+import overpy
+
+#: Keys of the element and member objects written explicitly, attributes with these names are skipped
+_JSON_ELEMENT_KEYS = frozenset(("type", "id", "tags", "lat", "lon", "center", "nodes", "members"))
+_JSON_MEMBER_KEYS = frozenset(("type", "ref", "role", "geometry"))
+
+#: Entities to escape in XML attribute values, line breaks and tabs would be normalized to spaces by the parser
+_XML_ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+
+
+def _json_list(values) -> str:
+    return "[" + ",".join([json_value(v) for v in values]) + "]"
+
+
+def _json_dict(values: dict) -> str:
+    return "{" + ",".join([encode_basestring_ascii(str(k)) + ":" + json_value(v) for k, v in values.items()]) + "}"
+
+
+_JSON_ENCODERS: Dict[type, Callable[[Any], str]] = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: float.__repr__,
+    Decimal: str,
+    bool: lambda v: "true" if v else "false",
+    type(None): lambda v: "null",
+    dict: _json_dict,
+    list: _json_list,
+    tuple: _json_list,
+}
+
+
+def json_value(value: Any) -> str:
+    """
+    Encode a value as JSON. Decimal values are written as numbers without conversion to float.
+
+    :param value: The value
+    :return: The JSON string
+    :raises TypeError: If the type of the value is not supported
+    """
+    encoder = _JSON_ENCODERS.get(value.__class__)
+    if encoder is not None:
+        return encoder(value)
+    if isinstance(value, dict):
+        return _json_dict(value)
+    if isinstance(value, (list, tuple)):
+        return _json_list(value)
+    if isinstance(value, datetime):
+        return encode_basestring_ascii(datetime.strftime(value, "%Y-%m-%dT%H:%M:%SZ"))
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def _attribute_values(attributes: dict) -> Iterator[tuple]:
+    serializers = overpy.GLOBAL_ATTRIBUTE_SERIALIZERS
+    for name, value in attributes.items():
+        serializer = serializers.get(name)
+        yield name, value if serializer is None else serializer(value)
+
+
+def _json_attributes(attributes: dict, skip: frozenset) -> str:
+    return "".join([
+        "," + encode_basestring_ascii(name) + ":" + json_value(value)
+        for name, value in _attribute_values(attributes)
+        if name not in skip
+    ])
+
+
+def _json_member(member: "overpy.RelationMember") -> str:
+    parts = [
+        '{"type":', encode_basestring_ascii(member._type_value),
+        ',"ref":', json_value(member.ref),
+        ',"role":', json_value(member.role),
+    ]
+    if member.geometry is not None:
+        parts.append(',"geometry":[')
+        parts.append(",".join([
+            '{"lat":' + json_value(v.lat) + ',"lon":' + json_value(v.lon) + "}" for v in member.geometry
+        ]))
+        parts.append("]")
+    if member.attributes:
+        parts.append(_json_attributes(member.attributes, _JSON_MEMBER_KEYS))
+    parts.append("}")
+    return "".join(parts)
+
+
+def element_json(element: "overpy.Element") -> str:
+    """
+    Encode an element as JSON without building the dict returned by :meth:`overpy.Element.to_json`.
+
+    The output has the same keys and values as the dict.
+
+    :param element: The element
+    :return: The JSON string
+    """
+    parts = [
+        '{"type":', encode_basestring_ascii(element._type_value),
+        ',"id":', json_value(element.id),
+        ',"tags":', "null" if element.tags is None else _json_dict(element.tags),
+    ]
+    if element.attributes:
+        parts.append(_json_attributes(element.attributes, _JSON_ELEMENT_KEYS))
+    if isinstance(element, overpy.Node):
+        parts.append(',"lat":' + json_value(element.lat) + ',"lon":' + json_value(element.lon))
+    elif isinstance(element, (overpy.Way, overpy.Relation)):
+        if element.center_lat is not None and element.center_lon is not None:
+            parts.append(
+                ',"center":{"lat":' + json_value(element.center_lat) + ',"lon":' + json_value(element.center_lon) + "}"
+            )
+        if isinstance(element, overpy.Way):
+            node_ids = element._node_ids
+            parts.append(',"nodes":' + ("null" if node_ids is None else "[" + ",".join(map(str, node_ids)) + "]"))
+        else:
+            parts.append(',"members":[' + ",".join([_json_member(member) for member in element.members]) + "]")
+    parts.append("}")
+    return "".join(parts)
+
+
+def iter_elements(result: "overpy.Result") -> Iterator["overpy.Element"]:
+    """
+    Iterate over all elements of a result in the order nodes, ways, relations and areas.
+
+    :param result: The result
+    :return: Iterator over the elements
+    """
+    for elem_cls in (overpy.Node, overpy.Way, overpy.Relation, overpy.Area):
+        yield from result._class_collection_map[elem_cls].values()
+
+
+def dump_json(result: "overpy.Result", fp: TextIO, batch_size: int = 1000):
+    """
+    Write a result as compact JSON to a file-like object. The output contains the same data as
+    :meth:`overpy.Result.to_json`, but the elements are encoded and written one batch after another.
+
+    :param result: The result
+    :param fp: File-like object opened in text mode
+    :param batch_size: Number of elements to write at once
+    """
+    fp.write('{"version":0.6,"generator":"Overpy Serializer","elements":[')
+    batch: List[str] = []
+    separator = ""
+    for element in iter_elements(result):
+        batch.append(separator + element_json(element))
+        separator = ","
+        if len(batch) >= batch_size:
+            fp.write("".join(batch))
+            batch = []
+    batch.append("]}")
+    fp.write("".join(batch))
+
+
+def iter_ndjson(result: "overpy.Result") -> Iterator[str]:
+    """
+    Iterate over the elements of a result encoded as newline delimited JSON.
+
+    :param result: The result
+    :return: Iterator over the lines, every line is one element terminated by a line break
+    """
+    for element in iter_elements(result):
+        yield element_json(element) + "\n"
+
+
+def dump_ndjson(result: "overpy.Result", fp: TextIO, batch_size: int = 1000):
+    """
+    Write a result as newline delimited JSON to a file-like object, one element per line.
+
+    :param result: The result
+    :param fp: File-like object opened in text mode
+    :param batch_size: Number of elements to write at once
+    """
+    batch: List[str] = []
+    for line in iter_ndjson(result):
+        batch.append(line)
+        if len(batch) >= batch_size:
+            fp.write("".join(batch))
+            batch = []
+    fp.write("".join(batch))
+
+
+def load_ndjson(
+        lines: Iterable[Union[str, bytes]],
+        api: Optional["overpy.Overpass"] = None,
+        result: Optional["overpy.Result"] = None) -> "overpy.Result":
+    """
+    Load elements from newline delimited JSON, one element per line. Empty lines and elements of unknown types
+    are skipped.
+
+    :param lines: File-like object or other iterable of lines
+    :param api: The API to create the result with
+    :param result: Add the elements to this result instead of creating a new one
+    :return: The result
+    """
+    if result is None:
+        result = overpy.Result(api=api)
+    elem_classes = {
+        elem_cls._type_value: elem_cls for elem_cls in (overpy.Node, overpy.Way, overpy.Relation, overpy.Area)
+    }
+    with result._parsing():
+        for line in lines:
+            if not line.strip():
+                continue
+            data = json.loads(line, parse_float=Decimal)
+            elem_cls = elem_classes.get(data.get("type"))
+            if elem_cls is not None:
+                result.append(elem_cls.from_json(data, result=result))
+    return result
+
+
+def _xml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return escape(str(value), _XML_ATTRIBUTE_ENTITIES)
+
+
+def _xml_attributes(attributes: dict) -> str:
+    return "".join([
+        f' {name}="{_xml_value(value)}"' for name, value in _attribute_values(attributes) if value is not None
+    ])
+
+
+def _xml_tags(tags: dict) -> List[str]:
+    # Tags without a value are parsed as None
+    return [
+        f'    <tag k="{_xml_value(k)}"/>\n' if v is None else f'    <tag k="{_xml_value(k)}" v="{_xml_value(v)}"/>\n'
+        for k, v in tags.items()
+    ]
+
+
+def element_xml(element: "overpy.Element") -> str:
+    """
+    Encode an element as OSM XML.
+
+    :param element: The element
+    :return: The XML string
+    """
+    name = element._type_value
+    start = f'  <{name} id="{element.id}"'
+    if isinstance(element, overpy.Node) and element.lat is not None and element.lon is not None:
+        start += f' lat="{element.lat}" lon="{element.lon}"'
+    start += _xml_attributes(element.attributes)
+
+    children: List[str] = []
+    if isinstance(element, (overpy.Way, overpy.Relation)):
+        if element.center_lat is not None and element.center_lon is not None:
+            children.append(f'    <center lat="{element.center_lat}" lon="{element.center_lon}"/>\n')
+        if isinstance(element, overpy.Way):
+            children.extend([f'    <nd ref="{node_id}"/>\n' for node_id in element._node_ids or ()])
+        else:
+            for member in element.members:
+                member_start = (
+                    f'    <member type="{member._type_value}" ref="{member.ref}" '
+                    f'role="{_xml_value(member.role or "")}"' + _xml_attributes(member.attributes or {})
+                )
+                if member.geometry is None:
+                    children.append(member_start + "/>\n")
+                else:
+                    children.append(member_start + ">\n")
+                    children.extend([f'      <nd lat="{v.lat}" lon="{v.lon}"/>\n' for v in member.geometry])
+                    children.append("    </member>\n")
+    children.extend(_xml_tags(element.tags or {}))
+
+    if not children:
+        return start + "/>\n"
+    return start + ">\n" + "".join(children) + f"  </{name}>\n"
+
+
+def dump_xml(result: "overpy.Result", fp: TextIO, batch_size: int = 1000):
+    """
+    Write a result as OSM XML 0.6 to a file-like object. The elements are encoded and written one batch after
+    another.
+
+    :param result: The result
+    :param fp: File-like object opened in text mode
+    :param batch_size: Number of elements to write at once
+    """
+    fp.write('<?xml version="1.0" encoding="UTF-8"?>\n<osm version="0.6" generator="Overpy Serializer">\n')
+    batch: List[str] = []
+    for element in iter_elements(result):
+        batch.append(element_xml(element))
+        if len(batch) >= batch_size:
+            fp.write("".join(batch))
+            batch = []
+    batch.append("</osm>\n")
+    fp.write("".join(batch))
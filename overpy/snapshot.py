@@ -0,0 +1,1106 @@
+"""
+Binary snapshot format for results.
+
+A snapshot starts with a header followed by a directory of named sections. All integers are little endian and the
+sections are aligned to 8 bytes.
+
+* Header: magic ``OVPYSNAP``, format version (uint16), flavour (uint16), number of sections (uint32)
+* Directory: for every section the name (16 bytes, ASCII, padded with null bytes), offset (uint64) and size (uint64)
+
+The compact flavour stores every section as a stream of unsigned LEB128 varints. IDs, node references and
+coordinates are delta and zigzag encoded, coordinates are stored as fixed-point integers with 7 decimal places. Tag
+keys, tag values, attribute names, attribute values and roles are stored once in a string table and referenced by
+index. Tags, attributes and centers are stored sparse, only for the elements having them.
+
+The mapped flavour stores fixed-width columns sorted by ID, so they can be used directly from a memory-mapped file:
+IDs and node references as int64, coordinates as float64 and NaN if missing, string indexes of tags and attributes as
+uint32 pairs with int64 offsets of the first pair of every element. Relations and areas are stored as JSON.
+"""
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, ValuesView
+from decimal import Decimal
+from itertools import accumulate
+import json
+import mmap
+from operator import attrgetter
+import os
+import struct
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import overpy
+from overpy.exception import SnapshotError
+from overpy.serializer import element_json, json_value
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+MAGIC = b"OVPYSNAP"
+#: Version of the snapshot format written
+FORMAT_VERSION = 1
+#: Varint encoded snapshot, see :func:`save`
+FLAVOUR_COMPACT = 0
+#: Fixed-width columns read with mmap, see :class:`MappedResult`
+FLAVOUR_MAPPED = 1
+
+#: Number of fixed-point units per degree
+COORDINATE_SCALE = 10 ** 7
+#: Fixed-point value of missing coordinates
+MISSING_COORDINATE = -2 ** 31
+#: String index of missing tag values
+MISSING_STRING = 2 ** 32 - 1
+
+_HEADER = struct.Struct("<8sHHI")
+_SECTION = struct.Struct("<16sQQ")
+
+#: Type codes of the relation members
+_TYPE_CODES = {"node": 0, "way": 1, "relation": 2, "area": 3}
+
+PathType = Union[str, "os.PathLike[str]"]
+
+#: Names of the shared memory blocks created by :func:`share` in this process
+_shared_names: Set[str] = set()
+
+
+def write_container(fp, flavour: int, sections: List[Tuple[str, bytes]]):
+    """
+    Write the header, the section directory and the sections.
+
+    :param fp: File-like object opened in binary mode
+    :param flavour: The flavour of the snapshot
+    :param sections: List of tuples with name and data of the sections
+    """
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    directory = []
+    for name, data in sections:
+        offset += -offset % 8
+        directory.append(_SECTION.pack(name.encode("ascii"), offset, len(data)))
+        offset += len(data)
+
+    fp.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flavour, len(sections)))
+    fp.write(b"".join(directory))
+    position = _HEADER.size + _SECTION.size * len(sections)
+    for name, data in sections:
+        padding = -position % 8
+        fp.write(b"\0" * padding)
+        fp.write(data)
+        position += padding + len(data)
+
+
+def read_container(buffer) -> Tuple[int, Dict[str, memoryview]]:
+    """
+    Read the header and the section directory.
+
+    :param buffer: Bytes or memory map with the snapshot
+    :return: Tuple of the flavour and a dict with the names of the sections as key and views of their data as value
+    :raises overpy.exception.SnapshotError: If the data is not a snapshot or the version is not supported
+    """
+    length = len(buffer)
+    if length < _HEADER.size:
+        raise SnapshotError("File too short")
+    magic, version, flavour, count = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise SnapshotError("Not an overpy snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+    if length < _HEADER.size + count * _SECTION.size:
+        raise SnapshotError("File too short")
+    directory = []
+    for i in range(count):
+        name, offset, size = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+        if offset + size > length:
+            raise SnapshotError("Section exceeds file size")
+        directory.append((name.rstrip(b"\0").decode("ascii"), offset, size))
+
+    # Create the views after the validation, views kept alive by a traceback would prevent closing a memory map
+    view = memoryview(buffer)
+    return flavour, {name: view[offset:offset + size] for name, offset, size in directory}
+
+
+def encode_varints(values: List[int]) -> bytes:
+    """
+    Encode unsigned integers as LEB128 varints.
+
+    :param values: The integers
+    :return: The encoded data
+    """
+    data = bytearray()
+    append = data.append
+    for value in values:
+        while value > 0x7f:
+            append(value & 0x7f | 0x80)
+            value >>= 7
+        append(value)
+    return bytes(data)
+
+
+def _decode_varints_numpy(data) -> Any:
+    raw = numpy.frombuffer(data, dtype=numpy.uint8)
+    if not len(raw):
+        return numpy.zeros(0, dtype=numpy.uint64)
+    ends = numpy.flatnonzero(raw < 0x80)
+    starts = numpy.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    group_start = numpy.repeat(starts, ends - starts + 1)
+    shifts = ((numpy.arange(len(raw)) - group_start) * 7).astype(numpy.uint64)
+    values = (raw & 0x7f).astype(numpy.uint64) << shifts
+    return numpy.add.reduceat(values, starts)
+
+
+def decode_varints(data) -> List[int]:
+    """
+    Decode LEB128 varints, in one vectorized pass if NumPy is available.
+
+    :param data: Object supporting the buffer protocol with the encoded data
+    :return: The integers
+    """
+    if numpy is not None:
+        return _decode_varints_numpy(data).tolist()
+
+    values = []
+    append = values.append
+    value = 0
+    shift = 0
+    for byte in bytes(data):
+        if byte < 0x80:
+            append(value | byte << shift)
+            value = 0
+            shift = 0
+        else:
+            value |= (byte & 0x7f) << shift
+            shift += 7
+    return values
+
+
+def _decode_deltas(data, as_numpy: bool = False) -> Any:
+    """
+    Decode zigzag and delta encoded integers.
+
+    :param data: The encoded data
+    :param as_numpy: Return an int64 NumPy array, only allowed if NumPy is available
+    :return: List or array of the integers
+    """
+    if numpy is not None:
+        values = _decode_varints_numpy(data)
+        values = (values >> numpy.uint64(1)).astype(numpy.int64) ^ -(values & numpy.uint64(1)).astype(numpy.int64)
+        values = numpy.cumsum(values)
+        return values if as_numpy else values.tolist()
+    return list(accumulate((value >> 1) ^ -(value & 1) for value in decode_varints(data)))
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _deltas(values) -> List[int]:
+    out = []
+    previous = 0
+    for value in values:
+        out.append(_zigzag(value - previous))
+        previous = value
+    return out
+
+
+def _fixed(value: Optional[Union[Decimal, float]]) -> int:
+    if value is None or value != value:
+        return MISSING_COORDINATE
+    return round(value * COORDINATE_SCALE)
+
+
+def _decimal(value: int) -> Optional[Decimal]:
+    if value == MISSING_COORDINATE:
+        return None
+    return Decimal(value).scaleb(-7)
+
+
+class _Encoder:
+    def __init__(self, result: "overpy.Result"):
+        self.result = result
+        self.modifiers = result.attribute_modifiers
+        self.strings: Dict[str, int] = {}
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def tags(self, rows) -> List[int]:
+        """
+        Encode the tags of the rows with tags or with None as tags: number of entries, then for every entry the
+        distance to the previous row, the number of tags plus one or 0 for None and the string indexes of the keys
+        and values. Missing values are stored as :data:`MISSING_STRING`.
+        """
+        out = [0]
+        previous = -1
+        string = self.string
+        for row, tags in rows:
+            if tags is not None and not tags:
+                continue
+            out[0] += 1
+            out.append(row - previous)
+            previous = row
+            if tags is None:
+                out.append(0)
+                continue
+            out.append(len(tags) + 1)
+            for key, value in tags.items():
+                out.append(string(key))
+                out.append(MISSING_STRING if value is None else string(value))
+        return out
+
+    def attributes(self, rows, modifiers: Dict[str, Callable]) -> List[int]:
+        """
+        Encode the attributes of the rows with attributes: number of entries, then for every entry the distance to
+        the previous row, the number of attributes and the names and values, see :meth:`_Encoder.attribute_values`.
+        """
+        out = [0]
+        previous = -1
+        for row, attributes in rows:
+            if not attributes:
+                continue
+            out[0] += 1
+            out.append(row - previous)
+            previous = row
+            self.attribute_values(out, attributes, modifiers)
+        return out
+
+    def attribute_values(self, out: List[int], attributes: dict, modifiers: Dict[str, Callable]):
+        """
+        Append the number of attributes and the string indexes of names and values, see
+        :meth:`_Encoder.attribute_pairs`.
+        """
+        out.append(len(attributes))
+        for name, value in self.attribute_pairs(attributes, modifiers):
+            out.append(name)
+            out.append(value)
+
+    def attribute_pairs(self, attributes: dict, modifiers: Dict[str, Callable]) -> Iterator[Tuple[int, int]]:
+        """
+        Iterate over the string indexes of names and values. The string index of a value is shifted by one bit, the
+        bit is set if the value is stored as JSON. Strings and converted values of attributes with modifier are
+        stored as text and converted again on load. Values not converted yet are read without converting them.
+        """
+        serializers = overpy.GLOBAL_ATTRIBUTE_SERIALIZERS
+        string = self.string
+        for name, value in dict.items(attributes):
+            if isinstance(value, str):
+                text, kind = value, 0
+            elif name in modifiers:
+                serializer = serializers.get(name)
+                if serializer is not None:
+                    text = serializer(value)
+                elif isinstance(value, bool):
+                    text = "true" if value else "false"
+                else:
+                    text = str(value)
+                kind = 0
+            else:
+                text, kind = json_value(value), 1
+            yield string(name), string(text) << 1 | kind
+
+    @staticmethod
+    def centers(elements) -> List[int]:
+        out = [0]
+        previous = -1
+        for row, element in enumerate(elements):
+            if element.center_lat is None or element.center_lon is None:
+                continue
+            out[0] += 1
+            out.extend((row - previous, _zigzag(_fixed(element.center_lat)), _zigzag(_fixed(element.center_lon))))
+            previous = row
+        return out
+
+    def members(self, relations) -> List[int]:
+        out: List[int] = []
+        previous = 0
+        string = self.string
+        for relation in relations:
+            members = relation.members
+            if members is None:
+                out.append(0)
+                continue
+            out.append(len(members) + 1)
+            for member in members:
+                out.append(_TYPE_CODES[member._type_value])
+                out.append(_zigzag(member.ref - previous))
+                previous = member.ref
+                out.append(0 if member.role is None else string(member.role) + 1)
+                if member.geometry is None:
+                    out.append(0)
+                else:
+                    out.append(len(member.geometry) + 1)
+                    for value in member.geometry:
+                        out.append(_zigzag(_fixed(value.lat)))
+                        out.append(_zigzag(_fixed(value.lon)))
+                self.attribute_values(out, member.attributes or {}, {})
+        return out
+
+    def encode(self) -> List[Tuple[str, bytes]]:
+        result = self.result
+        modifiers = self.modifiers
+        sections: List[Tuple[str, List[int]]] = []
+
+        nodes = result._nodes
+        if isinstance(nodes, overpy.NodeStore):
+            sections.extend([
+                ("node.id", _deltas(nodes.ids)),
+                ("node.tags", self.tags(nodes.tag_rows())),
+                ("node.attrs", self.attributes(nodes.attribute_rows(), modifiers)),
+                ("node.lat", _deltas(_fixed(value) for value in nodes.lats)),
+                ("node.lon", _deltas(_fixed(value) for value in nodes.lons)),
+            ])
+        else:
+            elements = list(nodes.values())
+            sections.extend([
+                ("node.id", _deltas(element.id for element in elements)),
+                ("node.tags", self.tags(enumerate(element.tags for element in elements))),
+                ("node.attrs", self.attributes(enumerate(element.attributes for element in elements), modifiers)),
+                ("node.lat", _deltas(_fixed(element.lat) for element in elements)),
+                ("node.lon", _deltas(_fixed(element.lon) for element in elements)),
+            ])
+
+        for elem_cls in (overpy.Way, overpy.Relation, overpy.Area):
+            name = elem_cls._type_value
+            elements = list(result._class_collection_map[elem_cls].values())
+            sections.extend([
+                (f"{name}.id", _deltas(element.id for element in elements)),
+                (f"{name}.tags", self.tags(enumerate(element.tags for element in elements))),
+                (f"{name}.attrs", self.attributes(enumerate(element.attributes for element in elements), modifiers)),
+            ])
+            if elem_cls is overpy.Way:
+                sections.extend([
+                    ("way.center", self.centers(elements)),
+                    ("way.count", [0 if way._node_ids is None else len(way._node_ids) + 1 for way in elements]),
+                    ("way.refs", _deltas(node_id for way in elements for node_id in way._node_ids or ())),
+                ])
+            elif elem_cls is overpy.Relation:
+                sections.extend([
+                    ("relation.center", self.centers(elements)),
+                    ("relation.members", self.members(elements)),
+                ])
+
+        strings = list(self.strings)
+        return [
+            ("strings.len", encode_varints([len(value) for value in strings])),
+            ("strings.data", "".join(strings).encode("utf-8")),
+        ] + [(name, encode_varints(values)) for name, values in sections]
+
+
+class _MappedEncoder(_Encoder):
+    @staticmethod
+    def column(typecode: str, values) -> bytes:
+        data = array(typecode, values)
+        if sys.byteorder == "big":  # pragma: no cover
+            data.byteswap()
+        return data.tobytes()
+
+    def pairs(self, name: str, values) -> List[Tuple[str, bytes]]:
+        """
+        Encode the string indexes of tags or attributes: the offsets of the first pair of every row and the number
+        of pairs as last value, the pairs of all rows as one column.
+        """
+        offsets = [0]
+        pairs: List[int] = []
+        for row_pairs in values:
+            for key, value in row_pairs:
+                pairs.append(key)
+                pairs.append(value)
+            offsets.append(len(pairs) // 2)
+        return [(f"{name}off", self.column("q", offsets)), (f"{name}s", self.column("I", pairs))]
+
+    def elements(self, name: str, elements) -> List[Tuple[str, bytes]]:
+        string = self.string
+        modifiers = self.modifiers
+        nan = float("nan")
+        sections = [(f"{name}.id", self.column("q", [element.id for element in elements]))]
+        sections.extend(self.pairs(f"{name}.tag", (
+            [
+                (string(key), MISSING_STRING if value is None else string(value))
+                for key, value in (element.tags or {}).items()
+            ]
+            for element in elements
+        )))
+        sections.extend(self.pairs(f"{name}.attr", (
+            self.attribute_pairs(element.attributes or {}, modifiers) for element in elements
+        )))
+        if name == "node":
+            sections.extend([
+                ("node.lat", self.column("d", [nan if node.lat is None else float(node.lat) for node in elements])),
+                ("node.lon", self.column("d", [nan if node.lon is None else float(node.lon) for node in elements])),
+            ])
+        elif name == "way":
+            offsets = [0]
+            refs = array("q")
+            for way in elements:
+                refs.extend(way._node_ids or ())
+                offsets.append(len(refs))
+            sections.extend([
+                ("way.refoff", self.column("q", offsets)),
+                ("way.refs", self.column("q", refs)),
+                ("way.clat", self.column("d", [
+                    nan if way.center_lat is None else float(way.center_lat) for way in elements
+                ])),
+                ("way.clon", self.column("d", [
+                    nan if way.center_lon is None else float(way.center_lon) for way in elements
+                ])),
+            ])
+        return sections
+
+    def encode(self) -> List[Tuple[str, bytes]]:
+        sections = []
+        for elem_cls in (overpy.Node, overpy.Way):
+            elements = sorted(self.result._class_collection_map[elem_cls].values(), key=attrgetter("id"))
+            sections.extend(self.elements(elem_cls._type_value, elements))
+        for elem_cls in (overpy.Relation, overpy.Area):
+            name = elem_cls._type_value
+            elements = sorted(self.result._class_collection_map[elem_cls].values(), key=attrgetter("id"))
+            data = [element_json(element).encode("utf-8") for element in elements]
+            sections.extend([
+                (f"{name}.id", self.column("q", [element.id for element in elements])),
+                (f"{name}.off", self.column("q", accumulate([0] + [len(value) for value in data]))),
+                (f"{name}.data", b"".join(data)),
+            ])
+
+        strings = [value.encode("utf-8") for value in self.strings]
+        return [
+            ("strings.off", self.column("q", accumulate([0] + [len(value) for value in strings]))),
+            ("strings.data", b"".join(strings)),
+        ] + sections
+
+
+def save(result: "overpy.Result", path: PathType, flavour: int = FLAVOUR_COMPACT):
+    """
+    Write a result to a snapshot file.
+
+    The compact flavour stores coordinates with 7 decimal places, the precision of the OSM database. The mapped
+    flavour stores them as float64 like :class:`overpy.NodeStore`, empty and missing tags and node references are
+    both stored as empty.
+
+    :param result: The result
+    :param path: Path of the file
+    :param flavour: :data:`FLAVOUR_COMPACT` to load the file with :func:`load` or :data:`FLAVOUR_MAPPED` to open it
+                    with :class:`MappedResult`
+    :raises ValueError: If the flavour is unknown
+    """
+    if flavour == FLAVOUR_COMPACT:
+        sections = _Encoder(result).encode()
+    elif flavour == FLAVOUR_MAPPED:
+        sections = _MappedEncoder(result).encode()
+    else:
+        raise ValueError(f"Unknown snapshot flavour {flavour!r}")
+    with open(path, "wb") as fp:
+        write_container(fp, flavour, sections)
+
+
+class _Decoder:
+    def __init__(self, sections: Dict[str, memoryview], result: "overpy.Result"):
+        self.sections = sections
+        self.result = result
+        self.modifiers = result.attribute_modifiers
+        self.lean = result.lean
+        text = bytes(self.section("strings.data")).decode("utf-8")
+        ends = list(accumulate(decode_varints(self.section("strings.len"))))
+        self.strings = [text[start:end] for start, end in zip([0] + ends, ends)]
+
+    def section(self, name: str) -> memoryview:
+        try:
+            return self.sections[name]
+        except KeyError:
+            raise SnapshotError(f"Section {name!r} missing")
+
+    def stream(self, name: str) -> Callable[[], int]:
+        return iter(decode_varints(self.section(name))).__next__
+
+    def empty(self, count: int) -> List[Optional[dict]]:
+        if self.lean:
+            return [overpy._EMPTY_DICT] * count
+        return [{} for _ in range(count)]
+
+    def tags(self, name: str, count: int) -> List[Optional[dict]]:
+        values = self.empty(count)
+        next_value = self.stream(name)
+        row = -1
+        for _ in range(next_value()):
+            row += next_value()
+            tag_count = next_value()
+            if tag_count == 0:
+                values[row] = None
+            else:
+                values[row] = self.tag_values(next_value, tag_count - 1)
+        return values
+
+    def tag_values(self, next_value: Callable[[], int], count: int) -> dict:
+        strings = self.strings
+        tags = {}
+        for _ in range(count):
+            key = strings[next_value()]
+            value = next_value()
+            tags[key] = None if value == MISSING_STRING else strings[value]
+        return tags
+
+    def attribute_values(self, next_value: Callable[[], int]) -> dict:
+        strings = self.strings
+        attributes = {}
+        for _ in range(next_value()):
+            name = strings[next_value()]
+            value = next_value()
+            text = strings[value >> 1]
+            attributes[name] = json.loads(text, parse_float=Decimal) if value & 1 else text
+        return attributes
+
+    def attributes(self, name: str, count: int) -> List[dict]:
+        values = self.empty(count)
+        next_value = self.stream(name)
+        modifiers = self.modifiers
+        row = -1
+        for _ in range(next_value()):
+            row += next_value()
+            attributes = self.attribute_values(next_value)
+            if attributes.keys() & modifiers.keys():
+                attributes = overpy._LazyAttributes(attributes, modifiers)
+            values[row] = attributes
+        return values
+
+    def centers(self, name: str, count: int) -> Tuple[List[Optional[Decimal]], List[Optional[Decimal]]]:
+        lats: List[Optional[Decimal]] = [None] * count
+        lons: List[Optional[Decimal]] = [None] * count
+        next_value = self.stream(name)
+        row = -1
+        for _ in range(next_value()):
+            row += next_value()
+            lats[row] = _decimal(_unzigzag(next_value()))
+            lons[row] = _decimal(_unzigzag(next_value()))
+        return lats, lons
+
+    def decode(self):
+        result = self.result
+        self.decode_nodes()
+
+        ids = _decode_deltas(self.section("way.id"))
+        tags = self.tags("way.tags", len(ids))
+        attributes = self.attributes("way.attrs", len(ids))
+        center_lats, center_lons = self.centers("way.center", len(ids))
+        refs = array("q")
+        if numpy is not None:
+            refs.frombytes(_decode_deltas(self.section("way.refs"), as_numpy=True).tobytes())
+        else:
+            refs.extend(_decode_deltas(self.section("way.refs")))
+        ways = result._ways
+        way_new = overpy.Way.__new__
+        way_cls = overpy.Way
+        start = 0
+        for i, count in enumerate(decode_varints(self.section("way.count"))):
+            way = way_new(way_cls)
+            way._result = result
+            way.id = ids[i]
+            way.tags = tags[i]
+            way.attributes = attributes[i]
+            if count:
+                way._node_ids = refs[start:start + count - 1]
+                start += count - 1
+            else:
+                way._node_ids = None
+            way.center_lat = center_lats[i]
+            way.center_lon = center_lons[i]
+            ways[way.id] = way
+
+        ids = _decode_deltas(self.section("relation.id"))
+        tags = self.tags("relation.tags", len(ids))
+        attributes = self.attributes("relation.attrs", len(ids))
+        center_lats, center_lons = self.centers("relation.center", len(ids))
+        next_member = self.stream("relation.members")
+        relations = result._relations
+        strings = self.strings
+        member_classes = (overpy.RelationNode, overpy.RelationWay, overpy.RelationRelation, overpy.RelationArea)
+        previous = 0
+        for i, rel_id in enumerate(ids):
+            count = next_member()
+            members = None
+            if count:
+                members = []
+                for _ in range(count - 1):
+                    member_cls = member_classes[next_member()]
+                    previous += _unzigzag(next_member())
+                    role = next_member()
+                    geometry_count = next_member()
+                    geometry = None
+                    if geometry_count:
+                        geometry = [
+                            overpy.RelationWayGeometryValue(
+                                lat=_decimal(_unzigzag(next_member())),
+                                lon=_decimal(_unzigzag(next_member()))
+                            )
+                            for _ in range(geometry_count - 1)
+                        ]
+                    members.append(member_cls(
+                        attributes=self.attribute_values(next_member),
+                        geometry=geometry,
+                        ref=previous,
+                        role=None if role == 0 else strings[role - 1],
+                        result=result
+                    ))
+            relation = overpy.Relation.__new__(overpy.Relation)
+            relation._result = result
+            relation.id = rel_id
+            relation.tags = tags[i]
+            relation.attributes = attributes[i]
+            relation.members = members
+            relation.center_lat = center_lats[i]
+            relation.center_lon = center_lons[i]
+            relations[rel_id] = relation
+
+        ids = _decode_deltas(self.section("area.id"))
+        tags = self.tags("area.tags", len(ids))
+        attributes = self.attributes("area.attrs", len(ids))
+        areas = result._areas
+        for i, area_id in enumerate(ids):
+            area = overpy.Area.__new__(overpy.Area)
+            area._result = result
+            area.id = area_id
+            area.tags = tags[i]
+            area.attributes = attributes[i]
+            areas[area_id] = area
+
+    def decode_nodes(self):
+        result = self.result
+        nodes = result._nodes
+        if isinstance(nodes, overpy.NodeStore):
+            self.decode_node_store(nodes)
+            return
+
+        ids = _decode_deltas(self.section("node.id"))
+        tags = self.tags("node.tags", len(ids))
+        attributes = self.attributes("node.attrs", len(ids))
+        lats = _decode_deltas(self.section("node.lat"))
+        lons = _decode_deltas(self.section("node.lon"))
+        node_new = overpy.Node.__new__
+        node_cls = overpy.Node
+        for node_id, lat, lon, node_tags, node_attributes in zip(ids, lats, lons, tags, attributes):
+            node = node_new(node_cls)
+            node._result = result
+            node.id = node_id
+            node.lat = None if lat == MISSING_COORDINATE else Decimal(lat).scaleb(-7)
+            node.lon = None if lon == MISSING_COORDINATE else Decimal(lon).scaleb(-7)
+            node.tags = node_tags
+            node.attributes = node_attributes
+            nodes[node_id] = node
+
+    def decode_node_store(self, nodes: "overpy.NodeStore"):
+        start = len(nodes.ids)
+        if numpy is not None:
+            ids = _decode_deltas(self.section("node.id"), as_numpy=True)
+            nodes.ids.frombytes(ids.tobytes())
+            for column, name in ((nodes.lats, "node.lat"), (nodes.lons, "node.lon")):
+                values = _decode_deltas(self.section(name), as_numpy=True)
+                coordinates = values / COORDINATE_SCALE
+                coordinates[values == MISSING_COORDINATE] = numpy.nan
+                column.frombytes(coordinates.tobytes())
+            ascending = bool((ids[1:] > ids[:-1]).all())
+        else:
+            ids = _decode_deltas(self.section("node.id"))
+            nodes.ids.extend(ids)
+            for column, name in ((nodes.lats, "node.lat"), (nodes.lons, "node.lon")):
+                column.extend([
+                    float("nan") if value == MISSING_COORDINATE else value / COORDINATE_SCALE
+                    for value in _decode_deltas(self.section(name))
+                ])
+            ascending = all(a < b for a, b in zip(ids, ids[1:]))
+        if not ascending:
+            nodes._build_index()
+
+        next_value = self.stream("node.tags")
+        row = -1
+        for _ in range(next_value()):
+            row += next_value()
+            tag_count = next_value()
+            if tag_count > 1:
+                nodes._tags[start + row] = self.tag_values(next_value, tag_count - 1)
+        next_value = self.stream("node.attrs")
+        modifiers = self.modifiers
+        row = -1
+        for _ in range(next_value()):
+            row += next_value()
+            attributes = self.attribute_values(next_value)
+            if attributes.keys() & modifiers.keys():
+                attributes = overpy._LazyAttributes(attributes, modifiers)
+            nodes._attributes[start + row] = attributes
+
+
+def load(
+        path: PathType,
+        api: Optional["overpy.Overpass"] = None,
+        lean: Optional[bool] = None,
+        columnar_nodes: Optional[bool] = None) -> "overpy.Result":
+    """
+    Load a result from a snapshot file written by :func:`save`.
+
+    :param path: Path of the file
+    :param api: The API object to load additional resources and elements
+    :param lean: Share read-only empty tags and attributes between the elements (Default: use setting from api)
+    :param columnar_nodes: Store the nodes in a :class:`overpy.NodeStore` (Default: use setting from api)
+    :return: The result
+    :raises overpy.exception.SnapshotError: If the file is not a snapshot or the version is not supported
+    """
+    with open(path, "rb") as fp:
+        data = fp.read()
+    flavour, sections = read_container(data)
+    if flavour == FLAVOUR_MAPPED:
+        raise SnapshotError("Mapped snapshots have to be opened with MappedResult")
+    if flavour != FLAVOUR_COMPACT:
+        raise SnapshotError(f"Unsupported snapshot flavour {flavour}")
+    result = overpy.Result(api=api, lean=lean, columnar_nodes=columnar_nodes)
+    _Decoder(sections, result).decode()
+    return result
+
+
+class _BufferWriter:
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.position = 0
+
+    def write(self, data: bytes):
+        self.buffer[self.position:self.position + len(data)] = data
+        self.position += len(data)
+
+
+def _import_shared_memory():
+    try:
+        from multiprocessing import shared_memory
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError("Shared memory is not supported by this Python build") from exc
+    return shared_memory
+
+
+def share(result: "overpy.Result", name: Optional[str] = None):
+    """
+    Publish a result as mapped snapshot in a shared memory block.
+
+    Other processes open it with :meth:`MappedResult.attach` without copying the data. The block stays available
+    until it is unlinked, call ``close()`` and ``unlink()`` of the returned object after the workers are done.
+
+    :param result: The result
+    :param name: Name of the block (Default: random name)
+    :return: The :class:`multiprocessing.shared_memory.SharedMemory` object of the block
+    :raises ImportError: If shared memory is not supported
+    """
+    shared_memory = _import_shared_memory()
+
+    sections = _MappedEncoder(result).encode()
+    size = _HEADER.size + sum(_SECTION.size + len(data) + 7 for _, data in sections)
+    block = shared_memory.SharedMemory(name=name, create=True, size=size)
+    try:
+        write_container(_BufferWriter(block.buf), FLAVOUR_MAPPED, sections)
+    except Exception:
+        block.close()
+        block.unlink()
+        raise
+    _shared_names.add(block.name)
+    return block
+
+
+def _open_shared_memory(name: str):
+    """
+    Open a shared memory block without leaving it registered with the resource tracker of this process. A registered
+    block is unlinked when the process exits, even if it was created by another process.
+
+    :return: The :class:`multiprocessing.shared_memory.SharedMemory` object of the block
+    """
+    import multiprocessing
+
+    shared_memory = _import_shared_memory()
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    block = shared_memory.SharedMemory(name=name)
+    if os.name != "posix":
+        # Only POSIX blocks are registered with the resource tracker
+        return block
+    # The process creating the block and its child processes share one resource tracker, the block stays registered
+    # there until the creator unlinks it
+    if name not in _shared_names and multiprocessing.parent_process() is None:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def _attach(name: str, api: Optional["overpy.Overpass"]) -> "MappedResult":
+    return MappedResult.attach(name, api=api)
+
+
+class _MappedValuesView(ValuesView):
+    def __iter__(self):
+        elements: _MappedElements = self._mapping
+        create = elements._create
+        for row in range(len(elements.ids)):
+            yield create(row)
+
+
+class _MappedElements(Mapping):
+    """
+    Read-only collection of the ways, relations or areas of a :class:`MappedResult`. The elements are created on
+    access.
+    """
+
+    def __init__(self, result: "MappedResult", name: str):
+        self._result = result
+        self._name = name
+        #: The IDs of the elements, sorted ascending
+        self.ids = result._column(f"{name}.id", "q")
+
+    def get_row(self, elem_id: int) -> int:
+        row = bisect_left(self.ids, elem_id)
+        if row < len(self.ids) and self.ids[row] == elem_id:
+            return row
+        return -1
+
+    def _create(self, row: int) -> "overpy.Element":
+        raise NotImplementedError
+
+    def __getitem__(self, elem_id: int) -> "overpy.Element":
+        row = self.get_row(elem_id)
+        if row < 0:
+            raise KeyError(elem_id)
+        return self._create(row)
+
+    def __contains__(self, elem_id) -> bool:
+        return self.get_row(elem_id) >= 0
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def values(self) -> _MappedValuesView:
+        return _MappedValuesView(self)
+
+
+class _MappedWays(_MappedElements):
+    def __init__(self, result: "MappedResult"):
+        super().__init__(result, "way")
+        self._refoff = result._column("way.refoff", "q")
+        self._refs = result._column("way.refs", "q")
+        self._center_lats = result._column("way.clat", "d")
+        self._center_lons = result._column("way.clon", "d")
+
+    def _create(self, row: int) -> "overpy.Way":
+        result = self._result
+        way = overpy.Way.__new__(overpy.Way)
+        way._result = result
+        way.id = self.ids[row]
+        way.tags = result._tags("way", row)
+        way.attributes = result._attributes("way", row)
+        way._node_ids = array("q", self._refs[self._refoff[row]:self._refoff[row + 1]])
+        lat = self._center_lats[row]
+        lon = self._center_lons[row]
+        way.center_lat = None if lat != lat else Decimal(repr(lat))
+        way.center_lon = None if lon != lon else Decimal(repr(lon))
+        return way
+
+
+class _MappedJSONElements(_MappedElements):
+    def __init__(self, result: "MappedResult", elem_cls: type):
+        super().__init__(result, elem_cls._type_value)
+        self._elem_cls = elem_cls
+        self._offsets = result._column(f"{self._name}.off", "q")
+        self._data = result._column(f"{self._name}.data", "B")
+
+    def _create(self, row: int) -> "overpy.Element":
+        data = str(self._data[self._offsets[row]:self._offsets[row + 1]], "utf-8")
+        return self._elem_cls.from_json(json.loads(data, parse_float=Decimal), result=self._result)
+
+
+class _MappedNodes(overpy.NodeStore):
+    """
+    Read-only node store using the columns of a :class:`MappedResult` without copying them.
+    """
+
+    def __init__(self, result: "MappedResult"):
+        self._result = result
+        self.ids = result._column("node.id", "q")
+        self.lats = result._column("node.lat", "d")
+        self.lons = result._column("node.lon", "d")
+        self._index = None
+
+    def _rows(self, kind: str) -> Iterator[int]:
+        offsets, _ = self._result._columns[f"node.{kind}"]
+        return (row for row in range(len(self.ids)) if offsets[row] != offsets[row + 1])
+
+    def tag_rows(self) -> Iterator[Tuple[int, dict]]:
+        tags = self._result._tags
+        return ((row, tags("node", row)) for row in self._rows("tag"))
+
+    def attribute_rows(self) -> Iterator[Tuple[int, dict]]:
+        attributes = self._result._attributes
+        return ((row, attributes("node", row)) for row in self._rows("attr"))
+
+    def _create_node(self, row: int) -> "overpy.Node":
+        result = self._result
+        node = overpy.Node.__new__(overpy.Node)
+        node._result = result
+        node.id = self.ids[row]
+        lat = self.lats[row]
+        lon = self.lons[row]
+        node.lat = None if lat != lat else Decimal(repr(lat))
+        node.lon = None if lon != lon else Decimal(repr(lon))
+        node.tags = result._tags("node", row)
+        node.attributes = result._attributes("node", row)
+        return node
+
+    def __setitem__(self, node_id: int, node: "overpy.Node"):
+        raise TypeError("Mapped results are read-only")
+
+    def __delitem__(self, node_id: int):
+        raise TypeError("Mapped results are read-only")
+
+
+class MappedResult(overpy.Result):
+    """
+    Read-only result backed by a memory-mapped snapshot file written with :data:`FLAVOUR_MAPPED` or by a shared
+    memory block created with :func:`share`.
+
+    Only the directory of the snapshot is read on open. The elements are created on access, IDs are looked up by
+    binary search on the sorted ID columns and :meth:`overpy.Result.node_columns` returns the mapped columns without
+    copying them. Processes opening the same file or shared memory block share the same pages.
+
+    Empty tags and attributes are shared read-only mappings like in lean mode. Adding elements raises a
+    :class:`TypeError`, missing elements can not be resolved. Pickling a mapped result only stores the path or the
+    name of the shared memory block, the receiving process opens it again.
+
+    :param path: Path of the file
+    :param api: The API object, used for the attribute modifiers
+    :raises overpy.exception.SnapshotError: If the file is not a mapped snapshot or the version is not supported
+    """
+
+    def __init__(self, path: PathType, api: Optional["overpy.Overpass"] = None):
+        overpy.Result.__init__(self, api=api, lean=True)
+        with open(path, "rb") as fp:
+            if os.fstat(fp.fileno()).st_size == 0:
+                raise SnapshotError("File too short")
+            memory_map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._reopen_args: Tuple[Any, ...] = (MappedResult, (path, api))
+        self._open(memory_map, memory_map.close)
+
+    @classmethod
+    def attach(cls, name: str, api: Optional["overpy.Overpass"] = None) -> "MappedResult":
+        """
+        Open a result published with :func:`share` in this or another process.
+
+        :param name: Name of the shared memory block
+        :param api: The API object, used for the attribute modifiers
+        :return: The result
+        :raises FileNotFoundError: If no shared memory block with this name exists
+        :raises ImportError: If shared memory is not supported
+        :raises overpy.exception.SnapshotError: If the block does not contain a mapped snapshot
+        """
+        result = cls.__new__(cls)
+        overpy.Result.__init__(result, api=api, lean=True)
+        block = _open_shared_memory(name)
+        result._reopen_args = (_attach, (name, api))
+        result._open(block.buf, block.close)
+        return result
+
+    def _open(self, buffer, close: Callable[[], None]):
+        if sys.byteorder == "big":  # pragma: no cover
+            close()
+            raise SnapshotError("Mapped snapshots can only be opened on little endian systems")
+        self._close_buffer = close
+        self._views: List[memoryview] = []
+        try:
+            flavour, self._sections = read_container(buffer)
+            self._views.extend(self._sections.values())
+            if flavour != FLAVOUR_MAPPED:
+                raise SnapshotError(f"Unsupported snapshot flavour {flavour}")
+            self._string_offsets = self._column("strings.off", "q")
+            self._string_data = self._column("strings.data", "B")
+            self._columns = {
+                f"{name}.{kind}": (self._column(f"{name}.{kind}off", "q"), self._column(f"{name}.{kind}s", "I"))
+                for name in ("node", "way") for kind in ("tag", "attr")
+            }
+            self._nodes = _MappedNodes(self)
+            self._ways = _MappedWays(self)
+            self._relations = _MappedJSONElements(self, overpy.Relation)
+            self._areas = _MappedJSONElements(self, overpy.Area)
+        except Exception:
+            self.close()
+            raise
+        self._class_collection_map = {
+            overpy.Node: self._nodes,
+            overpy.Way: self._ways,
+            overpy.Relation: self._relations,
+            overpy.Area: self._areas,
+        }
+
+    def __enter__(self) -> "MappedResult":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __reduce__(self):
+        return self._reopen_args
+
+    def close(self):
+        """
+        Release the columns and close the memory map or detach from the shared memory block. Arrays returned by
+        :meth:`overpy.Result.node_columns` with ``use_numpy=True`` have to be deleted before.
+        """
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._close_buffer()
+
+    def _column(self, name: str, typecode: str) -> memoryview:
+        try:
+            view = self._sections[name].cast(typecode)
+        except KeyError:
+            raise SnapshotError(f"Section {name!r} missing")
+        except TypeError:
+            raise SnapshotError(f"Invalid size of section {name!r}")
+        self._views.append(view)
+        return view
+
+    def _string(self, index: int) -> str:
+        return str(self._string_data[self._string_offsets[index]:self._string_offsets[index + 1]], "utf-8")
+
+    def _tags(self, name: str, row: int) -> dict:
+        offsets, pairs = self._columns[f"{name}.tag"]
+        start, end = offsets[row], offsets[row + 1]
+        if start == end:
+            return overpy._EMPTY_DICT
+        string = self._string
+        tags = {}
+        for i in range(start, end):
+            value = pairs[2 * i + 1]
+            tags[string(pairs[2 * i])] = None if value == MISSING_STRING else string(value)
+        return tags
+
+    def _attributes(self, name: str, row: int) -> dict:
+        offsets, pairs = self._columns[f"{name}.attr"]
+        start, end = offsets[row], offsets[row + 1]
+        if start == end:
+            return overpy._EMPTY_DICT
+        string = self._string
+        attributes = {}
+        for i in range(start, end):
+            value = pairs[2 * i + 1]
+            text = string(value >> 1)
+            attributes[string(pairs[2 * i])] = json.loads(text, parse_float=Decimal) if value & 1 else text
+        modifiers = self.attribute_modifiers
+        if attributes.keys() & modifiers.keys():
+            return overpy._LazyAttributes(attributes, modifiers)
+        return attributes
+
+    def append(self, element: "overpy.Element"):
+        raise TypeError("Mapped results are read-only")
+
+    def expand(self, other: "overpy.Result", merge: int = overpy.MERGE_KEEP_FIRST):
+        raise TypeError("Mapped results are read-only")
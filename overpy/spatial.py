@@ -0,0 +1,233 @@
+from array import array
+from math import asin, cos, degrees, floor, pi, radians, sin
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from overpy.geometry import EARTH_RADIUS, haversine
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def bbox_around(lat: float, lon: float, distance: float) -> Tuple[float, float, float, float]:
+    """
+    Get the bounding box containing all points within a distance of a point.
+
+    The longitudes of the returned box may exceed the range -180 to 180 if the box crosses the antimeridian.
+
+    :param lat: Latitude of the point in degrees
+    :param lon: Longitude of the point in degrees
+    :param distance: The distance in meters
+    :return: Tuple of south, west, north and east
+    """
+    d = distance / EARTH_RADIUS
+    south = lat - degrees(d)
+    north = lat + degrees(d)
+    if south <= -90.0 or north >= 90.0 or d >= radians(90.0 - abs(lat)):
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    dlon = degrees(asin(min(1.0, sin(d) / cos(radians(lat)))))
+    return south, lon - dlon, north, lon + dlon
+
+
+def _split_lon_range(west: float, east: float) -> List[Tuple[float, float]]:
+    """
+    Split a longitude range crossing the antimeridian into ranges between -180 and 180.
+    """
+    if east - west >= 360.0:
+        return [(-180.0, 180.0)]
+    if west >= -180.0 and east <= 180.0:
+        return [(west, east)]
+    west = (west + 180.0) % 360.0 - 180.0
+    east = (east + 180.0) % 360.0 - 180.0
+    if west <= east:
+        return [(west, east)]
+    return [(west, 180.0), (-180.0, east)]
+
+
+class GridIndex:
+    """
+    Spatial index assigning bounding boxes to the cells of a regular grid.
+
+    Points are stored as boxes without extent. Boxes covering more than ``max_cells`` cells are stored in a separate
+    list checked on every query.
+
+    :param cell_size: Size of the cells in degrees
+    :param max_cells: Max number of cells a box is assigned to
+    """
+
+    def __init__(self, cell_size: float = 0.01, max_cells: int = 64):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        #: IDs of the items
+        self.ids = array("q")
+        self._south = array("d")
+        self._west = array("d")
+        self._north = array("d")
+        self._east = array("d")
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._large: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _cell(self, value: float) -> int:
+        return floor(value / self.cell_size)
+
+    def insert(self, item_id: int, south: float, west: float, north: Optional[float] = None,
+               east: Optional[float] = None):
+        """
+        Add a point or a bounding box to the index.
+
+        :param item_id: ID of the item
+        :param south: Latitude of the point or the south of the box
+        :param west: Longitude of the point or the west of the box
+        :param north: North of the box, None for points
+        :param east: East of the box, None for points
+        """
+        if north is None:
+            north = south
+        if east is None:
+            east = west
+        pos = len(self.ids)
+        self.ids.append(item_id)
+        self._south.append(south)
+        self._west.append(west)
+        self._north.append(north)
+        self._east.append(east)
+
+        y1, y2 = self._cell(south), self._cell(north)
+        x1, x2 = self._cell(west), self._cell(east)
+        if (y2 - y1 + 1) * (x2 - x1 + 1) > self.max_cells:
+            self._large.append(pos)
+            return
+        cells = self._cells
+        for y in range(y1, y2 + 1):
+            for x in range(x1, x2 + 1):
+                items = cells.get((y, x))
+                if items is None:
+                    cells[(y, x)] = [pos]
+                else:
+                    items.append(pos)
+
+    def insert_points(self, ids: Iterable[int], lats: Sequence[float], lons: Sequence[float]):
+        """
+        Add many points to the index. The cells are calculated in one vectorized pass if NumPy is available.
+
+        Points with NaN coordinates are skipped.
+
+        :param ids: IDs of the points
+        :param lats: Latitudes of the points
+        :param lons: Longitudes of the points
+        """
+        start = len(self.ids)
+        self.ids.extend(ids)
+        self._south.extend(lats)
+        self._north.extend(lats)
+        self._west.extend(lons)
+        self._east.extend(lons)
+        cells = self._cells
+        if numpy is not None:
+            np_lats = numpy.frombuffer(self._south, dtype=numpy.float64)[start:]
+            np_lons = numpy.frombuffer(self._west, dtype=numpy.float64)[start:]
+            valid = ~(numpy.isnan(np_lats) | numpy.isnan(np_lons))
+            positions = numpy.nonzero(valid)[0] + start
+            ys = numpy.floor(np_lats[valid] / self.cell_size).astype(numpy.int64).tolist()
+            xs = numpy.floor(np_lons[valid] / self.cell_size).astype(numpy.int64).tolist()
+            items_iter = zip(positions.tolist(), ys, xs)
+        else:
+            cell = self._cell
+            items_iter = (
+                (pos, cell(self._south[pos]), cell(self._west[pos]))
+                for pos in range(start, len(self.ids))
+                if self._south[pos] == self._south[pos] and self._west[pos] == self._west[pos]
+            )
+        for pos, y, x in items_iter:
+            items = cells.get((y, x))
+            if items is None:
+                cells[(y, x)] = [pos]
+            else:
+                items.append(pos)
+
+    def _candidates(self, south: float, west: float, north: float, east: float) -> Iterable[int]:
+        y1, y2 = self._cell(south), self._cell(north)
+        x1, x2 = self._cell(west), self._cell(east)
+        cells = self._cells
+        if (y2 - y1 + 1) * (x2 - x1 + 1) > len(cells):
+            # Faster to test the occupied cells
+            return [
+                pos for (y, x), items in cells.items() if y1 <= y <= y2 and x1 <= x <= x2 for pos in items
+            ] + self._large
+        candidates = []
+        for y in range(y1, y2 + 1):
+            for x in range(x1, x2 + 1):
+                items = cells.get((y, x))
+                if items is not None:
+                    candidates.extend(items)
+        return candidates + self._large
+
+    def query(self, south: float, west: float, north: float, east: float) -> List[int]:
+        """
+        Get the IDs of all items intersecting a bounding box.
+
+        If west is greater than east the box crosses the antimeridian.
+
+        :param south: South of the box
+        :param west: West of the box
+        :param north: North of the box
+        :param east: East of the box
+        :return: List of IDs in insertion order
+        """
+        if west > east:
+            east += 360.0
+        found: Dict[int, None] = {}
+        for lon1, lon2 in _split_lon_range(west, east):
+            for pos in self._candidates(south, lon1, north, lon2):
+                if self._south[pos] <= north and self._north[pos] >= south and \
+                        self._west[pos] <= lon2 and self._east[pos] >= lon1:
+                    found[pos] = None
+        ids = self.ids
+        return [ids[pos] for pos in sorted(found)]
+
+    def nearest(self, lat: float, lon: float, k: int = 1,
+                max_distance: Optional[float] = None) -> List[Tuple[float, int]]:
+        """
+        Get the items next to a point. The distance is measured to the nearest point of the bounding box.
+
+        :param lat: Latitude of the point
+        :param lon: Longitude of the point
+        :param k: Max number of items to return
+        :param max_distance: Only return items within this distance in meters
+        :return: List of tuples with distance in meters and ID, sorted by distance
+        """
+        if k <= 0 or not self.ids:
+            return []
+
+        if max_distance is not None:
+            candidates = self._distances(lat, lon, bbox_around(lat, lon, max_distance))
+            return [item for item in candidates if item[0] <= max_distance][:k]
+
+        # Grow the searched radius until k items are within. All items within the radius are inside the searched
+        # bounding box, so no closer item can be missed.
+        radius = self.cell_size * 111000.0
+        while True:
+            candidates = self._distances(lat, lon, bbox_around(lat, lon, radius))
+            if radius >= EARTH_RADIUS * pi:
+                return candidates[:k]
+            within = [item for item in candidates if item[0] <= radius]
+            if len(within) >= k:
+                return within[:k]
+            radius *= 2
+
+    def _distances(self, lat: float, lon: float, bbox: Tuple[float, float, float, float]) -> List[Tuple[float, int]]:
+        south, west, north, east = bbox
+        distances: Dict[int, float] = {}
+        for lon1, lon2 in _split_lon_range(west, east):
+            for pos in self._candidates(south, lon1, north, lon2):
+                if pos in distances:
+                    continue
+                nearest_lat = min(max(lat, self._south[pos]), self._north[pos])
+                nearest_lon = min(max(lon, self._west[pos]), self._east[pos])
+                distances[pos] = haversine(lat, lon, nearest_lat, nearest_lon)
+        ids = self.ids
+        return sorted((distance, ids[pos]) for pos, distance in distances.items())
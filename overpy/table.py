@@ -0,0 +1,328 @@
+"""
+Tags of the elements of a result in dictionary-encoded columns.
+
+Every tag is one row of the table. The keys and values are stored as codes into string pools, so filters, group-bys
+and value counts compare integers and a condition on the values is evaluated once per distinct value instead of once
+per tag.
+"""
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+import overpy
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+class TagTable:
+    """
+    Dictionary-encoded tag table.
+
+    Row ``i`` is the tag ``key_pool[keys[i]]`` with the value ``value_pool[values[i]]`` of the element with the index
+    ``elements[i]``. Values missing in the data have the code -1. The element with the index ``j`` has the ID
+    ``element_ids[j]`` and the type ``TYPE_NAMES[element_types[j]]``, elements without tags are included. The rows
+    are sorted by element index. Create it with :meth:`overpy.Result.tag_table`.
+
+    :param element_types: Type code of every element
+    :param element_ids: ID of every element
+    :param elements: Element index of every tag
+    :param keys: Key code of every tag
+    :param values: Value code of every tag
+    :param key_pool: The distinct keys
+    :param value_pool: The distinct values
+    """
+
+    #: Names of the element types, indexed by the type codes
+    TYPE_NAMES: ClassVar[Tuple[str, ...]] = ("node", "way", "relation", "area")
+
+    def __init__(
+            self,
+            element_types: array,
+            element_ids: array,
+            elements: array,
+            keys: array,
+            values: array,
+            key_pool: List[str],
+            value_pool: List[str]):
+        #: Type code of every element (int8)
+        self.element_types = element_types
+        #: ID of every element (int64)
+        self.element_ids = element_ids
+        #: Element index of every tag (int32)
+        self.elements = elements
+        #: Key code of every tag (int32)
+        self.keys = keys
+        #: Value code of every tag, -1 if the value is missing (int32)
+        self.values = values
+        #: The distinct keys, indexed by the key codes
+        self.key_pool = key_pool
+        #: The distinct values, indexed by the value codes
+        self.value_pool = value_pool
+        self._key_codes: Dict[str, int] = {key: code for code, key in enumerate(key_pool)}
+        self._value_codes: Dict[str, int] = {value: code for code, value in enumerate(value_pool)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:
+        return (
+            f"<overpy.table.TagTable elements={len(self.element_ids)} tags={len(self.keys)} "
+            f"keys={len(self.key_pool)} values={len(self.value_pool)}>"
+        )
+
+    def key_code(self, key: str) -> int:
+        """
+        Get the code of a key.
+
+        :param key: The key
+        :return: The code or -1 if no element has a tag with this key
+        """
+        return self._key_codes.get(key, -1)
+
+    def value_code(self, value: str) -> int:
+        """
+        Get the code of a value.
+
+        :param value: The value
+        :return: The code or -1 if no tag has this value
+        """
+        return self._value_codes.get(value, -1)
+
+    def _matching_values(self, value: Union[str, Iterable[str], Pattern]) -> List[int]:
+        """
+        Get the codes of the values matching a value condition, the condition is evaluated once per distinct value.
+        """
+        if isinstance(value, str):
+            code = self.value_code(value)
+            return [] if code < 0 else [code]
+        matches = overpy._value_matcher(value)
+        return [code for code, pool_value in enumerate(self.value_pool) if matches(pool_value)]
+
+    def find(
+            self,
+            key: str,
+            value: Union[None, str, Iterable[str], Pattern] = None,
+            use_numpy: Optional[bool] = None) -> Any:
+        """
+        Find the elements having a tag.
+
+        :param key: The tag key
+        :param value: None to test if the tag exists, a string to test for equality, a set or other iterable of
+                      strings to test if the value is one of them or a compiled regular expression to search in the
+                      value
+        :param use_numpy: Use NumPy to scan the columns (Default: use NumPy if available)
+        :return: Sorted element indexes as array or NumPy array
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        key_code = self.key_code(key)
+        codes = None if value is None else self._matching_values(value)
+
+        if use_numpy:
+            keys, values, elements = self._numpy_columns()
+            mask = keys == key_code
+            if codes is not None:
+                mask &= numpy.isin(values, numpy.array(codes, dtype=numpy.int32))
+            return elements[mask]
+
+        if codes is None:
+            return array("i", compress(self.elements, map(key_code.__eq__, self.keys)))
+        code_set = frozenset(codes)
+        return array("i", [
+            element for element, k, v in zip(self.elements, self.keys, self.values) if k == key_code and v in code_set
+        ])
+
+    def value_counts(self, key: str, use_numpy: Optional[bool] = None) -> List[Tuple[Optional[str], int]]:
+        """
+        Count the values of a tag.
+
+        :param key: The tag key
+        :param use_numpy: Use NumPy to count the values (Default: use NumPy if available)
+        :return: List of tuples of value and number of elements, the most common value first. Missing values are
+                 counted as None.
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        key_code = self.key_code(key)
+
+        if use_numpy:
+            keys, values, _ = self._numpy_columns()
+            # Shift the codes by one to count missing values in the first bin
+            bins = numpy.bincount(values[keys == key_code] + 1, minlength=len(self.value_pool) + 1)
+            counts = {int(code) - 1: int(bins[code]) for code in numpy.flatnonzero(bins)}
+        else:
+            counts = Counter(compress(self.values, map(key_code.__eq__, self.keys)))
+
+        pool = self.value_pool
+        # Values with the same count are ordered by code, the order of their first occurrence in the table
+        return [
+            (None if code < 0 else pool[code], count)
+            for code, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        ]
+
+    def group_by(self, key: str, use_numpy: Optional[bool] = None) -> Dict[Optional[str], Any]:
+        """
+        Group the elements having a tag by its value.
+
+        :param key: The tag key
+        :param use_numpy: Use NumPy to group the elements (Default: use NumPy if available)
+        :return: Dict of value and sorted element indexes as array or NumPy array, missing values are grouped as
+                 None
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        key_code = self.key_code(key)
+        pool = self.value_pool
+
+        if use_numpy:
+            keys, values, elements = self._numpy_columns()
+            mask = keys == key_code
+            values = values[mask]
+            elements = elements[mask]
+            order = numpy.argsort(values, kind="stable")
+            values = values[order]
+            elements = elements[order]
+            starts = numpy.flatnonzero(numpy.diff(values, prepend=values[:1] - 1))
+            return {
+                None if values[start] < 0 else pool[values[start]]: group
+                for start, group in zip(starts, numpy.split(elements, starts[1:]))
+            }
+
+        groups: Dict[int, array] = {}
+        for element, k, v in zip(self.elements, self.keys, self.values):
+            if k == key_code:
+                group = groups.get(v)
+                if group is None:
+                    group = groups[v] = array("i")
+                group.append(element)
+        return {None if code < 0 else pool[code]: group for code, group in sorted(groups.items())}
+
+    def _numpy_columns(self) -> Tuple[Any, Any, Any]:
+        return (
+            numpy.frombuffer(self.keys, dtype=numpy.int32),
+            numpy.frombuffer(self.values, dtype=numpy.int32),
+            numpy.frombuffer(self.elements, dtype=numpy.int32),
+        )
+
+    def to_pandas(self):
+        """
+        Convert the table to a pandas DataFrame with one row per tag.
+
+        The columns ``type``, ``key`` and ``value`` are categoricals using the codes and pools of the table without
+        copying the strings, ``id`` is the element ID. Missing values are NaN.
+
+        :return: The :class:`pandas.DataFrame`
+        :raises ImportError: If pandas is not installed
+        """
+        import pandas
+
+        keys, values, elements = self._numpy_columns()
+        return pandas.DataFrame({
+            "type": pandas.Categorical.from_codes(
+                numpy.frombuffer(self.element_types, dtype=numpy.int8)[elements], categories=list(self.TYPE_NAMES)
+            ),
+            "id": numpy.frombuffer(self.element_ids, dtype=numpy.int64)[elements],
+            "key": pandas.Categorical.from_codes(keys, categories=self.key_pool),
+            "value": pandas.Categorical.from_codes(values, categories=self.value_pool),
+        })
+
+    def to_arrow(self):
+        """
+        Convert the table to a pyarrow Table with one row per tag.
+
+        The columns ``type``, ``key`` and ``value`` are dictionary arrays using the codes and pools of the table,
+        ``id`` is the element ID. Missing values are null.
+
+        :return: The :class:`pyarrow.Table`
+        :raises ImportError: If pyarrow is not installed
+        """
+        import pyarrow
+
+        keys, values, elements = self._numpy_columns()
+        missing = values < 0
+        return pyarrow.table({
+            "type": pyarrow.DictionaryArray.from_arrays(
+                numpy.frombuffer(self.element_types, dtype=numpy.int8)[elements], list(self.TYPE_NAMES)
+            ),
+            "id": numpy.frombuffer(self.element_ids, dtype=numpy.int64)[elements],
+            "key": pyarrow.DictionaryArray.from_arrays(keys, self.key_pool),
+            "value": pyarrow.DictionaryArray.from_arrays(
+                numpy.where(missing, 0, values), self.value_pool, mask=missing
+            ),
+        })
+
+
+def build_tag_table(
+        result: "overpy.Result",
+        types: Optional[Iterable[Union[str, type]]] = None) -> TagTable:
+    """
+    Build the dictionary-encoded tag table of the elements of a result.
+
+    :param result: The result
+    :param types: Only add elements of these types, classes or type names like 'node' (Default: all types)
+    :return: The table, the elements are ordered by type in the order nodes, ways, relations, areas
+    :raises ValueError: If a type is unknown
+    """
+    type_names = TagTable.TYPE_NAMES
+    selected = None
+    if types is not None:
+        selected = {t if isinstance(t, str) else t._type_value for t in types}
+        unknown = selected.difference(type_names)
+        if unknown:
+            raise ValueError(f"Unknown element types: {sorted(unknown)!r}")
+
+    element_types = array("b")
+    element_ids = array("q")
+    elements = array("i")
+    keys = array("i")
+    values = array("i")
+    key_codes: Dict[str, int] = {}
+    value_codes: Dict[str, int] = {}
+
+    def add_tags(offset: int, rows: Iterable[Tuple[int, Optional[dict]]]):
+        for row, tags in rows:
+            if not tags:
+                continue
+            element = offset + row
+            for key, value in tags.items():
+                key_code = key_codes.get(key)
+                if key_code is None:
+                    key_code = key_codes[key] = len(key_codes)
+                if value is None:
+                    value_code = -1
+                else:
+                    value_code = value_codes.get(value)
+                    if value_code is None:
+                        value_code = value_codes[value] = len(value_codes)
+                elements.append(element)
+                keys.append(key_code)
+                values.append(value_code)
+
+    for type_code, elem_cls in enumerate((overpy.Node, overpy.Way, overpy.Relation, overpy.Area)):
+        if selected is not None and type_names[type_code] not in selected:
+            continue
+        collection = result._class_collection_map[elem_cls]
+        offset = len(element_ids)
+        if isinstance(collection, overpy.NodeStore):
+            # Read the tags of the store without creating Node objects
+            element_ids.extend(collection.ids)
+            add_tags(offset, collection.tag_rows())
+        else:
+            collection_elements = collection.values()
+            element_ids.extend(element.id for element in collection_elements)
+            add_tags(offset, enumerate(element.tags for element in collection_elements))
+        element_types.extend([type_code] * (len(element_ids) - offset))
+
+    return TagTable(
+        element_types=element_types,
+        element_ids=element_ids,
+        elements=elements,
+        keys=keys,
+        values=values,
+        key_pool=list(key_codes),
+        value_pool=list(value_codes),
+    )
@@ -17,6 +17,11 @@ setup(
     author=about["__author__"],
     keywords="OverPy Overpass OSM OpenStreetMap",
     install_requires=[],
+    extras_require={
+        "numpy": ["numpy"],
+        "pandas": ["pandas"],
+        "arrow": ["pyarrow"],
+    },
     packages=find_packages(exclude=["*.tests", "*.tests.*", "tests"]),
     package_data={
         # "": ["README"],
@@ -6,6 +6,8 @@ from threading import Lock
 from socketserver import BaseRequestHandler, TCPServer
 from http.server import HTTPServer
 
+import simplejson
+
 TCPServer.allow_reuse_address = True
 
 HOST = "127.0.0.1"
@@ -29,6 +31,10 @@ def read_file(filename, mode="r"):
     return (Path(__file__).resolve().parent / filename).open(mode).read()
 
 
+def normalized(result):
+    return simplejson.loads(simplejson.dumps(result.to_json()), use_decimal=True)
+
+
 def new_server_thread(handle_cls, port=None):
     global current_port
     if port is None:
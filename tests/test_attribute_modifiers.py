@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+import overpy
+
+from tests import read_file
+
+
+class TestAttributeModifiers:
+    def test_lazy_conversion(self):
+        api = overpy.Overpass()
+        result = api.parse_xml(read_file("xml/node-01.xml"))
+        node = result.get_node(3233854234)
+
+        # The raw values are kept until the attribute is accessed
+        assert dict.__getitem__(node.attributes, "changeset") == "23456789"
+        assert node.attributes["changeset"] == 23456789
+        assert dict.__getitem__(node.attributes, "changeset") == 23456789
+
+        assert node.attributes.get("uid") == 345678
+        assert node.attributes.get("missing") is None
+
+        attributes = dict(node.attributes)
+        assert attributes["timestamp"] == datetime(2014, 12, 14, 7, 27, 19)
+        assert attributes["version"] == 1
+        assert attributes["user"] == "TestUser"
+
+    def test_set_before_access(self):
+        api = overpy.Overpass()
+        result = api.parse_xml(read_file("xml/node-01.xml"))
+        node = result.get_node(3233854234)
+
+        node.attributes["version"] = "custom"
+        assert node.attributes["version"] == "custom"
+        assert node.attributes == {
+            "changeset": 23456789,
+            "timestamp": datetime(2014, 12, 14, 7, 27, 19),
+            "uid": 345678,
+            "user": "TestUser",
+            "version": "custom",
+        }
+
+    def test_custom_modifiers(self):
+        api = overpy.Overpass(attribute_modifiers={"user": str.upper, "version": str})
+        result = api.parse_json(read_file("json/node-01.json"))
+        node = result.get_node(3233854234)
+
+        assert node.attributes["user"] == "TESTUSER"
+        assert node.attributes["version"] == "1"
+        # Default modifiers are still used
+        assert node.attributes["uid"] == 345678
+
+        # The modifiers of other instances are not changed
+        assert "user" not in overpy.Overpass().attribute_modifiers
+        assert "user" not in overpy.GLOBAL_ATTRIBUTE_MODIFIERS
+
+    def test_no_api(self):
+        node = overpy.Node(node_id=1, attributes={"visible": "false"})
+        assert node.attributes["visible"] is False
+
+        node = overpy.Node(node_id=1)
+        assert node.attributes == {}
+
+    def test_json_bool(self):
+        result = overpy.Overpass().parse_json(
+            '{"elements": [{"type": "node", "id": 1, "lat": 1.0, "lon": 2.0, "visible": true},'
+            ' {"type": "node", "id": 2, "lat": 1.0, "lon": 2.0, "visible": false}]}'
+        )
+        assert result.get_node(1).attributes["visible"] is True
+        assert result.get_node(2).attributes["visible"] is False
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("2014-12-14T07:27:19Z", datetime(2014, 12, 14, 7, 27, 19)),
+            ("2016-02-29T23:59:59Z", datetime(2016, 2, 29, 23, 59, 59)),
+        ]
+    )
+    def test_parse_timestamp(self, value, expected):
+        assert overpy._parse_timestamp(value) == expected
+
+    @pytest.mark.parametrize("value", ["2015-02-29T00:00:00Z", "2014-12-14 07:27:19", "foo"])
+    def test_parse_timestamp_invalid(self, value):
+        with pytest.raises(ValueError):
+            overpy._parse_timestamp(value)
@@ -0,0 +1,109 @@
+import pickle
+import re
+
+import pytest
+
+import overpy
+from overpy import parallel
+
+from tests import read_file
+
+PARSERS = ["json", overpy.XML_PARSER_DOM, overpy.XML_PARSER_SAX]
+
+
+def parse(parser, name, element_filter):
+    api = overpy.Overpass()
+    if parser == "json":
+        return api.parse_json(read_file(f"json/{name}.json"), element_filter=element_filter)
+    return api.parse_xml(read_file(f"xml/{name}.xml"), parser=parser, element_filter=element_filter)
+
+
+def is_bus_route(type_name, elem_id, tags):
+    return type_name == "relation" and elem_id == 2046898 and tags.get("route") == "bus"
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+class TestElementFilter:
+    def test_tag(self, parser):
+        result = parse(parser, "node-01", overpy.ElementFilter(key="highway"))
+        assert result.node_ids == [100793192]
+        assert result.get_node(100793192).tags == {"highway": "turning_circle"}
+
+        result = parse(parser, "area-01", overpy.ElementFilter(key="type", value="multipolygon"))
+        assert result.area_ids == [3605945175, 3605945176]
+        result = parse(parser, "area-01", overpy.ElementFilter(key="type", value={"boundary", "route"}))
+        assert result.area_ids == [3600055060]
+        result = parse(parser, "area-01", overpy.ElementFilter(key="name", value=re.compile("^Bonn")))
+        assert result.area_ids == []
+
+    def test_types(self, parser):
+        result = parse(parser, "way-03", overpy.ElementFilter(types=[overpy.Way]))
+        assert result.node_ids == []
+        way = result.get_way(225576797)
+        assert way.tags == {"building": "kiosk", "shop": "florist"}
+        assert way.attributes["version"] == 1
+        assert str(way.center_lat) == "41.8954998"
+        assert list(way.node_ids) == [2343425525, 2343425528, 2343425526, 2343425523, 2343425525]
+        with pytest.raises(overpy.exception.DataIncomplete):
+            way.get_nodes()
+
+        result = parse(parser, "relation-01", overpy.ElementFilter(types=["node", "way"]))
+        assert result.relation_ids == []
+
+    def test_keep(self, parser):
+        result = parse(parser, "way-03", overpy.ElementFilter(keep=0))
+        way = result.get_way(225576797)
+        assert way.tags is overpy._EMPTY_DICT
+        assert way.attributes is overpy._EMPTY_DICT
+        assert way.center_lat is None and way.center_lon is None
+        assert str(way.nodes[0].lat) == "41.8954752"
+        assert all(node.attributes == {} for node in result.nodes)
+
+        result = parse(parser, "way-03", overpy.ElementFilter(key="shop", keep=overpy.KEEP_CENTER))
+        way = result.get_way(225576797)
+        assert result.node_ids == []
+        assert way.tags == {}
+        assert str(way.center_lon) == "12.5032265"
+
+        result = parse(parser, "relation-01", overpy.ElementFilter(keep=overpy.KEEP_TAGS))
+        relation = result.get_relation(2046898)
+        assert relation.tags["ref"] == "609"
+        assert relation.attributes == {}
+        assert len(relation.members) == 5
+
+    def test_predicate(self, parser):
+        result = parse(parser, "relation-01", overpy.ElementFilter(predicate=is_bus_route))
+        assert result.relation_ids == [2046898]
+        result = parse(parser, "relation-01", overpy.ElementFilter(key="route", predicate=lambda *args: False))
+        assert result.relation_ids == []
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        overpy.ElementFilter(value="yes")
+    with pytest.raises(ValueError):
+        overpy.ElementFilter(types=["street"])
+
+
+def test_pickle():
+    element_filter = pickle.loads(pickle.dumps(overpy.ElementFilter(
+        key="highway", value=re.compile("ary$"), types=["way"], predicate=is_bus_route, keep=overpy.KEEP_TAGS
+    )))
+    assert element_filter.types == {"way"}
+    assert element_filter.keep == overpy.KEEP_TAGS
+    assert element_filter.accepts("way", 1, {"highway": "primary"}) is False
+    assert element_filter.accepts("node", 1, {"highway": "primary"}) is False
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_parallel(parser, monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_CHUNK_SIZE", 1)
+    api = overpy.Overpass(parse_workers=2)
+    element_filter = overpy.ElementFilter(types=["node"], keep=0)
+    if parser == "json":
+        result = api.parse_json(read_file("json/way-03.json"), element_filter=element_filter)
+    else:
+        result = api.parse_xml(read_file("xml/way-03.xml"), parser=parser, element_filter=element_filter)
+    assert result.way_ids == []
+    assert len(result.node_ids) == 4
+    assert all(node.attributes is overpy._EMPTY_DICT for node in result.nodes)
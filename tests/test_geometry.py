@@ -0,0 +1,212 @@
+from decimal import Decimal
+import math
+
+import pytest
+
+import overpy
+from overpy import geometry
+
+from tests import read_file
+
+
+def create_result(columnar_nodes=False):
+    result = overpy.Result(columnar_nodes=columnar_nodes)
+    coordinates = {1: ("0.0", "0.0"), 2: ("0.0", "0.01"), 3: ("0.01", "0.01"), 4: ("0.01", "0.0")}
+    for node_id, (lat, lon) in coordinates.items():
+        result.append(overpy.Node(node_id=node_id, lat=Decimal(lat), lon=Decimal(lon), result=result))
+    # Square
+    result.append(overpy.Way(way_id=10, node_ids=[1, 2, 3, 4, 1], result=result))
+    # Line
+    result.append(overpy.Way(way_id=11, node_ids=[1, 2, 3], result=result))
+    # Missing node
+    result.append(overpy.Way(way_id=12, node_ids=[1, 5], result=result))
+    # Without nodes
+    result.append(overpy.Way(way_id=13, node_ids=[], result=result))
+    return result
+
+
+class TestFunctions:
+    def test_ring(self):
+        square = [(0.0, 0.0), (0.0, 0.01), (0.01, 0.01), (0.01, 0.0), (0.0, 0.0)]
+        side = 2 * math.pi * geometry.EARTH_RADIUS / 360 * 0.01
+
+        assert geometry.length(square) == pytest.approx(4 * side, rel=1e-4)
+        assert geometry.bbox(square) == (0.0, 0.0, 0.01, 0.01)
+        assert geometry.planar_area(square) == pytest.approx(0.0001)
+        assert geometry.planar_area(square[::-1]) == pytest.approx(-0.0001)
+        assert geometry.area(square) == pytest.approx(side ** 2, rel=1e-4)
+        assert geometry.centroid(square) == pytest.approx((0.005, 0.005))
+        assert geometry.centroid(square[:3]) == pytest.approx((0.01 / 3, 0.02 / 3))
+
+        with pytest.raises(ValueError):
+            geometry.bbox([])
+        with pytest.raises(ValueError):
+            geometry.centroid([])
+
+    def test_points(self):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/way-02.json"))
+        way = result.get_way(317146077)
+        coordinates = geometry.points(way)
+        assert len(coordinates) == 7
+        assert coordinates[0] == (50.7495516, 7.1756125)
+        assert geometry.is_closed(way)
+
+        result = api.parse_json(read_file("json/relation-04.json"))
+        member = result.relations[0].members[2]
+        assert geometry.points(member) == [(50.8137408, 6.9813352), (50.8140146, 6.9808445)]
+        assert geometry.points(member.geometry) == geometry.points(member)
+        with pytest.raises(ValueError):
+            geometry.points(overpy.RelationWay(ref=1))
+
+
+class TestWayMetrics:
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_metrics(self, columnar_nodes, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+        result = create_result(columnar_nodes=columnar_nodes)
+        side = 2 * math.pi * geometry.EARTH_RADIUS / 360 * 0.01
+
+        metrics = geometry.way_metrics(result, use_numpy=use_numpy)
+        assert list(metrics.way_ids) == [10, 11, 12, 13]
+        assert list(metrics.closed) == [1, 0, 0, 0]
+        assert metrics.lengths[0] == pytest.approx(4 * side, rel=1e-4)
+        assert metrics.lengths[1] == pytest.approx(2 * side, rel=1e-4)
+        assert (metrics.south[0], metrics.west[0], metrics.north[0], metrics.east[0]) == (0.0, 0.0, 0.01, 0.01)
+        assert metrics.planar_areas[0] == pytest.approx(0.0001)
+        assert metrics.planar_areas[1] == 0.0
+        assert metrics.areas[0] == pytest.approx(side ** 2, rel=1e-4)
+        assert metrics.areas[1] == 0.0
+        assert metrics.centroid_lats[0] == pytest.approx(0.005)
+        assert metrics.centroid_lons[0] == pytest.approx(0.005)
+        assert metrics.centroid_lats[1] == pytest.approx(0.01 / 3)
+
+        for i in (2, 3):
+            assert math.isnan(metrics.lengths[i])
+            assert math.isnan(metrics.areas[i])
+            assert math.isnan(metrics.centroid_lats[i])
+
+    def test_numpy_equals_python(self):
+        pytest.importorskip("numpy")
+        api = overpy.Overpass()
+        result = api.parse_xml(read_file("xml/way-03.xml"))
+        expected = geometry.way_metrics(result, use_numpy=False)
+        metrics = geometry.way_metrics(result, use_numpy=True)
+        for name in expected._fields:
+            assert list(getattr(metrics, name)) == pytest.approx(list(getattr(expected, name)))
+
+
+def create_multipolygon_result(with_geometry):
+    # Outer square split into two lines, the second one reversed, a hole in it and a second square without hole
+    lines = {
+        20: [(0.0, 0.0), (0.0, 1.0), (1.0, 1.0)],
+        21: [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0)],
+        22: [(0.25, 0.25), (0.75, 0.25), (0.75, 0.75), (0.25, 0.75), (0.25, 0.25)],
+        23: [(2.0, 2.0), (2.0, 3.0), (3.0, 3.0), (3.0, 2.0), (2.0, 2.0)],
+        # Not closed
+        24: [(5.0, 5.0), (5.0, 6.0)],
+    }
+    roles = {20: "outer", 21: "outer", 22: "inner", 23: "outer", 24: "outer"}
+    result = overpy.Result()
+    node_ids = {}
+    for way_id, coordinates in lines.items():
+        way_node_ids = []
+        for lat, lon in coordinates:
+            if (lat, lon) not in node_ids:
+                node_ids[(lat, lon)] = len(node_ids) + 1
+                result.append(overpy.Node(
+                    node_id=node_ids[(lat, lon)], lat=Decimal(str(lat)), lon=Decimal(str(lon)), result=result
+                ))
+            way_node_ids.append(node_ids[(lat, lon)])
+        if not with_geometry:
+            result.append(overpy.Way(way_id=way_id, node_ids=way_node_ids, result=result))
+
+    members = []
+    for way_id, coordinates in lines.items():
+        geometry_values = None
+        if with_geometry:
+            geometry_values = [overpy.RelationWayGeometryValue(lat=lat, lon=lon) for lat, lon in coordinates]
+        members.append(overpy.RelationWay(ref=way_id, role=roles[way_id], geometry=geometry_values, result=result))
+    result.append(overpy.Relation(rel_id=1, members=members, tags={"type": "multipolygon"}, result=result))
+    result.append(overpy.Relation(rel_id=2, members=[], tags={"type": "route"}, result=result))
+    return result
+
+
+class TestMultipolygon:
+    def test_build_rings(self):
+        rings, unclosed = geometry.build_rings([
+            [(0.0, 0.0), (0.0, 1.0)],
+            [(1.0, 1.0), (0.0, 1.0)],
+            [(1.0, 1.0), (1.0, 0.0), (0.0, 0.0)],
+            [(5.0, 5.0), (6.0, 6.0)],
+        ])
+        assert rings == [[(0.0, 0.0), (0.0, 1.0), (1.0, 1.0), (1.0, 0.0), (0.0, 0.0)]]
+        assert unclosed == [[(5.0, 5.0), (6.0, 6.0)]]
+
+    @pytest.mark.parametrize("with_geometry", [False, True])
+    def test_to_multipolygon(self, with_geometry):
+        result = create_multipolygon_result(with_geometry)
+        polygons = result.get_relation(1).to_multipolygon()
+        assert len(polygons) == 2
+
+        outer, inners = polygons[0]
+        assert sorted(outer) == sorted([(0.0, 0.0), (0.0, 1.0), (1.0, 1.0), (1.0, 0.0), (0.0, 0.0)])
+        assert geometry.planar_area(outer) > 0
+        assert len(inners) == 1
+        assert geometry.planar_area(inners[0]) < 0
+        assert geometry.bbox(inners[0]) == (0.25, 0.25, 0.75, 0.75)
+
+        outer, inners = polygons[1]
+        assert geometry.bbox(outer) == (2.0, 2.0, 3.0, 3.0)
+        assert inners == []
+
+        assert result.assemble_multipolygons() == {1: polygons}
+
+    def test_incomplete(self):
+        result = create_multipolygon_result(with_geometry=False)
+        del result._ways[20]
+        with pytest.raises(overpy.exception.DataIncomplete):
+            result.get_relation(1).to_multipolygon()
+        assert result.assemble_multipolygons() == {}
+
+    def test_nested_outers(self):
+        def square(south, west, size):
+            return [
+                overpy.RelationWayGeometryValue(lat=lat, lon=lon)
+                for lat, lon in ((south, west), (south, west + size), (south + size, west + size),
+                                 (south + size, west), (south, west))
+            ]
+
+        result = overpy.Result()
+        members = [
+            # Large outer ring with an island in a hole, the inner ring of the island belongs to the island
+            overpy.RelationWay(ref=1, role="outer", geometry=square(0.0, 0.0, 10.0), result=result),
+            overpy.RelationWay(ref=2, role="inner", geometry=square(1.0, 1.0, 5.0), result=result),
+            overpy.RelationWay(ref=3, role="outer", geometry=square(2.0, 2.0, 3.0), result=result),
+            overpy.RelationWay(ref=4, role="inner", geometry=square(3.0, 3.0, 1.0), result=result),
+            overpy.RelationWay(ref=5, role="inner", geometry=square(7.0, 7.0, 1.0), result=result),
+            # Without an outer ring
+            overpy.RelationWay(ref=6, role="inner", geometry=square(20.0, 20.0, 1.0), result=result),
+        ]
+        # Many small outer rings with one hole each
+        for i in range(50):
+            members.append(overpy.RelationWay(
+                ref=100 + i, role="outer", geometry=square(-5.0, i * 2.0, 1.0), result=result
+            ))
+            members.append(overpy.RelationWay(
+                ref=200 + i, role="inner", geometry=square(-4.75, i * 2.0 + 0.25, 0.5), result=result
+            ))
+        result.append(overpy.Relation(rel_id=1, members=members, tags={"type": "multipolygon"}, result=result))
+        # Relations without tags are skipped
+        result.append(overpy.Relation(rel_id=2, members=members, tags=None, result=result))
+
+        polygons = result.assemble_multipolygons()
+        assert list(polygons) == [1]
+        polygons = polygons[1]
+        assert len(polygons) == 52
+        assert [geometry.bbox(ring) for ring in polygons[0][1]] == [(1.0, 1.0, 6.0, 6.0), (7.0, 7.0, 8.0, 8.0)]
+        assert [geometry.bbox(ring) for ring in polygons[1][1]] == [(3.0, 3.0, 4.0, 4.0)]
+        for i, (outer, inners) in enumerate(polygons[2:]):
+            assert [geometry.bbox(ring) for ring in inners] == [(-4.75, i * 2.0 + 0.25, -4.25, i * 2.0 + 0.75)]
@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+import pytest
+
+import overpy
+from overpy.geometry import haversine
+
+
+def create_result(columnar_nodes=False):
+    #     4
+    #     |
+    # 1 - 2 - 3 - 6
+    #     |  /
+    #     5
+    result = overpy.Result(columnar_nodes=columnar_nodes)
+    coordinates = {
+        1: ("0.0", "0.0"), 2: ("0.0", "0.001"), 3: ("0.0", "0.002"),
+        4: ("0.001", "0.001"), 5: ("-0.001", "0.001"), 6: ("0.0", "0.003"),
+    }
+    for node_id, (lat, lon) in coordinates.items():
+        result.append(overpy.Node(node_id=node_id, lat=Decimal(lat), lon=Decimal(lon), result=result))
+    result.append(overpy.Way(way_id=10, node_ids=[1, 2, 3], tags={"highway": "residential"}, result=result))
+    result.append(overpy.Way(
+        way_id=11, node_ids=[4, 2, 5], tags={"highway": "residential", "oneway": "yes"}, result=result
+    ))
+    result.append(overpy.Way(way_id=12, node_ids=[3, 6], tags={"building": "yes"}, result=result))
+    result.append(overpy.Way(
+        way_id=13, node_ids=[5, 3], tags={"highway": "residential", "oneway": "-1"}, result=result
+    ))
+    # Missing node
+    result.append(overpy.Way(way_id=14, node_ids=[1, 7], tags={"highway": "residential"}, result=result))
+    return result
+
+
+class TestGraph:
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_build(self, columnar_nodes):
+        graph = create_result(columnar_nodes=columnar_nodes).to_graph()
+        assert list(graph.node_ids) == [1, 2, 3, 4, 5]
+        assert len(graph) == 5
+        assert graph.edge_count == 7
+        assert graph.targets.typecode == "i"
+
+        edges = {
+            (graph.node_ids[vertex], graph.node_ids[target]): (length, way_id)
+            for vertex in range(len(graph))
+            for target, length, way_id in graph.edges(vertex)
+        }
+        assert sorted(edges) == [(1, 2), (2, 1), (2, 3), (2, 5), (3, 2), (3, 5), (4, 2)]
+        assert edges[(1, 2)] == (pytest.approx(haversine(0.0, 0.0, 0.0, 0.001)), 10)
+        assert edges[(3, 5)][1] == 13
+
+        distance, path = graph.shortest_path(1, 5)
+        assert path == [1, 2, 5]
+        assert distance == pytest.approx(haversine(0.0, 0.0, 0.0, 0.001) + haversine(0.0, 0.001, -0.001, 0.001))
+        assert graph.shortest_path(5, 1) is None
+        assert graph.shortest_path(1, 1) == (0.0, [1])
+        with pytest.raises(KeyError):
+            graph.shortest_path(1, 6)
+
+    def test_options(self):
+        result = create_result()
+        graph = result.to_graph(oneway=False)
+        assert graph.edge_count == 10
+        assert graph.shortest_path(5, 1)[1] == [5, 2, 1]
+
+        graph = result.to_graph(key=None)
+        assert list(graph.node_ids) == [1, 2, 3, 4, 5, 6]
+        assert graph.shortest_path(6, 1)[1] == [6, 3, 2, 1]
+
+    def test_split(self):
+        # Intermediate nodes not shared with other ways are no vertices
+        result = create_result()
+        way = result.get_way(10)
+        way._node_ids.insert(1, 6)
+        graph = result.to_graph()
+        assert 6 not in graph.node_ids
+        length = haversine(0.0, 0.0, 0.0, 0.003) + haversine(0.0, 0.003, 0.0, 0.001)
+        assert list(graph.edges(graph.index(1))) == [(graph.index(2), pytest.approx(length), 10)]
+
+    def test_without_tags(self):
+        result = create_result()
+        result.append(overpy.Way(way_id=15, node_ids=[6, 1], tags=None, result=result))
+        assert result.get_way(15).tags is None
+        assert 6 not in result.to_graph().node_ids
+        graph = result.to_graph(key=None)
+        assert graph.shortest_path(6, 1)[1] == [6, 1]
+        assert graph.shortest_path(1, 6)[1] == [1, 6]
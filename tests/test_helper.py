@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+import overpy
+from overpy import helper
+
+
+def create_result():
+    # A - B - A
+    #     |
+    #     C
+    result = overpy.Result()
+    for node_id in range(1, 7):
+        result.append(overpy.Node(node_id=node_id, lat=Decimal(node_id), lon=Decimal(0), result=result))
+    ways = [
+        (10, [1, 2], {"highway": "residential", "name": "A Street"}),
+        (11, [2, 3, 4], {"highway": "residential", "name": "B Street"}),
+        (12, [3, 5], {"highway": "residential", "name": "C Street"}),
+        (13, [2, 6], {"highway": "residential", "name": "A Street"}),
+        # Not a street
+        (14, [1, 5], {"building": "yes", "name": "D"}),
+        # Shares node 4 with B Street but has no name
+        (15, [4, 6], {"highway": "residential"}),
+    ]
+    for way_id, node_ids, tags in ways:
+        result.append(overpy.Way(way_id=way_id, node_ids=node_ids, tags=tags, result=result))
+    return result
+
+
+class QueryAPI(overpy.Overpass):
+    def __init__(self, result):
+        super().__init__()
+        self.queries = []
+        self.result = result
+
+    def query(self, query):
+        self.queries.append(query)
+        return self.result
+
+
+class TestStreets:
+    def test_get_streets(self):
+        api = QueryAPI(create_result())
+        streets = helper.get_streets(["A Street", "C Street", 'Say "Hi" Street', "A Street"], "3600062422",
+                                     api=api, batch_size=2)
+        assert list(streets) == ["A Street", "C Street", 'Say "Hi" Street']
+        assert len(api.queries) == 2
+        assert all("area(3600062422)->.location;" in query for query in api.queries)
+        assert any('way[highway][name="Say \\"Hi\\" Street"](area.location);' in query for query in api.queries)
+
+        assert streets["A Street"].way_ids == [10, 13]
+        assert streets["A Street"].node_ids == [1, 2, 6]
+        assert streets["C Street"].way_ids == [12]
+        assert streets["C Street"].node_ids == [3, 5]
+        assert streets['Say "Hi" Street'].way_ids == []
+
+
+class TestIntersections:
+    def test_find(self):
+        intersections = helper.find_intersections(create_result())
+        assert {key: [node.id for node in nodes] for key, nodes in intersections.items()} == {
+            ("A Street", "B Street"): [2],
+            ("B Street", "C Street"): [3],
+        }
+
+    def test_get(self):
+        api = QueryAPI(create_result())
+        intersections = helper.get_intersections("3600062422", api=api)
+        assert sorted(intersections) == [("A Street", "B Street"), ("B Street", "C Street")]
+        assert len(api.queries) == 1
+        assert "area(3600062422)->.location;" in api.queries[0]
@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+import pytest
+
+import overpy
+from overpy import parallel
+
+from tests import normalized, read_file
+from tests.base_class import BaseTestNodes, BaseTestRelation
+from tests.test_serializer import FIXTURES
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_CHUNK_SIZE", 1)
+
+
+class TestParallel(BaseTestNodes, BaseTestRelation):
+    @pytest.mark.parametrize("name", FIXTURES)
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_json(self, name, columnar_nodes, small_chunks):
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        data = read_file(f"json/{name}.json")
+        result = api.parse_json(data, workers=2)
+        assert normalized(result) == normalized(api.parse_json(data))
+        assert result.api is api
+
+    @pytest.mark.parametrize("name", FIXTURES)
+    @pytest.mark.parametrize("parser", [overpy.XML_PARSER_DOM, overpy.XML_PARSER_SAX])
+    def test_xml(self, name, parser, small_chunks):
+        api = overpy.Overpass()
+        data = read_file(f"xml/{name}.xml")
+        result = api.parse_xml(data, parser=parser, workers=2)
+        assert normalized(result) == normalized(api.parse_xml(data, parser=parser))
+
+    def test_api_setting(self, small_chunks):
+        api = overpy.Overpass(parse_workers=3)
+        self._test_node01(api.parse_json(read_file("json/node-01.json")))
+        self._test_relation01(api.parse_xml(read_file("xml/relation-01.xml")))
+
+    def test_remark(self, small_chunks):
+        api = overpy.Overpass(parse_workers=2)
+        with pytest.raises(overpy.exception.OverpassRuntimeError):
+            api.parse_json(read_file("json/remark-runtime-error-01.json"))
+        with pytest.raises(overpy.exception.OverpassRuntimeError):
+            api.parse_xml(read_file("xml/remark-runtime-error-01.xml"))
+
+    def test_fallback(self, small_chunks):
+        api = overpy.Overpass()
+        assert parallel.parse_json(api, '{"version": 0.6}', 2) is None
+        assert parallel.parse_xml(api, "<osm></osm>", 2, overpy.XML_PARSER_SAX) is None
+        assert api.parse_json('{"version": 0.6}', workers=2).nodes == []
+
+
+def test_split_json():
+    data = (
+        '{"elements": [{"type": "node", "id": 1, "tags": {"a": "]"}}, '
+        '{"type": "relation", "id": 2, "members": [{"type": "node", "ref": 1}, {"type": "node", "ref": 3}]}, '
+        '{"type": "node", "id": 3}], "remark": "x"}'
+    )
+    response, chunks = parallel.split_json(data, 10)
+    assert response == {"elements": [], "remark": "x"}
+    assert len(chunks) == 3
+    assert all(chunk.startswith('{"type"') for chunk in chunks)
+    assert "".join(chunks) == data[data.index("[") + 1:data.rindex("]")]
+
+    # The split position of the second chunk is in the relation, the next element starts the second chunk
+    response, chunks = parallel.split_json(data, 3)
+    assert [chunk[:26] for chunk in chunks] == ['{"type": "node", "id": 1, ', '{"type": "node", "id": 3}']
+    assert parallel.split_json('{"version": 0.6}', 2) is None
+
+
+def test_split_xml():
+    data = '<osm><meta/><node id="1"/><nodes/><way id="2"><nd ref="1"/></way><relation id="3"></relation></osm>'
+    chunks = parallel.split_xml(data, 10)
+    assert chunks == ['<node id="1"/><nodes/>', '<way id="2"><nd ref="1"/></way>', '<relation id="3"></relation>']
+    assert parallel.split_xml("<osm></osm>", 2) is None
+
+
+def test_chunk_count():
+    assert parallel.chunk_count("x" * 10, 4, min_chunk_size=3) == 3
+    assert parallel.chunk_count("x" * 10, 2, min_chunk_size=3) == 2
+    assert parallel.chunk_count("x", 4, min_chunk_size=3) == 1
+
+
+def test_merge():
+    results = []
+    for lat in ("1", "2"):
+        result = overpy.Result()
+        result.append(overpy.Node(node_id=1, lat=Decimal(lat), lon=Decimal("0"), result=result))
+        result.append(overpy.Node(node_id=int(lat) + 1, lat=Decimal(lat), lon=Decimal("0"), result=result))
+        result.append(overpy.Relation(
+            rel_id=1, members=[overpy.RelationNode(ref=1, role="", result=result)], tags={"lat": lat}, result=result
+        ))
+        results.append(result)
+    api = overpy.Overpass()
+    merged = parallel.merge(results, api=api)
+    assert merged.api is api
+    assert merged.node_ids == [1, 2, 3]
+    assert merged.get_node(1).lat == Decimal("1")
+    assert merged.get_node(3)._result is merged
+    assert merged.get_relation(1).tags == {"lat": "1"}
+    assert merged.get_relation(1).members[0].resolve() is merged.get_node(1)
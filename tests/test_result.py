@@ -1,11 +1,15 @@
+from datetime import datetime
+from decimal import Decimal
 from http.server import BaseHTTPRequestHandler
+import json
+import pickle
 
 import pytest
 
 import overpy
 
 from tests import read_file, new_server_thread, stop_server_thread
-from tests.base_class import BaseTestWay
+from tests.base_class import BaseTestNodes, BaseTestWay
 
 
 class HandleResponseJSON02(BaseHTTPRequestHandler):
@@ -47,6 +51,115 @@ class TestResult:
         assert len(result1.nodes) == 3
         assert len(result1.ways) == 2
 
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_expand_merge(self, columnar_nodes):
+        def create_result(versions, name):
+            result = overpy.Result(columnar_nodes=columnar_nodes)
+            for node_id, version in versions.items():
+                attributes = {} if version is None else {"version": version}
+                result.append(overpy.Node(
+                    node_id=node_id, lat=Decimal("50.0"), lon=Decimal("7.0"), tags={"name": name},
+                    attributes=attributes, result=result
+                ))
+            return result
+
+        def names(result):
+            return {node.id: node.tags["name"] for node in result.nodes}
+
+        with pytest.raises(ValueError):
+            create_result({}, "old").expand(create_result({}, "new"), merge=4)
+
+        old = {1: 2, 2: 2, 3: None, 4: 1}
+        new = {1: 3, 2: 1, 3: 1, 4: None, 5: 1}
+
+        result = create_result(old, "old")
+        result.expand(create_result(new, "new"))
+        assert names(result) == {1: "old", 2: "old", 3: "old", 4: "old", 5: "new"}
+
+        result = create_result(old, "old")
+        result.expand(create_result(new, "new"), merge=overpy.MERGE_NEWEST_VERSION)
+        assert names(result) == {1: "new", 2: "old", 3: "new", 4: "old", 5: "new"}
+
+        result = create_result(old, "old")
+        # Indexes are updated or rebuilt
+        assert [node.id for node in result.find("name", "old")] == [1, 2, 3, 4]
+        result.expand(create_result(new, "new"), merge=overpy.MERGE_REPLACE)
+        assert names(result) == {1: "new", 2: "new", 3: "new", 4: "new", 5: "new"}
+        assert result.find("name", "old") == []
+        assert [node.id for node in result.find("name", "new")] == [1, 2, 3, 4, 5]
+
+        result = create_result(old, "old")
+        assert [node.id for node in result.find("name", "old")] == [1, 2, 3, 4]
+        result.expand(create_result(new, "new"))
+        assert [node.id for node in result.find("name", "new")] == [5]
+
+
+class TestSetAlgebra:
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_operators(self, columnar_nodes):
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        result1 = api.parse_json(read_file("json/result-expand-01.json"))
+        result2 = api.parse_json(read_file("json/result-expand-02.json"))
+
+        union = result1 | result2
+        assert union.node_ids == [3233854233, 3233854234, 3233854235]
+        assert union.way_ids == [317146077, 317146078]
+        assert union.relation_ids == [2046898]
+        assert union.area_ids == [3605945176]
+        assert len(result1.nodes) == 2
+
+        intersection = result1 & result2
+        assert intersection.node_ids == [3233854233]
+        assert intersection.way_ids == []
+
+        difference = result2 - result1
+        assert difference.node_ids == [3233854235]
+        assert difference.way_ids == [317146078]
+        assert difference.relation_ids == [2046898]
+
+        with pytest.raises(TypeError):
+            result1 | 1
+
+    def test_diff(self):
+        def create_result(nodes):
+            result = overpy.Result()
+            for node_id, (lat, version, tags) in nodes.items():
+                attributes = {} if version is None else {"version": version}
+                result.append(overpy.Node(
+                    node_id=node_id, lat=Decimal(lat), lon=Decimal("7.0"), tags=tags, attributes=attributes,
+                    result=result
+                ))
+            return result
+
+        old = create_result({
+            1: ("50.0", 1, {}),
+            2: ("50.0", 1, {}),
+            3: ("50.0", None, {"name": "a"}),
+            4: ("50.0", None, {}),
+            5: ("50.0", None, {}),
+            6: ("50.0", None, {}),
+        })
+        new = create_result({
+            # Version changed
+            2: ("50.0", 2, {}),
+            # Tags changed
+            3: ("50.0", None, {"name": "b"}),
+            # Geometry changed
+            4: ("50.1", None, {}),
+            5: ("50.0", None, {}),
+            6: ("50.0", 1, {}),
+            7: ("50.0", None, {}),
+        })
+        diff = old.diff(new)
+        assert diff.added.node_ids == [7]
+        assert diff.removed.node_ids == [1]
+        assert diff.modified.node_ids == [2, 3, 4]
+        assert diff.modified.get_node(2) is new.get_node(2)
+        assert old.diff(old).modified.node_ids == []
+
+        with pytest.raises(ValueError):
+            old.diff(123)
+
 
 class TestArea:
     def test_missing_unresolvable(self):
@@ -128,6 +241,63 @@ class TestPickle(BaseTestWay):
         # test new result
         self._test_way02(new_result)
 
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    @pytest.mark.parametrize("name", ["area-01", "node-01", "relation-01", "relation-03", "relation-04", "way-03"])
+    def test_round_trip(self, name, columnar_nodes):
+        import pickle
+
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        result = api.parse_json(read_file(f"json/{name}.json"))
+        new_result = pickle.loads(pickle.dumps(result))
+        assert new_result.to_json() == result.to_json()
+        assert isinstance(new_result._nodes, overpy.NodeStore) == columnar_nodes
+        assert new_result.api.columnar_nodes == columnar_nodes
+        for elem_cls in (overpy.Node, overpy.Way, overpy.Relation, overpy.Area):
+            for element in new_result.get_elements(elem_cls):
+                assert element._result is new_result
+        for relation in new_result.relations:
+            for member in relation.members:
+                assert member._result is new_result
+
+    def test_state(self):
+        import pickle
+
+        result = overpy.Result()
+        result.append(overpy.Node(
+            node_id=1, lat=Decimal("50.7460370"), lon=1.5, attributes={"timestamp": "2020-01-02T03:04:05Z"},
+            result=result
+        ))
+        result.append(overpy.Way(way_id=2, node_ids=None, tags=None, result=result))
+        result.append(overpy.Way(way_id=3, node_ids=[1, 1], center_lat=Decimal("1.5"), result=result))
+        assert result.ways_for_node(1)[0].id == 3
+
+        new_result = pickle.loads(pickle.dumps(result))
+        node = new_result.get_node(1)
+        assert str(node.lat) == "50.7460370"
+        assert node.lon == 1.5
+        assert node.attributes._pending == {"timestamp"}
+        assert node.attributes["timestamp"] == datetime(2020, 1, 2, 3, 4, 5)
+        assert new_result.get_way(2)._node_ids is None
+        assert new_result.get_way(2).tags is None
+        assert list(new_result.get_way(3)._node_ids) == [1, 1]
+        assert new_result.get_way(3).center_lat == Decimal("1.5")
+        assert new_result.ways_for_node(1)[0].id == 3
+
+    def test_element(self):
+        import pickle
+
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/relation-04.json"))
+        relation = result.relations[0]
+        data = pickle.dumps(relation)
+        assert len(data) < len(pickle.dumps(result))
+
+        new_relation = pickle.loads(data)
+        assert new_relation._result is None
+        assert new_relation.to_json() == relation.to_json()
+        assert new_relation.members[0]._result is None
+        assert new_relation.members[2].geometry[0].lat == relation.members[2].geometry[0].lat
+
 
 class TestRelation:
     def test_missing_unresolvable(self):
@@ -191,3 +361,280 @@ class TestWay:
         assert way.id == 317146078
 
         stop_server_thread(server)
+
+
+class TestLean(BaseTestWay):
+    def test_way02(self):
+        api = overpy.Overpass(lean=True)
+        result = api.parse_json(read_file("json/way-02.json"))
+        self._test_way02(result)
+
+        node = result.get_node(3233854233)
+        assert not hasattr(node, "__dict__")
+        assert node.tags == {}
+        assert node.attributes == {}
+        # Empty containers are shared and read-only
+        assert node.tags is result.get_node(3233854234).tags
+        with pytest.raises(TypeError):
+            node.tags["name"] = "test"
+        node.tags = {"name": "test"}
+        assert node.tags["name"] == "test"
+
+    def test_pickle(self):
+        import pickle
+
+        api = overpy.Overpass(lean=True)
+        result = api.parse_json(read_file("json/way-02.json"))
+        new_result = pickle.loads(pickle.dumps(result))
+        self._test_way02(new_result)
+        assert new_result.get_node(3233854233).tags is overpy._EMPTY_DICT
+
+    def test_default(self):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/way-02.json"))
+        node = result.get_node(3233854233)
+        node.tags["name"] = "test"
+        assert result.get_node(3233854234).tags == {}
+
+
+SHARED_TAGS_DATA = """{"elements": [
+    {"type": "node", "id": 1, "lat": 1.0, "lon": 2.0, "tags": {"amenity": "bench", "backrest": "yes"}},
+    {"type": "node", "id": 2, "lat": 1.0, "lon": 2.0, "tags": {"amenity": "bench", "backrest": "yes"}},
+    {"type": "way", "id": 3, "nodes": [1, 2], "tags": {"barrier": "fence", "backrest": "yes"}}
+]}"""
+
+
+def parse_shared_tags(api, fmt):
+    from io import StringIO
+
+    if fmt == "json":
+        return api.parse_json(SHARED_TAGS_DATA)
+    result = overpy.Result.from_json(json.loads(SHARED_TAGS_DATA))
+    fp = StringIO()
+    if fmt == "ndjson":
+        result.dump_ndjson(fp)
+        return overpy.Result.from_ndjson(StringIO(fp.getvalue()), api=api)
+    result.dump_xml(fp)
+    return api.parse_xml(fp.getvalue(), parser=fmt)
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", overpy.XML_PARSER_DOM, overpy.XML_PARSER_SAX])
+class TestTagPool:
+    def test_intern(self, fmt):
+        result = parse_shared_tags(overpy.Overpass(intern_tags=True), fmt)
+        tags = [result.get_node(1).tags, result.get_node(2).tags, result.get_way(3).tags]
+        assert tags[0] is not tags[1]
+        assert tags[0]["backrest"] is tags[1]["backrest"] is tags[2]["backrest"]
+        assert [key for key in tags[0]][1] is [key for key in tags[2]][1]
+        tags[0]["name"] = "test"
+        assert result._tag_pool is None
+
+    def test_share(self, fmt):
+        result = parse_shared_tags(overpy.Overpass(share_tags=True), fmt)
+        node = result.get_node(1)
+        assert node.tags is result.get_node(2).tags
+        assert node.tags == {"amenity": "bench", "backrest": "yes"}
+        assert node.tags["backrest"] is result.get_way(3).tags["backrest"]
+        new_result = pickle.loads(pickle.dumps(result))
+        assert new_result.get_node(1).tags is new_result.get_node(2).tags
+        assert new_result.get_node(1).tags == {"amenity": "bench", "backrest": "yes"}
+
+        with pytest.raises(TypeError):
+            node.tags["name"] = "test"
+        node.tags = {"name": "test"}
+        assert result.get_node(2).tags["amenity"] == "bench"
+
+    def test_disabled(self, fmt):
+        result = parse_shared_tags(overpy.Overpass(), fmt)
+        assert result.get_node(1).tags == result.get_node(2).tags
+        if fmt == overpy.XML_PARSER_SAX:
+            assert result.get_node(1).tags["backrest"] is not result.get_node(2).tags["backrest"]
+
+
+class TestColumnarNodes(BaseTestNodes, BaseTestWay):
+    def test_node01(self):
+        api = overpy.Overpass(columnar_nodes=True)
+        for result in (api.parse_json(read_file("json/node-01.json")), api.parse_xml(read_file("xml/node-01.xml"))):
+            assert isinstance(result._nodes, overpy.NodeStore)
+            self._test_node01(result)
+
+    def test_way02(self):
+        api = overpy.Overpass(columnar_nodes=True)
+        result = api.parse_json(read_file("json/way-02.json"))
+        self._test_way02(result)
+
+    def test_way03(self):
+        api = overpy.Overpass(columnar_nodes=True)
+        result = api.parse_xml(read_file("xml/way-03.xml"))
+        self._test_way03(result)
+
+    def test_columns(self):
+        for columnar_nodes in (False, True):
+            api = overpy.Overpass(columnar_nodes=columnar_nodes)
+            result = api.parse_json(read_file("json/node-01.json"))
+            ids, lats, lons = result.node_columns()
+            assert list(ids) == [50878400, 100793192, 3233854234]
+            assert lats[0] == pytest.approx(50.7461788)
+            assert lons[2] == pytest.approx(7.1757664)
+
+    def test_unsorted(self):
+        result = overpy.Result(columnar_nodes=True)
+        for node_id in (5, 3, 9):
+            result.append(overpy.Node(node_id=node_id, lat=Decimal("1.5"), lon=None, result=result))
+        assert result.node_ids == [5, 3, 9]
+        assert result.get_node(3).lat == Decimal("1.5")
+        assert result.get_node(9).lon is None
+        with pytest.raises(overpy.exception.DataIncomplete):
+            result.get_node(4)
+
+        del result._nodes[3]
+        assert result.node_ids == [5, 9]
+        assert result.get_node(9).id == 9
+
+    def test_expand(self):
+        api = overpy.Overpass(columnar_nodes=True)
+        result1 = api.parse_json(read_file("json/result-expand-01.json"))
+        result2 = api.parse_json(read_file("json/result-expand-02.json"))
+        result1.expand(result2)
+        assert len(result1.nodes) == 3
+        assert len(result1.ways) == 2
+
+    def test_columns_numpy(self):
+        numpy = pytest.importorskip("numpy")
+        api = overpy.Overpass(columnar_nodes=True)
+        result = api.parse_json(read_file("json/node-01.json"))
+        ids, lats, lons = result.node_columns(use_numpy=True)
+        assert isinstance(ids, numpy.ndarray)
+        assert ids.tolist() == [50878400, 100793192, 3233854234]
+        # Shares the memory with the store
+        assert numpy.shares_memory(lats, numpy.frombuffer(result._nodes.lats))
+
+
+class TestViews:
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_views(self, columnar_nodes):
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        result = api.parse_json(read_file("json/result-expand-01.json"))
+        nodes = result.nodes
+        node_ids = result.node_ids
+
+        assert len(nodes) == 2
+        assert [n.id for n in nodes] == [n.id for n in result.get_nodes()]
+        assert list(node_ids) == result.get_node_ids()
+        assert nodes[-1].id == node_ids[-1] == node_ids[1]
+        assert [n.id for n in nodes[0:1]] == node_ids[0:1]
+        with pytest.raises(IndexError):
+            nodes[2]
+
+        assert node_ids[0] in node_ids
+        assert node_ids[0] in nodes
+        assert nodes[0] in nodes
+        assert 123 not in nodes
+        assert nodes.get(node_ids[0]).id == node_ids[0]
+        assert nodes.get(123) is None
+
+        # Views are live
+        result.expand(api.parse_json(read_file("json/result-expand-02.json")))
+        assert len(nodes) == 3
+        assert len(node_ids) == 3
+        assert len(result.ways) == 2
+
+    def test_positions(self):
+        result = overpy.Result()
+        for way_id in (5, 3, 9):
+            result.append(overpy.Way(way_id=way_id, node_ids=[], result=result))
+        ways = result.ways
+        assert [ways[i].id for i in range(len(ways))] == [5, 3, 9]
+        assert result.way_ids[-1] == 9
+        assert result._positions[overpy.Way] == [5, 3, 9]
+
+        # Added elements are appended, replaced elements keep their position
+        other = overpy.Result()
+        for way_id in (3, 1):
+            other.append(overpy.Way(way_id=way_id, node_ids=[], tags={"new": "yes"}, result=other))
+        result.expand(other, merge=overpy.MERGE_REPLACE)
+        assert ways[1].tags == {"new": "yes"}
+        assert [way.id for way in ways[-2:]] == [9, 1]
+        assert result.way_ids[::2] == [5, 9]
+        with pytest.raises(IndexError):
+            ways[4]
+        with pytest.raises(IndexError):
+            result.way_ids[-5]
+
+        view = overpy.ElementView({1: "a", 2: "b"})
+        assert view[1] == "b"
+        assert view[:1] == ["a"]
+
+    def test_get_single(self):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/result-expand-01.json"))
+        way = result.ways[0]
+        assert result.get_way(way.id) is way
+        assert result.get_ways(way_id=way.id) == [way]
+        assert result.get_ways(way_id=123) == []
+
+
+class TestReverseIndex:
+    def test_ways_for_node(self):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/result-expand-01.json"))
+
+        assert [way.id for way in result.ways_for_node(3233854233)] == [317146077]
+        assert result.ways_for_node(123) == []
+
+        # The index is updated if elements are added
+        result.expand(api.parse_json(read_file("json/result-expand-02.json")))
+        node = result.get_node(3233854233)
+        assert [way.id for way in result.ways_for_node(node)] == [317146077, 317146078]
+        assert [way.id for way in result.ways_for_node(3233854235)] == [317146078]
+
+        result.append(overpy.Way(way_id=1, node_ids=[3233854235, 3233854235], result=result))
+        assert [way.id for way in result.ways_for_node(3233854235)] == [317146078, 1]
+
+    def test_parent_relations(self):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/relation-02.json"))
+
+        way = result.get_way(317146078)
+        assert [rel.id for rel in result.parent_relations(way)] == [2046898]
+        assert [rel.id for rel in result.parent_relations(result.get_node(3233854234))] == [2046898]
+        relation = result.get_relation(2046898)
+        assert result.parent_relations(relation) == []
+        assert result.parent_relations(relation.members[3]) == [relation]
+
+        result.append(
+            overpy.Relation(
+                rel_id=1,
+                members=[overpy.RelationRelation(ref=2046898, role="", result=result)],
+                result=result
+            )
+        )
+        assert [rel.id for rel in result.parent_relations(relation)] == [1]
+
+
+class TestFind:
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_find(self, columnar_nodes):
+        import re
+
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        result = api.parse_json(read_file("json/node-01.json"))
+
+        def ids(elements):
+            return [e.id for e in elements]
+
+        assert ids(result.find("highway")) == [100793192]
+        assert ids(result.find("highway", "turning_circle")) == [100793192]
+        assert ids(result.find("highway", "bus_stop")) == []
+        assert ids(result.find("highway", {"bus_stop", "turning_circle"})) == [100793192]
+        assert ids(result.find("highway", re.compile("^turn"))) == [100793192]
+        assert ids(result.find("highway", types=["way", overpy.Relation])) == []
+        assert ids(result.find("name")) == []
+
+        with pytest.raises(ValueError):
+            result.find("highway", types=["foo"])
+
+        # The index is updated if elements are added
+        result.append(overpy.Way(way_id=1, tags={"highway": "residential"}, result=result))
+        assert ids(result.find("highway")) == [100793192, 1]
+        assert ids(result.find("highway", types=["way"])) == [1]
@@ -1,4 +1,6 @@
+from array import array
 from http.server import BaseHTTPRequestHandler
+import math
 
 import pytest
 
@@ -103,3 +105,39 @@ class TestNodes:
         assert len(nodes) == 2
 
         stop_server_thread(server)
+
+
+class TestWayCoordinates:
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_way02(self, columnar_nodes, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        result = api.parse_json(read_file("json/way-02.json"))
+
+        way = result.get_way(317146077)
+        assert isinstance(way.node_ids, array)
+        assert way.node_ids[0] == 3233854241
+
+        way_ids, offsets, lats, lons = result.way_coordinates(use_numpy=use_numpy)
+        assert list(way_ids) == [317146077]
+        assert list(offsets) == [0, 7]
+        assert len(lats) == len(lons) == 7
+        assert lats[0] == pytest.approx(50.7495516)
+        assert lons[1] == pytest.approx(7.1758868)
+        assert lats[6] == lats[0]
+
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_missing(self, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/result-way-01.json"))
+
+        with pytest.raises(overpy.exception.DataIncomplete):
+            result.way_coordinates(use_numpy=use_numpy)
+
+        way_ids, offsets, lats, lons = result.way_coordinates(allow_missing=True, use_numpy=use_numpy)
+        assert list(offsets) == [0, 2]
+        assert all(math.isnan(v) for v in lats)
@@ -0,0 +1,176 @@
+from datetime import datetime
+from decimal import Decimal
+from io import StringIO
+import json
+
+import pytest
+import simplejson
+
+import overpy
+from overpy import serializer
+
+from tests import read_file
+from tests.base_class import BaseTestAreas, BaseTestNodes, BaseTestRelation, BaseTestWay
+
+FIXTURES = [
+    "area-01", "node-01", "relation-01", "relation-02", "relation-03", "relation-04", "way-01", "way-02", "way-03",
+]
+
+
+def dump_json(result, batch_size=1000):
+    fp = StringIO()
+    result.dump_json(fp, batch_size=batch_size)
+    return fp.getvalue()
+
+
+def dump_xml(result, batch_size=1000):
+    fp = StringIO()
+    result.dump_xml(fp, batch_size=batch_size)
+    return fp.getvalue()
+
+
+class TestJSON(BaseTestAreas, BaseTestNodes, BaseTestRelation, BaseTestWay):
+    @pytest.mark.parametrize("name", FIXTURES)
+    def test_round_trip(self, name):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file(f"json/{name}.json"))
+        data = dump_json(result, batch_size=2)
+
+        assert json.loads(data, parse_float=Decimal) == json.loads(
+            simplejson.dumps(result.to_json()), parse_float=Decimal
+        )
+        assert dump_json(api.parse_json(data)) == data
+
+    def test_parse(self):
+        api = overpy.Overpass()
+        self._test_area01(api.parse_json(dump_json(api.parse_json(read_file("json/area-01.json")))))
+        self._test_node01(api.parse_json(dump_json(api.parse_json(read_file("json/node-01.json")))))
+        self._test_relation01(api.parse_json(dump_json(api.parse_json(read_file("json/relation-01.json")))))
+        self._test_way01(api.parse_json(dump_json(api.parse_json(read_file("json/way-01.json")))))
+
+    def test_values(self):
+        assert serializer.json_value(Decimal("50.7494236")) == "50.7494236"
+        assert serializer.json_value(1.5) == "1.5"
+        assert serializer.json_value([True, None, "ä\""]) == '[true,null,"\\u00e4\\""]'
+        assert serializer.json_value({"a": (1, 2)}) == '{"a":[1,2]}'
+        assert serializer.json_value(datetime(2020, 1, 2, 3, 4, 5)) == '"2020-01-02T03:04:05Z"'
+        with pytest.raises(TypeError):
+            serializer.json_value(object())
+
+
+class TestXML(BaseTestAreas, BaseTestNodes, BaseTestRelation, BaseTestWay):
+    @pytest.mark.parametrize("name", FIXTURES)
+    @pytest.mark.parametrize("parser", [overpy.XML_PARSER_DOM, overpy.XML_PARSER_SAX])
+    def test_round_trip(self, name, parser):
+        api = overpy.Overpass()
+        result = api.parse_xml(read_file(f"xml/{name}.xml"), parser=parser)
+        data = dump_xml(result, batch_size=2)
+
+        result2 = api.parse_xml(data, parser=parser)
+        assert dump_xml(result2) == data
+        assert result2.to_json() == result.to_json()
+
+    def test_parse(self):
+        api = overpy.Overpass()
+        self._test_area01(api.parse_xml(dump_xml(api.parse_xml(read_file("xml/area-01.xml")))))
+        self._test_node01(api.parse_xml(dump_xml(api.parse_xml(read_file("xml/node-01.xml")))))
+        self._test_relation01(api.parse_xml(dump_xml(api.parse_xml(read_file("xml/relation-01.xml")))))
+        self._test_way01(api.parse_xml(dump_xml(api.parse_xml(read_file("xml/way-01.xml")))))
+
+    def test_escape(self):
+        result = overpy.Result()
+        tags = {"name": "A \"B\" & <C>\nä"}
+        result.append(overpy.Node(
+            node_id=1, lat=Decimal("1.0"), lon=Decimal("2.0"), tags=tags,
+            attributes={"visible": "true", "version": "2", "timestamp": "2020-01-02T03:04:05Z"}, result=result
+        ))
+        data = dump_xml(result)
+        assert '<node id="1" lat="1.0" lon="2.0" visible="true" version="2" timestamp="2020-01-02T03:04:05Z">' in data
+
+        node = overpy.Overpass().parse_xml(data).get_node(1)
+        assert node.tags == tags
+        assert node.attributes["visible"] is True
+        assert node.attributes["timestamp"] == datetime(2020, 1, 2, 3, 4, 5)
+
+
+class TestNDJSON(BaseTestWay):
+    @pytest.mark.parametrize("name", FIXTURES)
+    def test_round_trip(self, name):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file(f"json/{name}.json"))
+        lines = list(result.iter_ndjson())
+        assert len(lines) == sum(len(elements) for elements in (
+            result.nodes, result.ways, result.relations, result.areas
+        ))
+        assert all(line.endswith("\n") and line.count("\n") == 1 for line in lines)
+
+        fp = StringIO()
+        result.dump_ndjson(fp, batch_size=2)
+        assert fp.getvalue() == "".join(lines)
+
+        fp.seek(0)
+        result2 = overpy.Result.from_ndjson(fp, api=api)
+        assert result2.api is api
+        assert result2.to_json() == result.to_json()
+        assert "".join(result2.iter_ndjson()) == "".join(lines)
+
+    def test_split_merge(self):
+        api = overpy.Overpass()
+        lines = list(api.parse_json(read_file("json/way-01.json")).iter_ndjson())
+        # Concatenated parts and empty lines
+        data = "".join(lines[:2]) + "\n" + "".join(lines[2:]) + '{"type":"unknown","id":1}\n'
+        self._test_way01(overpy.Result.from_ndjson(StringIO(data)))
+        self._test_way01(overpy.Result.from_ndjson([line.encode("utf-8") for line in lines]))
+
+
+def test_missing_tags():
+    result = overpy.Result()
+    result.append(overpy.Node(node_id=1, lat=1, lon=2, result=result))
+    result.append(overpy.Way(way_id=2, node_ids=[1], tags={"a": None}, result=result))
+    assert result.get_node(1).tags is None
+    api = overpy.Overpass()
+
+    data = dump_json(result)
+    assert json.loads(data) == result.to_json()
+    assert api.parse_json(data).to_json() == result.to_json()
+
+    lines = list(result.iter_ndjson())
+    assert [json.loads(line) for line in lines] == result.to_json()["elements"]
+    assert overpy.Result.from_ndjson(lines).to_json() == result.to_json()
+
+    data = dump_xml(result)
+    assert '<node id="1" lat="1" lon="2"/>' in data
+    assert '<tag k="a"/>' in data
+    result2 = api.parse_xml(data)
+    assert result2.get_node(1).tags == {}
+    assert result2.get_way(2).tags == {"a": None}
+
+
+@pytest.mark.parametrize("source", ["json", "xml"])
+def test_modified_attributes(source):
+    api = overpy.Overpass()
+    if source == "json":
+        result = api.parse_json(
+            '{"elements": [{"type": "node", "id": 1, "lat": 1.0, "lon": 2.0, "visible": true,'
+            ' "timestamp": "2020-01-02T03:04:05Z", "changeset": 123, "version": 2, "user": "x"}]}'
+        )
+    else:
+        result = api.parse_xml(
+            '<osm version="0.6"><node id="1" lat="1.0" lon="2.0" visible="true" timestamp="2020-01-02T03:04:05Z"'
+            ' changeset="123" version="2" user="x"/></osm>'
+        )
+    expected = {
+        "visible": True, "timestamp": datetime(2020, 1, 2, 3, 4, 5), "changeset": 123, "version": 2, "user": "x"
+    }
+
+    loaded = [
+        api.parse_json(dump_json(result)),
+        api.parse_xml(dump_xml(result)),
+        overpy.Result.from_ndjson(list(result.iter_ndjson()), api=api),
+    ]
+    for result2 in loaded:
+        attributes = result2.get_node(1).attributes
+        assert attributes["visible"] is True
+        assert dict(attributes) == expected
+        # Writing again produces the same output
+        assert dump_json(result2) == dump_json(result)
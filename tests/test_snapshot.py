@@ -0,0 +1,322 @@
+from datetime import datetime
+from decimal import Decimal
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+import overpy
+from overpy import snapshot
+from overpy.exception import SnapshotError
+
+from tests import normalized, read_file
+from tests.base_class import BaseTestAreas, BaseTestNodes, BaseTestRelation, BaseTestWay
+from tests.test_serializer import FIXTURES
+
+
+def save_load(result, tmp_path, **kwargs):
+    path = tmp_path / "result.snap"
+    result.save(path)
+    return overpy.Result.load(path, **kwargs)
+
+
+class TestSnapshot(BaseTestAreas, BaseTestNodes, BaseTestRelation, BaseTestWay):
+    @pytest.mark.parametrize("name", FIXTURES)
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    @pytest.mark.parametrize("lean", [False, True])
+    def test_round_trip(self, name, columnar_nodes, lean, tmp_path):
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        result = api.parse_json(read_file(f"json/{name}.json"))
+        loaded = save_load(result, tmp_path, columnar_nodes=columnar_nodes, lean=lean)
+        assert normalized(loaded) == normalized(result)
+
+    def test_load(self, tmp_path):
+        api = overpy.Overpass()
+        self._test_area01(save_load(api.parse_json(read_file("json/area-01.json")), tmp_path))
+        self._test_node01(save_load(api.parse_json(read_file("json/node-01.json")), tmp_path))
+        self._test_relation01(save_load(api.parse_json(read_file("json/relation-01.json")), tmp_path))
+        self._test_way01(save_load(api.parse_json(read_file("json/way-01.json")), tmp_path))
+
+    def test_without_numpy(self, tmp_path, monkeypatch):
+        result = overpy.Overpass().parse_json(read_file("json/relation-04.json"))
+        monkeypatch.setattr(snapshot, "numpy", None)
+        for columnar_nodes in (False, True):
+            loaded = save_load(result, tmp_path, columnar_nodes=columnar_nodes)
+            assert normalized(loaded) == normalized(result)
+
+    def test_values(self, tmp_path):
+        result = overpy.Result()
+        result.append(overpy.Node(
+            node_id=-5, lat=Decimal("-0.1234567"), lon=None, tags={"name": "ä"},
+            attributes={"timestamp": "2020-01-02T03:04:05Z", "visible": "false", "user": "x", "extra": [1, "2"]},
+            result=result
+        ))
+        result.append(overpy.Node(node_id=3, lat=Decimal("1"), lon=Decimal("2"), result=result))
+        result.append(overpy.Way(way_id=1, node_ids=None, tags=None, result=result))
+        result.append(overpy.Way(way_id=2, node_ids=[3, -5], center_lat=Decimal("1.5"), result=result))
+
+        loaded = save_load(result, tmp_path)
+        node = loaded.get_node(-5)
+        assert node.lat == Decimal("-0.1234567")
+        assert node.lon is None
+        assert node.tags == {"name": "ä"}
+        assert node.attributes["timestamp"] == datetime(2020, 1, 2, 3, 4, 5)
+        assert node.attributes["visible"] is False
+        assert node.attributes["extra"] == [1, "2"]
+        assert loaded.get_node(3).tags is None
+        assert loaded.get_way(1)._node_ids is None
+        assert loaded.get_way(1).tags is None
+        way = loaded.get_way(2)
+        assert list(way._node_ids) == [3, -5]
+        assert way.center_lat is None
+
+    def test_lazy_attributes(self, tmp_path):
+        result = overpy.Overpass().parse_xml(read_file("xml/node-01.xml"))
+        node = result.get_node(3233854234)
+        assert node.attributes["version"] == 1
+
+        result.save(tmp_path / "compact.snap")
+        result.save(tmp_path / "mapped.snap", mapped=True)
+        # Saving reads the raw values without converting them
+        assert dict.__getitem__(node.attributes, "changeset") == "23456789"
+        assert dict.__getitem__(node.attributes, "timestamp") == "2014-12-14T07:27:19Z"
+
+        attributes = overpy.Result.load(tmp_path / "compact.snap").get_node(3233854234).attributes
+        assert dict.__getitem__(attributes, "changeset") == "23456789"
+        assert dict(attributes) == dict(node.attributes)
+        with overpy.Result.open_mapped(tmp_path / "mapped.snap") as mapped:
+            assert dict(mapped.get_node(3233854234).attributes) == dict(node.attributes)
+
+    def test_missing_tag_value(self, tmp_path):
+        result = overpy.Overpass().parse_xml(
+            '<osm version="0.6">'
+            '<node id="1" lat="1" lon="2"><tag k="a"/><tag k="b" v="x"/></node>'
+            '<way id="2"><nd ref="1"/><tag k="a"/></way>'
+            '<relation id="3"><member type="node" ref="1" role=""/><tag k="a"/></relation>'
+            '</osm>'
+        )
+        assert result.get_node(1).tags == {"a": None, "b": "x"}
+        path = tmp_path / "result.snap"
+        for columnar_nodes in (False, True):
+            loaded = save_load(result, tmp_path, columnar_nodes=columnar_nodes)
+            assert loaded.get_node(1).tags == {"a": None, "b": "x"}
+            assert loaded.get_way(2).tags == {"a": None}
+            assert loaded.get_relation(3).tags == {"a": None}
+
+        result.save(path, mapped=True)
+        with overpy.Result.open_mapped(path) as mapped:
+            assert mapped.get_node(1).tags == {"a": None, "b": "x"}
+            assert mapped.get_way(2).tags == {"a": None}
+            assert mapped.get_relation(3).tags == {"a": None}
+
+    def test_invalid(self, tmp_path):
+        path = tmp_path / "result.snap"
+        path.write_bytes(b"OVPY")
+        with pytest.raises(SnapshotError):
+            overpy.Result.load(path)
+        path.write_bytes(b"NOTASNAP" + bytes(8))
+        with pytest.raises(SnapshotError):
+            overpy.Result.load(path)
+
+        overpy.Result().save(path)
+        data = bytearray(path.read_bytes())
+        data[8] = 99
+        path.write_bytes(bytes(data))
+        with pytest.raises(SnapshotError):
+            overpy.Result.load(path)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_varints(use_numpy, monkeypatch):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(snapshot, "numpy", None)
+    values = [0, 1, 127, 128, 300, 2 ** 32, 2 ** 63 - 1]
+    assert snapshot.decode_varints(snapshot.encode_varints(values)) == values
+    assert snapshot.decode_varints(b"") == []
+
+
+class TestMappedResult(BaseTestAreas, BaseTestNodes, BaseTestRelation, BaseTestWay):
+    @pytest.mark.parametrize("name", FIXTURES)
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_round_trip(self, name, columnar_nodes, tmp_path):
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        result = api.parse_json(read_file(f"json/{name}.json"))
+        path = tmp_path / "result.snap"
+        result.save(path, mapped=True)
+        with overpy.Result.open_mapped(path) as mapped:
+            expected = normalized(result)
+            type_order = ["node", "way", "relation", "area"]
+            expected["elements"].sort(key=lambda element: (type_order.index(element["type"]), element["id"]))
+            assert normalized(mapped) == expected
+
+    def test_open(self, tmp_path):
+        api = overpy.Overpass()
+        for name, test in (("area-01", self._test_area01), ("node-01", self._test_node01),
+                           ("relation-01", self._test_relation01), ("way-01", self._test_way01)):
+            path = tmp_path / f"{name}.snap"
+            api.parse_json(read_file(f"json/{name}.json")).save(path, mapped=True)
+            with overpy.Result.open_mapped(path) as mapped:
+                test(mapped)
+
+    def test_lookup(self, tmp_path):
+        result = overpy.Result()
+        for node_id in (7, -3, 5):
+            result.append(overpy.Node(
+                node_id=node_id, lat=Decimal("1.25"), lon=Decimal(node_id), tags={"id": str(node_id)},
+                attributes={"version": "2"}, result=result
+            ))
+        result.append(overpy.Node(node_id=1, lat=None, lon=None, result=result))
+        result.append(overpy.Way(way_id=2, node_ids=[7, -3], result=result))
+        path = tmp_path / "result.snap"
+        result.save(path, mapped=True)
+
+        mapped = overpy.Result.open_mapped(path)
+        assert list(mapped.node_ids) == [-3, 1, 5, 7]
+        node = mapped.get_node(5)
+        assert node.lat == Decimal("1.25")
+        assert node.tags == {"id": "5"}
+        assert node.attributes["version"] == 2
+        assert mapped.get_node(1).lat is None
+        assert mapped.get_node(1).tags is overpy._EMPTY_DICT
+        assert 6 not in mapped.node_ids
+        with pytest.raises(overpy.exception.DataIncomplete):
+            mapped.get_node(6)
+        assert [node.id for node in mapped.get_way(2).nodes] == [7, -3]
+        assert mapped.ways_for_node(7)[0].id == 2
+
+        with pytest.raises(TypeError):
+            mapped.append(overpy.Node(node_id=8, result=result))
+        with pytest.raises(TypeError):
+            mapped.expand(result)
+        copy = mapped | overpy.Result()
+        assert copy.node_ids == mapped.node_ids
+
+        ids, lats, lons = mapped.node_columns()
+        assert isinstance(ids, memoryview)
+        assert list(lons)[2:] == [5.0, 7.0]
+        del ids, lats, lons
+        mapped.close()
+
+    def test_tags(self, tmp_path):
+        result = overpy.Overpass().parse_json(read_file("json/node-01.json"))
+        path = tmp_path / "result.snap"
+        result.save(path, mapped=True)
+
+        with overpy.Result.open_mapped(path) as mapped:
+            assert [node.id for node in mapped.find("highway")] == [100793192]
+            assert mapped.tag_table().value_counts("highway") == [("turning_circle", 1)]
+
+            for flavour in (snapshot.FLAVOUR_COMPACT, snapshot.FLAVOUR_MAPPED):
+                copy_path = tmp_path / "copy.snap"
+                snapshot.save(mapped, copy_path, flavour=flavour)
+                if flavour == snapshot.FLAVOUR_MAPPED:
+                    with overpy.Result.open_mapped(copy_path) as copy:
+                        assert normalized(copy) == normalized(mapped)
+                else:
+                    for columnar_nodes in (False, True):
+                        copy = overpy.Result.load(copy_path, columnar_nodes=columnar_nodes)
+                        assert normalized(copy) == normalized(mapped)
+                        assert copy.get_node(100793192).tags == result.get_node(100793192).tags
+
+            copy = pickle.loads(pickle.dumps(overpy.Result(columnar_nodes=True) | mapped))
+            assert copy.get_node(100793192).tags == result.get_node(100793192).tags
+
+    def test_invalid(self, tmp_path):
+        path = tmp_path / "result.snap"
+        overpy.Result().save(path)
+        with pytest.raises(SnapshotError):
+            overpy.Result.open_mapped(path)
+
+        overpy.Result().save(path, mapped=True)
+        with pytest.raises(SnapshotError):
+            overpy.Result.load(path)
+
+        for data in (b"", b"NOTASNAP" + bytes(16)):
+            path.write_bytes(data)
+            with pytest.raises(SnapshotError):
+                overpy.Result.open_mapped(path)
+        with pytest.raises(ValueError):
+            snapshot.save(overpy.Result(), path, flavour=99)
+
+
+def count_tagged_nodes(result):
+    return result.get_node(-3).tags["id"], sum(1 for node in result.nodes if node.tags)
+
+
+class TestSharedResult:
+    def test_share(self, tmp_path):
+        pytest.importorskip("multiprocessing.shared_memory")
+        result = overpy.Overpass().parse_json(read_file("json/relation-04.json"))
+        block = result.share()
+        try:
+            with overpy.Result.attach_shared(block.name) as shared:
+                expected = normalized(result)
+                type_order = ["node", "way", "relation", "area"]
+                expected["elements"].sort(key=lambda element: (type_order.index(element["type"]), element["id"]))
+                assert normalized(shared) == expected
+
+                copy = pickle.loads(pickle.dumps(shared))
+                assert len(pickle.dumps(shared)) < 200
+                assert copy.relation_ids == shared.relation_ids
+                copy.close()
+        finally:
+            block.close()
+            block.unlink()
+
+        with pytest.raises(FileNotFoundError):
+            overpy.Result.attach_shared(block.name)
+
+        path = tmp_path / "result.snap"
+        result.save(path, mapped=True)
+        with overpy.Result.open_mapped(path) as mapped:
+            copy = pickle.loads(pickle.dumps(mapped))
+            assert copy.relation_ids == mapped.relation_ids
+            copy.close()
+
+    def test_pool(self):
+        pytest.importorskip("multiprocessing.shared_memory")
+        result = overpy.Result()
+        for node_id in range(-3, 7):
+            result.append(overpy.Node(
+                node_id=node_id, lat=Decimal("1"), lon=Decimal("2"), tags={"id": str(node_id)} if node_id < 0 else {},
+                result=result
+            ))
+        block = result.share()
+        try:
+            with overpy.Result.attach_shared(block.name) as shared:
+                with multiprocessing.Pool(2) as pool:
+                    assert pool.map(count_tagged_nodes, [shared] * 3) == [("-3", 3)] * 3
+        finally:
+            block.close()
+            block.unlink()
+
+    @pytest.mark.skipif(os.name != "posix", reason="Only POSIX shared memory is registered with the resource tracker")
+    def test_independent_process(self):
+        pytest.importorskip("multiprocessing.shared_memory")
+        result = overpy.Overpass().parse_json(read_file("json/node-01.json"))
+        block = result.share()
+        try:
+            code = (
+                "import sys, overpy\n"
+                "with overpy.Result.attach_shared(sys.argv[1]) as shared:\n"
+                "    print(len(shared.nodes))\n"
+            )
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+            for _ in range(2):
+                process = subprocess.run(
+                    [sys.executable, "-c", code, block.name], capture_output=True, text=True, env=env, check=True
+                )
+                assert process.stdout == "3\n"
+                assert "leaked" not in process.stderr
+
+            # The block must still be available after the other processes exited
+            with overpy.Result.attach_shared(block.name) as shared:
+                assert shared.node_ids == result.node_ids
+        finally:
+            block.close()
+            block.unlink()
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+import overpy
+from overpy import spatial
+
+from tests import read_file
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def use_numpy(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(spatial, "numpy", None)
+    return request.param
+
+
+class TestGridIndex:
+    def test_haversine(self):
+        assert spatial.haversine(50.0, 7.0, 50.0, 7.0) == 0.0
+        # One degree of latitude
+        assert spatial.haversine(0.0, 0.0, 1.0, 0.0) == pytest.approx(111195, rel=1e-4)
+
+    def test_query_points(self, use_numpy):
+        index = spatial.GridIndex(cell_size=1.0)
+        index.insert_points([1, 2, 3, 4], [0.5, 10.5, -0.5, float("nan")], [0.5, 10.5, 179.5, 0.0])
+        assert index.query(0.0, 0.0, 1.0, 1.0) == [1]
+        assert index.query(-90.0, -180.0, 90.0, 180.0) == [1, 2, 3]
+        # Crossing the antimeridian
+        assert index.query(-1.0, 179.0, 1.0, -179.0) == [3]
+        assert index.query(20.0, 20.0, 30.0, 30.0) == []
+
+    def test_query_boxes(self):
+        index = spatial.GridIndex(cell_size=1.0, max_cells=4)
+        index.insert(1, 0.0, 0.0, 0.5, 0.5)
+        index.insert(2, -40.0, -40.0, 40.0, 40.0)
+        index.insert(3, 5.0, 5.0)
+        assert index.query(0.2, 0.2, 0.3, 0.3) == [1, 2]
+        assert index.query(4.5, 4.5, 5.5, 5.5) == [2, 3]
+        assert index.query(50.0, 50.0, 60.0, 60.0) == []
+
+    def test_nearest(self, use_numpy):
+        rnd = random.Random(42)
+        points = [(rnd.uniform(50.0, 51.0), rnd.uniform(7.0, 8.0)) for _ in range(500)]
+        index = spatial.GridIndex(cell_size=0.05)
+        index.insert_points(range(len(points)), [p[0] for p in points], [p[1] for p in points])
+
+        for lat, lon in [(50.5, 7.5), (50.0, 7.0), (52.0, 9.0)]:
+            expected = sorted(
+                (spatial.haversine(lat, lon, p_lat, p_lon), i) for i, (p_lat, p_lon) in enumerate(points)
+            )
+            assert index.nearest(lat, lon, k=5) == expected[:5]
+            assert index.nearest(lat, lon, k=1000) == expected
+            within = [item for item in expected if item[0] <= 5000.0]
+            assert index.nearest(lat, lon, k=1000, max_distance=5000.0) == within
+
+        assert spatial.GridIndex().nearest(0.0, 0.0) == []
+
+
+class TestResult:
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_way02(self, columnar_nodes):
+        api = overpy.Overpass(columnar_nodes=columnar_nodes)
+        result = api.parse_json(read_file("json/way-02.json"))
+
+        nodes = result.nodes_in_bbox(50.7494, 7.1757, 50.7495, 7.1758)
+        assert [node.id for node in nodes] == [3233854234, 3233854236]
+
+        assert [way.id for way in result.ways_in_bbox(50.7494, 7.1757, 50.7495, 7.1758)] == [317146077]
+        assert result.ways_in_bbox(50.0, 7.0, 50.1, 7.1) == []
+
+        expected = sorted(
+            result.get_nodes(),
+            key=lambda n: spatial.haversine(50.7494, 7.1757, float(n.lat), float(n.lon))
+        )
+        nodes = result.nearest_nodes(50.7494, 7.1757, k=3)
+        assert [node.id for node in nodes] == [node.id for node in expected[:3]]
+        assert result.nearest_nodes(50.7494236, 7.1757664, k=5, max_distance=1.0)[0].id == 3233854234
+
+    def test_update(self):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/result-way-01.json"))
+        assert result.nodes_in_bbox(-90.0, -180.0, 90.0, 180.0) == []
+        assert result.ways_in_bbox(-90.0, -180.0, 90.0, 180.0) == []
+
+        result.expand(api.parse_json(read_file("json/way-02.json")))
+        nodes = result.nodes_in_bbox(50.7494, 7.1757, 50.7495, 7.1758)
+        assert [node.id for node in nodes] == [3233854234, 3233854236]
+        assert [way.id for way in result.ways_in_bbox(50.7494, 7.1757, 50.7495, 7.1758)] == [317146077]
+
+    def test_way_center(self):
+        api = overpy.Overpass()
+        result = api.parse_json(read_file("json/way-03.json"))
+        result._nodes.clear()
+        assert [way.id for way in result.ways_in_bbox(41.89, 12.50, 41.90, 12.51)] == [225576797]
@@ -0,0 +1,103 @@
+from decimal import Decimal
+import re
+
+import pytest
+
+import overpy
+from overpy import table
+
+from tests import read_file
+
+
+def create_result(columnar_nodes=False):
+    result = overpy.Result(columnar_nodes=columnar_nodes)
+    for node_id, tags in ((3, {"highway": "crossing"}), (1, {}), (2, {"highway": "stop", "name": "A"})):
+        result.append(overpy.Node(node_id=node_id, lat=Decimal("1"), lon=Decimal("2"), tags=tags, result=result))
+    result.append(overpy.Way(way_id=1, node_ids=[1, 2], tags={"highway": "residential", "name": "A"}, result=result))
+    result.append(overpy.Way(way_id=2, node_ids=[2, 3], tags={"highway": "crossing", "note": None}, result=result))
+    result.append(overpy.Area(area_id=7, tags={"name": "B"}, result=result))
+    return result
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def use_numpy(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(table, "numpy", None)
+    return request.param
+
+
+class TestTagTable:
+    @pytest.mark.parametrize("columnar_nodes", [False, True])
+    def test_columns(self, columnar_nodes):
+        tags = create_result(columnar_nodes=columnar_nodes).tag_table()
+        assert list(tags.element_ids) == [3, 1, 2, 1, 2, 7]
+        assert [tags.TYPE_NAMES[code] for code in tags.element_types] == ["node"] * 3 + ["way"] * 2 + ["area"]
+        assert len(tags) == 8
+        assert list(tags.elements) == sorted(tags.elements)
+        rows = [
+            (tags.element_ids[e], tags.key_pool[k], None if v < 0 else tags.value_pool[v])
+            for e, k, v in zip(tags.elements, tags.keys, tags.values)
+        ]
+        assert rows[-4:] == [(1, "name", "A"), (2, "highway", "crossing"), (2, "note", None), (7, "name", "B")]
+        assert sorted(tags.value_pool) == ["A", "B", "crossing", "residential", "stop"]
+        assert tags.key_code("highway") >= 0
+        assert tags.key_code("amenity") == -1
+        assert tags.value_code("stop") >= 0
+        assert tags.value_code("yes") == -1
+
+    def test_find(self, use_numpy):
+        tags = create_result().tag_table()
+        assert list(tags.find("highway")) == [0, 2, 3, 4]
+        assert list(tags.find("highway", "crossing")) == [0, 4]
+        assert list(tags.find("highway", {"stop", "residential"})) == [2, 3]
+        assert list(tags.find("name", re.compile("^[AB]$"))) == [2, 3, 5]
+        assert list(tags.find("highway", "motorway")) == []
+        assert list(tags.find("amenity")) == []
+        assert list(tags.find("note")) == [4]
+
+    def test_value_counts(self, use_numpy):
+        tags = create_result().tag_table()
+        assert tags.value_counts("highway") == [("crossing", 2), ("stop", 1), ("residential", 1)]
+        assert tags.value_counts("note") == [(None, 1)]
+        assert tags.value_counts("amenity") == []
+
+    def test_group_by(self, use_numpy):
+        tags = create_result().tag_table()
+        groups = tags.group_by("highway")
+        assert list(groups) == ["crossing", "stop", "residential"]
+        assert {value: list(group) for value, group in groups.items()} == {
+            "crossing": [0, 4], "stop": [2], "residential": [3]
+        }
+        assert {value: list(group) for value, group in tags.group_by("note").items()} == {None: [4]}
+        assert tags.group_by("amenity") == {}
+
+    def test_types(self):
+        tags = create_result().tag_table(types=["way", overpy.Area])
+        assert list(tags.element_ids) == [1, 2, 7]
+        assert tags.value_counts("highway", use_numpy=False) == [("residential", 1), ("crossing", 1)]
+        with pytest.raises(ValueError):
+            create_result().tag_table(types=["street"])
+
+    def test_fixture(self):
+        result = overpy.Overpass().parse_json(read_file("json/area-01.json"))
+        tags = result.tag_table()
+        assert tags.value_counts("type", use_numpy=False) == [("multipolygon", 2), ("boundary", 1)]
+        assert [tags.element_ids[i] for i in tags.find("admin_level", use_numpy=False)] == [3600055060]
+
+    def test_pandas(self):
+        pandas = pytest.importorskip("pandas")
+        frame = create_result().tag_table().to_pandas()
+        assert list(frame.columns) == ["type", "id", "key", "value"]
+        assert isinstance(frame["value"].dtype, pandas.CategoricalDtype)
+        assert frame["value"].isna().sum() == 1
+        assert frame[frame["key"] == "highway"]["value"].value_counts()["crossing"] == 2
+
+    def test_arrow(self):
+        pytest.importorskip("pyarrow")
+        arrow_table = create_result().tag_table().to_arrow()
+        assert arrow_table.column_names == ["type", "id", "key", "value"]
+        assert arrow_table.num_rows == 8
+        assert arrow_table.column("value").null_count == 1
+        assert arrow_table.column("key").to_pylist()[:2] == ["highway", "highway"]